@@ -10,11 +10,24 @@ from .dfs import DepthFirstSearch
 from .ucs import UniformCostSearch
 from .greedy import GreedyBestFirstSearch
 from .astar import AStarSearch
+from .weighted_astar import WeightedAStarSearch
+from .ara_star import AnytimeRepairingAStar
+from .idastar import IterativeDeepeningAStar
+from .iddfs import IterativeDeepeningSearch
+from .branch_and_bound import DepthFirstBranchAndBound
+from .bidirectional import BidirectionalBreadthFirstSearch, BidirectionalUniformCostSearch
 
 __all__ = [
     'BreadthFirstSearch',
     'DepthFirstSearch',
     'UniformCostSearch',
     'GreedyBestFirstSearch',
-    'AStarSearch'
+    'AStarSearch',
+    'WeightedAStarSearch',
+    'AnytimeRepairingAStar',
+    'IterativeDeepeningAStar',
+    'IterativeDeepeningSearch',
+    'DepthFirstBranchAndBound',
+    'BidirectionalBreadthFirstSearch',
+    'BidirectionalUniformCostSearch'
 ]
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import heapq
+from itertools import count
+from time import perf_counter
+from typing import Dict, List, Optional, Set
+
+from core.node import Node
+from core.state import State
+from problem.problem_interface import Problem
+from .search_interface import SearchAlgorithm, NodePool
+
+
+class AnytimeRepairingAStar(SearchAlgorithm):
+    """
+    A5c: A* Reparadora Anytime (ARA*)
+
+    Começa como uma A* Ponderada com w = `initial_weight`, que encontra
+    rápido uma solução com custo até w vezes o ótimo, e repete a busca com w
+    reduzido de `weight_step` a cada iteração até `final_weight`. Cada
+    iteração reaproveita o trabalho das anteriores: os valores de g, a
+    árvore e a fronteira são mantidos, e só os estados cujo g melhorou depois
+    de expandidos (a lista INCONS) voltam à fronteira, em vez de uma nova
+    busca do zero.
+
+    Cada solução melhor que a anterior é registrada em `solutions` com o
+    instante, o peso da iteração e o limite de subotimalidade comprovado,
+    min(w, custo / min(g + h) da fronteira e de INCONS); uma iteração que
+    só aperta o limite da mesma solução também gera um registro. A busca
+    para quando esse limite chega a 1 (solução ótima) ou depois da iteração
+    com `final_weight`. Com um orçamento (ver algorithms.budget), devolve a
+    melhor solução encontrada até a interrupção.
+    """
+
+    anytime = True
+
+    def __init__(self, randomize_successors: bool = False, initial_weight: float = 3.0,
+                 weight_step: float = 0.5, final_weight: float = 1.0, lazy_successors: bool = False):
+        super().__init__(randomize_successors, lazy_successors)
+        if not 1 <= final_weight <= initial_weight or weight_step <= 0:
+            raise ValueError("A ARA* exige 1 <= final_weight <= initial_weight e weight_step > 0.")
+        self.initial_weight = initial_weight
+        self.weight_step = weight_step
+        self.final_weight = final_weight
+        self.iterations = 0
+        self.solutions: List[Dict] = []
+
+    def search(self, problem: Problem) -> Optional[Node]:
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        start_time = perf_counter()
+        root = problem.initial_state
+        pool = NodePool(root)
+        self.nodes_generated = 1
+        self.nodes_pruned = 0
+        self.nodes_visited = 0
+        self.iterations = 0
+        self.solutions = []
+
+        g: Dict[State, float] = {root: 0}
+        node_of: Dict[State, int] = {root: 0}  # Nó da NodePool com o melhor g de cada estado
+        h: Dict[State, float] = {root: problem.get_heuristic(root)}
+        # Fronteira: (f, g, ordem, estado), com remoção preguiçosa das entradas desatualizadas.
+        open_heap: list = []
+        in_open: Set[State] = set()
+        closed: Set[State] = set()
+        incons: Set[State] = set()
+        order = count()
+        goal, goal_cost = (root, 0) if problem.is_goal(root) else (None, float('inf'))
+
+        weight = self.initial_weight
+        heapq.heappush(open_heap, (weight * h[root], 0, next(order), root))
+        in_open.add(root)
+
+        while True:
+            self.iterations += 1
+            # ImprovePath: expande enquanto algum f da fronteira for menor que o custo da melhor solução.
+            while open_heap:
+                if budget is not None and budget.exhausted(self, len(in_open), len(g)):
+                    return pool.to_node(node_of[goal]) if goal is not None else None
+                f_cost, g_cost, _, state = open_heap[0]
+                if state not in in_open or g_cost != g[state]:
+                    heapq.heappop(open_heap)
+                    if stats is not None:
+                        stats.stale_pops += 1
+                    continue
+                if goal_cost <= f_cost:
+                    break
+                heapq.heappop(open_heap)
+                in_open.discard(state)
+                closed.add(state)
+                self.nodes_visited += 1
+
+                node_id = node_of[state]
+                for action, child, step_cost in self._get_pool_successors(problem, state, pool.action[node_id]):
+                    g_child = g_cost + step_cost
+                    if g_child < g.get(child, float('inf')):
+                        g[child] = g_child
+                        node_of[child] = pool.add(child, node_id, action, g_child)
+                        if child not in h:
+                            h[child] = problem.get_heuristic(child)
+                        if g_child < goal_cost and problem.is_goal(child):
+                            goal, goal_cost = child, g_child
+                        if child in closed:
+                            incons.add(child)  # Já expandido nesta iteração: volta na próxima
+                        else:
+                            heapq.heappush(open_heap, (g_child + weight * h[child], g_child, next(order), child))
+                            in_open.add(child)
+                if stats is not None:
+                    stats.on_expand(self, node_id, len(in_open), len(g))
+
+            if goal is None:
+                return None  # A fronteira se esgotou sem alcançar um objetivo
+
+            # Limite comprovado: todo caminho melhor passa por um estado da fronteira ou de INCONS.
+            lower_bound = min((g[state] + h[state] for state in in_open | incons), default=goal_cost)
+            bound = max(min(weight, goal_cost / lower_bound) if lower_bound > 0 else weight, 1.0)
+            last = self.solutions[-1] if self.solutions else None
+            # Registra soluções mais baratas e também limites mais apertados para a mesma solução.
+            if last is None or goal_cost < last['path_cost'] or bound < last['suboptimality_bound']:
+                self.solutions.append({
+                    'time_sec': perf_counter() - start_time, 'path_cost': goal_cost,
+                    'path_length': pool.depth[node_of[goal]], 'weight': weight, 'suboptimality_bound': bound,
+                    'nodes_generated': self.nodes_generated, 'nodes_visited': self.nodes_visited,
+                })
+            if bound <= 1 or weight <= self.final_weight:
+                return pool.to_node(node_of[goal])
+
+            # Próxima iteração: peso menor, INCONS de volta à fronteira e prioridades recalculadas.
+            weight = max(weight - self.weight_step, self.final_weight)
+            in_open |= incons
+            incons.clear()
+            closed.clear()
+            open_heap = [(g[state] + weight * h[state], g[state], next(order), state) for state in in_open]
+            heapq.heapify(open_heap)
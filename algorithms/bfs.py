@@ -4,30 +4,79 @@ from typing import Optional
 
 from core.node import Node
 from problem.problem_interface import Problem
-from .search_interface import SearchAlgorithm
+from .search_interface import SearchAlgorithm, DenseTree, NodePool
 
 
 class BreadthFirstSearch(SearchAlgorithm):
     """A1: Busca em Largura (BFS)"""
 
+    # A ordem de expansão não depende dos custos dos passos nem de heurística.
+    search_parameters = ()
+
     def search(self, problem: Problem) -> Optional[Node]:
-        initial_node = Node(problem.initial_state)
-        if problem.is_goal(initial_node.state):
-            return initial_node
+        if problem.state_space is not None:
+            return self._search_dense(problem)
+
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        pool = NodePool(problem.initial_state)
+        if problem.is_goal(problem.initial_state):
+            return pool.to_node(0)
+
+        frontier = deque([0])  # Fila (FIFO) de ids de nós
+        visited = {problem.initial_state}
+        self.nodes_generated = 1
+        self.nodes_pruned = 0
+        self.nodes_visited = 0
+
+        while frontier:
+            if budget is not None and budget.exhausted(self, len(frontier), len(visited)):
+                return None
+            node_id = frontier.popleft()
+            self.nodes_visited += 1
+            cost = pool.cost[node_id]
+
+            for action, child, step_cost in self._get_pool_successors(problem, pool.states[node_id], pool.action[node_id]):
+                if child not in visited:
+                    child_id = pool.add(child, node_id, action, cost + step_cost)
+                    if problem.is_goal(child):
+                        return pool.to_node(child_id)
+                    frontier.append(child_id)
+                    visited.add(child)
+            if stats is not None:
+                stats.on_expand(self, node_id, len(frontier), len(visited))
+        return None
+
+    def _search_dense(self, problem: Problem) -> Optional[Node]:
+        """Mesma busca sobre os índices do StateSpace, com visitados em um bytearray."""
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        start = problem.state_space.index_of(problem.initial_state)
+        tree = DenseTree(start)
+        if start in problem.dense_goals:
+            return tree.to_node(problem, 0)
 
-        frontier = deque([initial_node])  # Fila (FIFO)
-        visited = {initial_node.state}
+        frontier = deque([0])  # Fila (FIFO) de ids de nós
+        visited = bytearray(problem.state_space.SIZE)
+        visited[start] = 1
         self.nodes_generated = 1
+        self.nodes_pruned = 0
         self.nodes_visited = 0
 
         while frontier:
-            node = frontier.popleft()
+            if budget is not None and budget.exhausted(self, len(frontier), len(tree.index)):
+                return None
+            node_id = frontier.popleft()
             self.nodes_visited += 1
 
-            for child in self._get_successors(node, problem):
-                if child.state not in visited:
-                    if problem.is_goal(child.state):
-                        return child
-                    frontier.append(child)
-                    visited.add(child.state)
+            for action, child, _ in self._get_dense_successors(problem, tree.index[node_id], tree.action[node_id]):
+                if not visited[child]:
+                    child_id = tree.add(child, node_id, action)
+                    if child in problem.dense_goals:
+                        return tree.to_node(problem, child_id)
+                    frontier.append(child_id)
+                    visited[child] = 1
+            if stats is not None:
+                # No modo denso, os visitados são os nós da DenseTree.
+                stats.on_expand(self, node_id, len(frontier), len(tree.index))
         return None
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import heapq
+import random
+from itertools import count
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from core.node import Node
+from core.state import State
+from problem.problem_interface import Problem
+from .search_interface import SearchAlgorithm
+
+
+def _join_paths(problem: Problem, forward_node: Node, backward_node: Node) -> Node:
+    """
+    Emenda o caminho para frente (início -> encontro) com o caminho para trás
+    (encontro -> objetivo) em uma única cadeia de Nodes. Nos nós da busca para
+    trás, `parent` aponta para o próximo estado rumo ao objetivo e `action` é
+    a ação para frente que leva até ele.
+    """
+    node = forward_node
+    current = backward_node
+    while current.parent is not None:
+        step_cost = problem.get_cost(current.state, current.action)
+        node = Node(current.parent.state, node, current.action, node.path_cost + step_cost)
+        current = current.parent
+    return node
+
+
+class BidirectionalSearch(SearchAlgorithm):
+    """Lógica comum às buscas bidirecionais: expansão para trás a partir dos objetivos."""
+
+    def _get_predecessors(self, node: Node, problem: Problem) -> List[Node]:
+        """
+        Gera os nós da busca para trás. O custo acumulado em `path_cost` é o
+        custo até o objetivo, somando o custo do movimento para frente.
+        """
+        start = perf_counter() if self.stats is not None else 0.0
+        predecessors = [Node(previous, node, action, node.path_cost + cost)
+                        for action, previous, cost in problem.get_predecessors(node.state)]
+        if self.stats is not None:
+            self.stats.time_successors += perf_counter() - start
+        self.nodes_generated += len(predecessors)
+        if self.randomize:
+            random.shuffle(predecessors)
+        return predecessors
+
+
+class BidirectionalBreadthFirstSearch(BidirectionalSearch):
+    """
+    A1b: Busca em Largura Bidirecional
+
+    A fronteira para trás começa com todos os estados objetivo. A cada passo
+    expande-se uma camada inteira do lado com a fronteira menor; ao fim de uma
+    camada com encontros, o de menor profundidade total é o caminho mais curto.
+    """
+
+    # As camadas contam movimentos: os custos dos passos não mudam a busca.
+    search_parameters = ()
+
+    def search(self, problem: Problem) -> Optional[Node]:
+        self._start_stats(problem)
+        self._start_budget()
+        root = Node(problem.initial_state)
+        self.nodes_generated = 1
+        self.nodes_visited = 0
+        if problem.is_goal(root.state):
+            return root
+
+        forward: Dict[State, Node] = {root.state: root}
+        backward: Dict[State, Node] = {goal: Node(goal) for goal in problem.get_goal_states()}
+        self.nodes_generated += len(backward)
+        forward_layer = [root]
+        backward_layer = list(backward.values())
+
+        while forward_layer and backward_layer:
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self._expand_layer(
+                    problem, forward_layer, forward, backward, self._get_successors)
+            else:
+                backward_layer, meeting = self._expand_layer(
+                    problem, backward_layer, backward, forward, self._get_predecessors)
+            if meeting is not None:
+                return _join_paths(problem, forward[meeting], backward[meeting])
+        return None
+
+    def _expand_layer(self, problem, layer, own, other, expand):
+        """
+        Expande uma camada e retorna a próxima e o melhor estado de encontro
+        (ou None). Se o orçamento se esgotar, a próxima camada volta vazia.
+        """
+        budget = self.budget
+        next_layer = []
+        meeting = None
+        best_depth = float('inf')
+        for node in layer:
+            if budget is not None and budget.exhausted(self, len(next_layer), len(own) + len(other)):
+                return [], None
+            self.nodes_visited += 1
+            for child in expand(node, problem):
+                if child.state in own:
+                    continue
+                own[child.state] = child
+                next_layer.append(child)
+                if child.state in other:
+                    depth = child.depth + other[child.state].depth
+                    if depth < best_depth:
+                        meeting, best_depth = child.state, depth
+            if self.stats is not None:
+                # Fronteira: a próxima camada em construção; visitados: os dois lados.
+                self.stats.on_expand(self, node, len(next_layer), len(own) + len(other))
+        return next_layer, meeting
+
+
+class BidirectionalUniformCostSearch(BidirectionalSearch):
+    """
+    A3b: Busca de Custo Uniforme Bidirecional (Dijkstra bidirecional)
+
+    Alterna a expansão do lado cujo topo da fila tem menor custo e mantém
+    mu, o custo do melhor caminho completo visto até agora. Como os custos
+    são não negativos, a busca pode parar assim que topo_frente + topo_trás >= mu.
+    Na busca para trás o custo de cada passo é o do movimento para frente
+    (ver Problem.get_predecessors), o que cobre a penalidade de C4.
+    """
+
+    def search(self, problem: Problem) -> Optional[Node]:
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        root = Node(problem.initial_state)
+        self.nodes_generated = 1
+        self.nodes_visited = 0
+        if problem.is_goal(root.state):
+            return root
+
+        counter = count()
+        forward: Dict[State, Node] = {root.state: root}  # Melhor nó conhecido por estado
+        backward: Dict[State, Node] = {goal: Node(goal) for goal in problem.get_goal_states()}
+        self.nodes_generated += len(backward)
+        forward_frontier = [(0, next(counter), root)]
+        backward_frontier = [(0, next(counter), node) for node in backward.values()]
+        heapq.heapify(backward_frontier)
+
+        best_cost = float('inf')
+        meeting = None
+
+        while forward_frontier and backward_frontier:
+            if budget is not None and budget.exhausted(self, len(forward_frontier) + len(backward_frontier),
+                                                       len(forward) + len(backward)):
+                return None
+            if forward_frontier[0][0] + backward_frontier[0][0] >= best_cost:
+                break
+
+            if forward_frontier[0][0] <= backward_frontier[0][0]:
+                frontier, own, other, expand = forward_frontier, forward, backward, self._get_successors
+            else:
+                frontier, own, other, expand = backward_frontier, backward, forward, self._get_predecessors
+
+            cost, _, node = heapq.heappop(frontier)
+            if cost > own[node.state].path_cost:
+                if stats is not None:
+                    stats.stale_pops += 1
+                continue  # Entrada desatualizada
+            self.nodes_visited += 1
+
+            for child in expand(node, problem):
+                if child.state not in own or child.path_cost < own[child.state].path_cost:
+                    own[child.state] = child
+                    heapq.heappush(frontier, (child.path_cost, next(counter), child))
+                    if child.state in other:
+                        total = child.path_cost + other[child.state].path_cost
+                        if total < best_cost:
+                            best_cost, meeting = total, child.state
+            if stats is not None:
+                stats.on_expand(self, node, len(forward_frontier) + len(backward_frontier),
+                                len(forward) + len(backward))
+
+        if meeting is None:
+            return None
+        return _join_paths(problem, forward[meeting], backward[meeting])
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from time import perf_counter
+from typing import Dict, List, Optional, Set
+
+from core.node import Node
+from core.state import State
+from problem.problem_interface import Problem
+from .search_interface import SearchAlgorithm
+
+
+class DepthFirstBranchAndBound(SearchAlgorithm):
+    """
+    A2c: Busca em Profundidade com Ramificação e Poda (DFBnB)
+
+    Percorre a árvore em profundidade guardando a melhor solução encontrada;
+    o custo dela vira o limite, e ramos com g(n) + h(n) >= limite são podados.
+    Ao esgotar a árvore, a melhor solução é ótima para C1-C4 (h = 0 sem
+    heurística). Sem solução conhecida, `depth_limit` evita mergulhos muito
+    fundos; com passos de custo mínimo 2, o padrão de 40 movimentos cobre
+    todo caminho de custo até 80, acima do maior custo ótimo do 8-Puzzle.
+
+    Como no IDDFS, cada ramo só evita os estados do próprio caminho, e a
+    tabela de transposição opcional (limitada a `transposition_size`
+    entradas) guarda o menor g com que cada estado foi alcançado, podando
+    chegadas com g maior ou igual. Sem heurística e sem tabela, a árvore
+    explorada cresce exponencialmente com a profundidade.
+
+    É uma busca anytime: cada solução melhor que a anterior é registrada em
+    `solutions` com o instante e o limite de subotimalidade comprovado,
+    custo / h(raiz) (infinito sem heurística), que cai para 1 quando a
+    árvore se esgota. Com um orçamento, devolve a melhor solução encontrada
+    até a interrupção.
+    """
+
+    anytime = True
+
+    def __init__(self, randomize_successors: bool = False, transposition_size: int = 0,
+                 depth_limit: int = 40):
+        super().__init__(randomize_successors)
+        self.transposition_size = transposition_size
+        self.depth_limit = depth_limit
+        self.solutions_found = 0
+        self.solutions: List[Dict] = []
+
+    def search(self, problem: Problem) -> Optional[Node]:
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        start_time = perf_counter()
+        root = Node(problem.initial_state)
+        self.nodes_generated = 1
+        self.nodes_visited = 0
+        self.solutions_found = 0
+        self.solutions = []
+
+        best: Optional[Node] = None
+        bound = float('inf')
+        transpositions: Dict[State, float] = {}
+        on_path: Set[State] = {root.state}
+        # Pilha de (nó, vetor de h, filhos ainda não visitados).
+        root_vector = problem.get_heuristic_vector(root.state)
+        root_h = problem.heuristic_from_vector(root_vector)
+        stack: List[list] = [[root, root_vector, None]]
+
+        while stack:
+            if budget is not None and budget.exhausted(self, len(stack), len(transpositions)):
+                return best
+            entry = stack[-1]
+            node, h_vector, children = entry
+            if children is None:
+                self.nodes_visited += 1
+                if problem.is_goal(node.state):
+                    # Só chegam aqui nós com custo abaixo do limite atual.
+                    best, bound = node, node.path_cost
+                    self.solutions_found += 1
+                    self._record_solution(node, node.path_cost / root_h if root_h > 0 else float('inf'),
+                                          start_time)
+                    on_path.discard(node.state)
+                    stack.pop()
+                    continue
+                if node.depth >= self.depth_limit:
+                    on_path.discard(node.state)
+                    stack.pop()
+                    continue
+                children = []
+                for child in self._get_successors(node, problem):
+                    if child.state in on_path:
+                        continue
+                    child_vector = problem.update_heuristic_vector(h_vector, node.state, child.state)
+                    children.append((child.path_cost + problem.heuristic_from_vector(child_vector),
+                                     child, child_vector))
+                if not self.randomize:
+                    # Filhos mais promissores primeiro, para encontrar cedo um limite bom.
+                    children.sort(key=lambda item: item[0])
+                children.reverse()  # pop() devolve os filhos na ordem escolhida
+                entry[2] = children
+                if stats is not None:
+                    stats.on_expand(self, node, len(stack), len(transpositions))
+
+            pushed = False
+            while children:
+                f_child, child, child_vector = children.pop()
+                if f_child >= bound:
+                    # Com os filhos ordenados por f, os demais também seriam podados.
+                    if not self.randomize:
+                        children.clear()
+                    continue
+                if child.state in on_path:
+                    continue
+                if self.transposition_size:
+                    best_g = transpositions.get(child.state)
+                    if best_g is not None and best_g <= child.path_cost:
+                        continue
+                    if best_g is not None or len(transpositions) < self.transposition_size:
+                        transpositions[child.state] = child.path_cost
+                on_path.add(child.state)
+                stack.append([child, child_vector, None])
+                pushed = True
+                break
+
+            if not pushed:
+                on_path.discard(node.state)
+                stack.pop()
+
+        if best is not None and self.solutions[-1]['suboptimality_bound'] > 1:
+            # Árvore esgotada: a última solução é a ótima.
+            self._record_solution(best, 1.0, start_time)
+        return best
+
+    def _record_solution(self, node: Node, bound: float, start_time: float):
+        self.solutions.append({
+            'time_sec': perf_counter() - start_time, 'path_cost': node.path_cost, 'path_length': node.depth,
+            'weight': 1.0, 'suboptimality_bound': bound,
+            'nodes_generated': self.nodes_generated, 'nodes_visited': self.nodes_visited,
+        })
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+Orçamentos das buscas, com cancelamento cooperativo.
+
+Com `SearchAlgorithm.set_budget(SearchBudget(...))`, a busca confere o
+orçamento no início de cada volta do seu laço principal, antes de retirar
+um nó da fronteira, então também contam as retiradas descartadas (entradas
+desatualizadas do heap, nós cortados pelo limite de profundidade). Ela
+para devolvendo None quando o orçamento se esgota; o motivo
+fica em `algorithm.budget_exceeded` ('time', 'nodes' ou 'memory'), e None
+nesse atributo distingue uma busca que terminou sem solução. Os contadores
+da busca (nós gerados, visitados, SearchStats) ficam com os valores parciais.
+As buscas anytime (ARA*, DFBnB) devolvem a melhor solução encontrada até a
+parada, também com o motivo em `budget_exceeded`.
+
+Os limites são conferidos a cada `check_interval` voltas, então podem ser
+ultrapassados em até esse número de expansões. O limite de memória é em
+entradas: fronteira mais visitados (nas buscas em profundidade, a pilha mais
+a tabela de transposição). Sem orçamento, as buscas só fazem um teste
+`budget is not None` por volta do laço.
+"""
+
+from time import perf_counter
+from typing import Any, Dict, Optional
+
+# Motivos gravados em `budget_exceeded`.
+BUDGET_REASONS = ('time', 'nodes', 'memory')
+
+
+class SearchBudget:
+    """Limites de uma busca: tempo de relógio, nós gerados e entradas em memória."""
+
+    def __init__(self, max_seconds: Optional[float] = None, max_nodes: Optional[int] = None,
+                 max_entries: Optional[int] = None, check_interval: int = 256):
+        self.max_seconds = max_seconds
+        self.max_nodes = max_nodes
+        self.max_entries = max_entries
+        self.check_interval = max(check_interval, 1)
+        self._deadline = float('inf')
+        self._countdown = self.check_interval
+
+    @classmethod
+    def from_dict(cls, limits: Optional[Dict[str, Any]]) -> Optional['SearchBudget']:
+        """Orçamento a partir de um dicionário com os argumentos do construtor; None se não houver limite."""
+        if not limits or all(value is None for key, value in limits.items() if key != 'check_interval'):
+            return None
+        return cls(**limits)
+
+    def start(self):
+        """Arma o orçamento para uma nova busca."""
+        self._deadline = perf_counter() + self.max_seconds if self.max_seconds is not None else float('inf')
+        self._countdown = self.check_interval
+
+    def exhausted(self, algorithm, frontier_size: int, closed_size: int) -> bool:
+        """
+        Chamado a cada volta do laço da busca; a cada `check_interval` chamadas
+        confere os limites e, se algum foi atingido, grava o motivo em
+        `algorithm.budget_exceeded`.
+        """
+        self._countdown -= 1
+        if self._countdown:
+            return False
+        self._countdown = self.check_interval
+        if self.max_nodes is not None and algorithm.nodes_generated >= self.max_nodes:
+            algorithm.budget_exceeded = 'nodes'
+        elif self.max_entries is not None and frontier_size + closed_size >= self.max_entries:
+            algorithm.budget_exceeded = 'memory'
+        elif perf_counter() >= self._deadline:
+            algorithm.budget_exceeded = 'time'
+        else:
+            return False
+        return True
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
+from array import array
 from typing import Optional
 
 from core.node import Node
 from problem.problem_interface import Problem
-from .search_interface import SearchAlgorithm
+from .search_interface import SearchAlgorithm, DenseTree
 
 
 class DepthFirstSearch(SearchAlgorithm):
@@ -14,19 +15,31 @@ class DepthFirstSearch(SearchAlgorithm):
     sempre termine e não se perca em ramos infinitos da árvore de busca.
     """
 
-    def __init__(self, randomize_successors: bool = False, depth_limit: int = 30):
-        super().__init__(randomize_successors)
+    # A ordem de expansão não depende dos custos dos passos nem de heurística.
+    search_parameters = ()
+
+    def __init__(self, randomize_successors: bool = False, depth_limit: int = 30,
+                 lazy_successors: bool = False):
+        super().__init__(randomize_successors, lazy_successors)
         self.depth_limit = depth_limit  # Adiciona um limite de profundidade
 
     def search(self, problem: Problem) -> Optional[Node]:
+        if problem.state_space is not None:
+            return self._search_dense(problem)
+
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
         initial_node = Node(problem.initial_state)
 
         frontier = [initial_node]  # Pilha (LIFO)
         visited = set()
         self.nodes_generated = 1
+        self.nodes_pruned = 0
         self.nodes_visited = 0
 
         while frontier:
+            if budget is not None and budget.exhausted(self, len(frontier), len(visited)):
+                return None
             node = frontier.pop()
 
             if problem.is_goal(node.state):
@@ -43,6 +56,49 @@ class DepthFirstSearch(SearchAlgorithm):
             for child in reversed(self._get_successors(node, problem)):
                 if child.state not in visited:
                     frontier.append(child)
+            if stats is not None:
+                stats.on_expand(self, node, len(frontier), len(visited))
 
         # Se a fronteira ficar vazia e nenhuma solução foi encontrada, retorna falha
         return None
+
+    def _search_dense(self, problem: Problem) -> Optional[Node]:
+        """Mesma busca sobre os índices do StateSpace, com visitados em um bytearray."""
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        start = problem.state_space.index_of(problem.initial_state)
+        tree = DenseTree(start)
+        depth = array('i', [0])  # Profundidade de cada nó da árvore
+
+        frontier = [0]  # Pilha (LIFO) de ids de nós
+        visited = bytearray(problem.state_space.SIZE)
+        self.nodes_generated = 1
+        self.nodes_pruned = 0
+        self.nodes_visited = 0
+
+        while frontier:
+            if budget is not None and budget.exhausted(self, len(frontier), len(tree.index)):
+                return None
+            node_id = frontier.pop()
+            index = tree.index[node_id]
+
+            if index in problem.dense_goals:
+                return tree.to_node(problem, node_id)
+
+            if depth[node_id] >= self.depth_limit:
+                continue
+
+            self.nodes_visited += 1
+            visited[index] = 1
+
+            # list(): com lazy_successors, os sucessores chegam de um gerador.
+            successors = list(self._get_dense_successors(problem, index, tree.action[node_id]))
+            for action, child, _ in reversed(successors):
+                if not visited[child]:
+                    frontier.append(tree.add(child, node_id, action))
+                    depth.append(depth[node_id] + 1)
+            if stats is not None:
+                # No modo denso, os visitados são os nós da DenseTree.
+                stats.on_expand(self, node_id, len(frontier), len(tree.index))
+
+        return None
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fronteiras (filas de prioridade) intercambiáveis para UCS, A* e Busca Gulosa.
+
+- 'heap': heap binário (heapq) com entradas duplicadas e remoção preguiçosa.
+- 'bucket': fila de baldes para prioridades inteiras, com push e pop em O(1).
+- 'indexed': heap binário indexado por estado, com decrease-key; cada estado
+  aparece no máximo uma vez, o que elimina as entradas desatualizadas.
+
+Empates de prioridade seguem a política `tie_breaking`:
+- 'low_g': menor g primeiro e depois ordem de inserção (padrão; é a ordem
+  histórica das buscas);
+- 'high_g': maior g primeiro (mais fundo na camada de f) e depois ordem de inserção;
+- 'fifo': ordem de inserção;
+- 'lifo': última inserção primeiro.
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import count
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+TIE_BREAKING_POLICIES = ('low_g', 'high_g', 'fifo', 'lifo')
+
+
+class Frontier(ABC):
+    """Interface comum das fronteiras; `peak_size` guarda o maior tamanho atingido."""
+
+    def __init__(self, tie_breaking: str = 'low_g'):
+        if tie_breaking not in TIE_BREAKING_POLICIES:
+            raise ValueError(f"Política de desempate desconhecida: {tie_breaking}")
+        self.tie_breaking = tie_breaking
+        self.peak_size = 0
+        self._counter = count()
+
+    def _tie_key(self, g: float) -> Tuple[float, int]:
+        """Chave de desempate (componente por g, ordem de inserção)."""
+        order = next(self._counter)
+        if self.tie_breaking == 'low_g':
+            return g, order
+        if self.tie_breaking == 'high_g':
+            return -g, order
+        if self.tie_breaking == 'fifo':
+            return 0, order
+        return 0, -order
+
+    @abstractmethod
+    def push(self, priority: float, g: float, item: Any, key: Optional[Hashable] = None):
+        """Insere `item` com a prioridade dada. `key` identifica o estado (usado pela fila indexada)."""
+        pass
+
+    @abstractmethod
+    def pop(self) -> Tuple[float, float, Any]:
+        """Remove e retorna (prioridade, g, item) da entrada de menor prioridade."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class BinaryHeapFrontier(Frontier):
+    """Heap binário sobre heapq; atualizações viram entradas duplicadas."""
+
+    def __init__(self, tie_breaking: str = 'low_g'):
+        super().__init__(tie_breaking)
+        self._heap: List[tuple] = []
+
+    def push(self, priority, g, item, key=None):
+        tie, order = self._tie_key(g)
+        heapq.heappush(self._heap, (priority, tie, order, g, item))
+        if len(self._heap) > self.peak_size:
+            self.peak_size = len(self._heap)
+
+    def pop(self):
+        priority, _, _, g, item = heapq.heappop(self._heap)
+        return priority, g, item
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketFrontier(Frontier):
+    """
+    Fila de baldes: um balde por valor inteiro de prioridade e um ponteiro para
+    o menor balde não vazio. Os custos C1-C4 (2, 3 ou 5) e as heurísticas
+    H1/H2/H* são inteiros, então as prioridades cabem nesse formato.
+    Com 'fifo'/'lifo' o balde é uma deque (O(1)); com 'low_g'/'high_g' cada
+    balde é um pequeno heap ordenado pela chave de desempate.
+    """
+
+    def __init__(self, tie_breaking: str = 'low_g'):
+        super().__init__(tie_breaking)
+        self._buckets: List[Any] = []
+        self._min_index = 0
+        self._size = 0
+        self._use_deque = tie_breaking in ('fifo', 'lifo')
+
+    def push(self, priority, g, item, key=None):
+        index = int(priority)
+        if index != priority or index < 0:
+            raise ValueError(f"A fila de baldes exige prioridades inteiras não negativas (recebeu {priority}).")
+        while len(self._buckets) <= index:
+            self._buckets.append(deque() if self._use_deque else [])
+        if self._use_deque:
+            self._buckets[index].append((g, item))
+        else:
+            tie, order = self._tie_key(g)
+            heapq.heappush(self._buckets[index], (tie, order, g, item))
+        # Heurísticas inconsistentes podem gerar prioridades abaixo do ponteiro.
+        if index < self._min_index:
+            self._min_index = index
+        self._size += 1
+        if self._size > self.peak_size:
+            self.peak_size = self._size
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop de fronteira vazia")
+        while not self._buckets[self._min_index]:
+            self._min_index += 1
+        bucket = self._buckets[self._min_index]
+        if self.tie_breaking == 'fifo':
+            g, item = bucket.popleft()
+        elif self.tie_breaking == 'lifo':
+            g, item = bucket.pop()
+        else:
+            _, _, g, item = heapq.heappop(bucket)
+        self._size -= 1
+        return float(self._min_index), g, item
+
+    def __len__(self):
+        return self._size
+
+
+class IndexedHeapFrontier(Frontier):
+    """
+    Heap binário com mapa estado -> posição. Inserir um estado que já está na
+    fronteira só tem efeito se a nova entrada for melhor (decrease-key); caso
+    contrário é ignorado. Assim nunca há entradas desatualizadas para descartar.
+    """
+
+    def __init__(self, tie_breaking: str = 'low_g'):
+        super().__init__(tie_breaking)
+        self._heap: List[list] = []  # [prioridade, desempate, ordem, g, item, chave]
+        self._positions: Dict[Hashable, int] = {}
+
+    def push(self, priority, g, item, key=None):
+        position = self._positions.get(key)
+        tie, order = self._tie_key(g)
+        if position is None:
+            entry = [priority, tie, order, g, item, key]
+            self._heap.append(entry)
+            self._positions[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            if len(self._heap) > self.peak_size:
+                self.peak_size = len(self._heap)
+            return
+
+        entry = self._heap[position]
+        if (priority, tie) < (entry[0], entry[1]):
+            entry[0], entry[1], entry[2], entry[3], entry[4] = priority, tie, order, g, item
+            self._sift_up(position)
+
+    def pop(self):
+        heap = self._heap
+        last = heap.pop()
+        if heap:
+            top = heap[0]
+            heap[0] = last
+            self._positions[last[5]] = 0
+            self._sift_down(0)
+        else:
+            top = last
+        del self._positions[top[5]]
+        return top[0], top[3], top[4]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _sift_up(self, position: int):
+        heap, positions = self._heap, self._positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if entry < heap[parent]:
+                heap[position] = heap[parent]
+                positions[heap[position][5]] = position
+                position = parent
+            else:
+                break
+        heap[position] = entry
+        positions[entry[5]] = position
+
+    def _sift_down(self, position: int):
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if heap[child] < entry:
+                heap[position] = heap[child]
+                positions[heap[position][5]] = position
+                position = child
+            else:
+                break
+        heap[position] = entry
+        positions[entry[5]] = position
+
+
+FRONTIER_TYPES = {
+    'heap': BinaryHeapFrontier,
+    'bucket': BucketFrontier,
+    'indexed': IndexedHeapFrontier,
+}
+
+
+def make_frontier(frontier_type: str = 'heap', tie_breaking: str = 'low_g') -> Frontier:
+    """Cria a fronteira pelo nome ('heap', 'bucket' ou 'indexed')."""
+    if frontier_type not in FRONTIER_TYPES:
+        raise ValueError(f"Tipo de fronteira desconhecido: {frontier_type}")
+    return FRONTIER_TYPES[frontier_type](tie_breaking)
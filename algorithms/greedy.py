@@ -1,34 +1,110 @@
 # -*- coding: utf-8 -*-
-import heapq
 from typing import Optional
 
 from core.node import Node
 from problem.problem_interface import Problem
-from .search_interface import SearchAlgorithm
+from .frontier import make_frontier
+from .search_interface import SearchAlgorithm, DenseTree, NodePool
 
 
 class GreedyBestFirstSearch(SearchAlgorithm):
-    """A4: Busca Gulosa"""
+    """
+    A4: Busca Gulosa
+
+    `frontier_type` e `tie_breaking` escolhem a fila de prioridade (ver
+    algorithms.frontier); o padrão é o heap binário com desempate por menor g.
+    Por causa desse desempate, o custo faz parte de `search_parameters`.
+    """
+
+    def __init__(self, randomize_successors: bool = False, frontier_type: str = 'heap',
+                 tie_breaking: str = 'low_g', lazy_successors: bool = False):
+        super().__init__(randomize_successors, lazy_successors)
+        self.frontier_type = frontier_type
+        self.tie_breaking = tie_breaking
+        self.frontier = None
 
     def search(self, problem: Problem) -> Optional[Node]:
-        initial_node = Node(problem.initial_state)
-        h_val = problem.get_heuristic(initial_node.state)
-        frontier = [(h_val, initial_node)]  # Fila de Prioridade por h(n)
-        heapq.heapify(frontier)
-        visited = {initial_node.state}
+        if problem.state_space is not None:
+            return self._search_dense(problem)
+
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        pool = NodePool(problem.initial_state)
+        # O vetor da heurística viaja com o nó na fronteira e é atualizado
+        # incrementalmente para cada filho.
+        h_vector = problem.get_heuristic_vector(problem.initial_state)
+        h_val = problem.heuristic_from_vector(h_vector)
+        # Itens da fronteira: (id na NodePool, vetor de h), com o estado como chave.
+        frontier = self.frontier = make_frontier(self.frontier_type, self.tie_breaking)  # Fila de Prioridade por h(n)
+        if stats is not None:
+            stats.instrument_frontier(frontier)
+        frontier.push(h_val, 0, (0, h_vector), problem.initial_state)
+        visited = {problem.initial_state}
+        self.nodes_generated = 1
+        self.nodes_pruned = 0
+        self.nodes_visited = 0
+
+        while frontier:
+            if budget is not None and budget.exhausted(self, len(frontier), len(visited)):
+                return None
+            _, g_cost, (node_id, h_vector) = frontier.pop()
+            self.nodes_visited += 1
+            state = pool.states[node_id]
+
+            if problem.is_goal(state):
+                return pool.to_node(node_id)
+
+            for action, child, step_cost in self._get_pool_successors(problem, state, pool.action[node_id]):
+                if child not in visited:
+                    visited.add(child)
+                    g_child = g_cost + step_cost
+                    h_child_vector = problem.update_heuristic_vector(h_vector, state, child)
+                    h_child = problem.heuristic_from_vector(h_child_vector)
+                    frontier.push(h_child, g_child, (pool.add(child, node_id, action, g_child), h_child_vector), child)
+
+            if stats is not None:
+                stats.on_expand(self, node_id, len(frontier), len(visited))
+        return None
+
+    def _search_dense(self, problem: Problem) -> Optional[Node]:
+        """Mesma busca sobre os índices do StateSpace, com visitados em um bytearray."""
+        space = problem.state_space
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        start = space.index_of(problem.initial_state)
+        tree = DenseTree(start)
+        h_vector = problem.get_heuristic_vector(problem.initial_state)
+        # Itens da fronteira: (id do nó, vetor de h); a chave é o índice do estado.
+        frontier = self.frontier = make_frontier(self.frontier_type, self.tie_breaking)
+        if stats is not None:
+            stats.instrument_frontier(frontier)
+        frontier.push(problem.heuristic_from_vector(h_vector), 0, (0, h_vector), start)
+        visited = bytearray(space.SIZE)
+        visited[start] = 1
         self.nodes_generated = 1
+        self.nodes_pruned = 0
         self.nodes_visited = 0
 
         while frontier:
-            _, node = heapq.heappop(frontier)
+            if budget is not None and budget.exhausted(self, len(frontier), len(tree.index)):
+                return None
+            _, g_cost, (node_id, h_vector) = frontier.pop()
             self.nodes_visited += 1
+            index = tree.index[node_id]
+
+            if index in problem.dense_goals:
+                return tree.to_node(problem, node_id)
 
-            if problem.is_goal(node.state):
-                return node
+            state = space.state_at(index)
+            for action, child, step_cost in self._get_dense_successors(problem, index, tree.action[node_id]):
+                if not visited[child]:
+                    visited[child] = 1
+                    h_child_vector = problem.update_heuristic_vector(h_vector, state, space.state_at(child))
+                    h_child = problem.heuristic_from_vector(h_child_vector)
+                    g_child = g_cost + step_cost
+                    frontier.push(h_child, g_child, (tree.add(child, node_id, action), h_child_vector), child)
 
-            for child in self._get_successors(node, problem):
-                if child.state not in visited:
-                    visited.add(child.state)
-                    h_child = problem.get_heuristic(child.state)
-                    heapq.heappush(frontier, (h_child, child))
+            if stats is not None:
+                # No modo denso, os visitados são os nós da DenseTree.
+                stats.on_expand(self, node_id, len(frontier), len(tree.index))
         return None
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from typing import Dict, Optional, Tuple
+
+from core.node import Node
+from core.state import State
+from problem.problem_interface import Problem
+from .search_interface import SearchAlgorithm
+
+
+class IterativeDeepeningAStar(SearchAlgorithm):
+    """
+    A6: Busca A* com Aprofundamento Iterativo (IDA*)
+
+    Faz buscas em profundidade limitadas por f(n) = g(n) + h(n). Cada iteração
+    usa como novo limite o menor f que ultrapassou o limite anterior, o que
+    mantém a otimalidade também com os custos não uniformes de C2-C4. Só o
+    caminho atual e os irmãos pendentes ficam na memória (linear na
+    profundidade), e o movimento que desfaz a ação do pai não é gerado.
+
+    Opcionalmente, uma tabela de transposição limitada a `transposition_size`
+    entradas guarda o menor g com que cada estado foi expandido na iteração
+    atual e poda chegadas com g maior ou igual.
+    """
+
+    def __init__(self, randomize_successors: bool = False, transposition_size: int = 0):
+        super().__init__(randomize_successors)
+        self.transposition_size = transposition_size
+        self.iterations = 0
+
+    def search(self, problem: Problem) -> Optional[Node]:
+        self._start_stats(problem)
+        self._start_budget()
+        root = Node(problem.initial_state)
+        root_vector = problem.get_heuristic_vector(root.state)
+        threshold = problem.heuristic_from_vector(root_vector)
+        self.nodes_generated = 1
+        self.nodes_pruned = 0
+        self.nodes_visited = 0
+        self.iterations = 0
+
+        while True:
+            self.iterations += 1
+            solution, next_threshold = self._bounded_search(problem, root, root_vector, threshold)
+            if solution is not None:
+                return solution
+            if next_threshold == float('inf'):
+                return None  # Nenhum nó ultrapassou o limite: o espaço foi esgotado
+            threshold = next_threshold
+
+    def _bounded_search(self, problem: Problem, root: Node, root_vector: Tuple[float, ...],
+                        threshold: float) -> Tuple[Optional[Node], float]:
+        """
+        Busca em profundidade que só aceita nós com f <= threshold.
+        Retorna o nó objetivo (ou None) e o menor f acima do limite (infinito
+        quando o orçamento se esgota, para que não haja nova iteração).
+        """
+        next_threshold = float('inf')
+        transpositions: Dict[State, float] = {}
+        frontier = [(root, root_vector)]  # Pilha (LIFO)
+        stats = self.stats
+        budget = self.budget
+
+        while frontier:
+            if budget is not None and budget.exhausted(self, len(frontier), len(transpositions)):
+                return None, float('inf')
+            node, h_vector = frontier.pop()
+            self.nodes_visited += 1
+
+            if problem.is_goal(node.state):
+                return node, next_threshold
+
+            if self.transposition_size:
+                best_g = transpositions.get(node.state)
+                if best_g is not None and best_g <= node.path_cost:
+                    continue
+                if best_g is not None or len(transpositions) < self.transposition_size:
+                    transpositions[node.state] = node.path_cost
+
+            # Poda do movimento inverso: voltar ao estado do pai nunca ajuda, e
+            # esse filho nem é gerado (conta em `nodes_pruned`).
+            for child in reversed(self._pruned_successors(node, problem)):
+                child_vector = problem.update_heuristic_vector(h_vector, node.state, child.state)
+                f_child = child.path_cost + problem.heuristic_from_vector(child_vector)
+                if f_child > threshold:
+                    next_threshold = min(next_threshold, f_child)
+                    continue
+                frontier.append((child, child_vector))
+            if stats is not None:
+                # Os "visitados" do IDA* são as entradas da tabela de transposição.
+                stats.on_expand(self, node, len(frontier), len(transpositions))
+
+        return None, next_threshold
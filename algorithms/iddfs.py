@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from typing import Dict, List, Optional, Set
+
+from core.node import Node
+from core.state import State
+from problem.problem_interface import Problem
+from .search_interface import SearchAlgorithm
+
+
+class IterativeDeepeningSearch(SearchAlgorithm):
+    """
+    A2b: Busca em Profundidade com Aprofundamento Iterativo (IDDFS)
+
+    Repete buscas em profundidade com limite 0, 1, 2, ... até encontrar um
+    objetivo, de modo que a primeira solução tem o menor número de
+    movimentos. Em vez de um conjunto global de visitados, cada ramo só
+    evita os estados do próprio caminho (checagem de ciclos pelo caminho),
+    então a memória é proporcional à profundidade.
+
+    Opcionalmente, uma tabela de transposição limitada a `transposition_size`
+    entradas guarda a menor profundidade com que cada estado foi alcançado
+    na iteração atual e poda chegadas iguais ou mais fundas.
+    """
+
+    # O limite é em número de movimentos: os custos dos passos não mudam a busca.
+    search_parameters = ()
+
+    def __init__(self, randomize_successors: bool = False, transposition_size: int = 0,
+                 max_depth: int = 100):
+        super().__init__(randomize_successors)
+        self.transposition_size = transposition_size
+        self.max_depth = max_depth
+        self.iterations = 0
+
+    def search(self, problem: Problem) -> Optional[Node]:
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        root = Node(problem.initial_state)
+        self.nodes_generated = 1
+        self.nodes_visited = 0
+        self.iterations = 0
+
+        for limit in range(self.max_depth + 1):
+            self.iterations += 1
+            solution, cutoff = self._depth_limited(problem, root, limit, stats, budget)
+            if solution is not None:
+                return solution
+            if not cutoff:
+                return None  # Nenhum ramo foi cortado pelo limite: o espaço foi esgotado
+        return None
+
+    def _depth_limited(self, problem: Problem, root: Node, limit: int, stats, budget):
+        """
+        Busca em profundidade até `limit` movimentos. Retorna o nó objetivo
+        (ou None) e se algum ramo foi cortado pelo limite (False quando o
+        orçamento se esgota, para que não haja nova iteração).
+        """
+        transpositions: Dict[State, int] = {}
+        on_path: Set[State] = {root.state}
+        # Pilha de (nó, filhos ainda não visitados); só o caminho atual fica na memória.
+        stack: List[tuple] = [(root, None)]
+        cutoff = False
+
+        while stack:
+            if budget is not None and budget.exhausted(self, len(stack), len(transpositions)):
+                return None, False
+            node, children = stack[-1]
+            if children is None:
+                self.nodes_visited += 1
+                if problem.is_goal(node.state):
+                    return node, cutoff
+                if node.depth >= limit:
+                    cutoff = True
+                    on_path.discard(node.state)
+                    stack.pop()
+                    continue
+                children = self._get_successors(node, problem)
+                children.reverse()  # pop() devolve os filhos na ordem original
+                stack[-1] = (node, children)
+                if stats is not None:
+                    stats.on_expand(self, node, len(stack), len(transpositions))
+
+            child = None
+            while children:
+                candidate = children.pop()
+                if candidate.state in on_path:
+                    continue
+                if self.transposition_size:
+                    best_depth = transpositions.get(candidate.state)
+                    if best_depth is not None and best_depth <= candidate.depth:
+                        continue
+                    if best_depth is not None or len(transpositions) < self.transposition_size:
+                        transpositions[candidate.state] = candidate.depth
+                child = candidate
+                break
+
+            if child is None:
+                on_path.discard(node.state)
+                stack.pop()
+            else:
+                on_path.add(child.state)
+                stack.append((child, None))
+
+        return None, cutoff
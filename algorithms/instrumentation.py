@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentação opcional das buscas.
+
+Com `SearchAlgorithm.enable_instrumentation()`, a busca preenche um
+SearchStats com:
+- picos da fronteira e do conjunto de visitados/fechados;
+- entradas desatualizadas descartadas (UCS, A*) e reaberturas de estados
+  já expandidos;
+- tempo gasto gerando sucessores, avaliando a heurística e operando a
+  fila de prioridade;
+- o pico de memória do tracemalloc, quando pedido (medido pelo runner).
+
+Os ganchos (`SearchAlgorithm.add_hook`) são chamados a cada expansão com
+(algoritmo, nó, tamanho da fronteira, tamanho dos visitados); nas buscas
+sobre NodePool ou DenseTree o nó é o id nessa estrutura. Sem instrumentação, as buscas só fazem um teste
+`stats is not None` por expansão.
+"""
+
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Set
+
+# Métodos do problema cujo tempo conta como avaliação da heurística.
+HEURISTIC_METHODS = ('get_heuristic', 'get_heuristics', 'get_heuristic_vector',
+                     'update_heuristic_vector', 'heuristic_from_vector')
+
+# Colunas acrescentadas ao CSV quando a instrumentação está ligada.
+STATS_COLUMNS = [
+    'peak_frontier', 'peak_closed', 'stale_pops', 'reopenings',
+    'time_successors_sec', 'time_heuristic_sec', 'time_queue_sec', 'peak_memory_bytes'
+]
+
+ExpansionHook = Callable[[Any, Any, int, int], None]
+
+
+class SearchStats:
+    """Contadores e temporizadores de uma execução de busca."""
+
+    def __init__(self, hooks: List[ExpansionHook] = ()):
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.stale_pops = 0
+        self.reopenings = 0
+        self.time_successors = 0.0
+        self.time_heuristic = 0.0
+        self.time_queue = 0.0
+        self.peak_memory_bytes = None
+        self.hooks = list(hooks)
+        # Estados (ou índices) já expandidos, para detectar reaberturas.
+        self.expanded: Set[Any] = set()
+        self._timing = False
+
+    def on_expand(self, algorithm, node, frontier_size: int, closed_size: int, key=None):
+        """
+        Registra a expansão de `node` e chama os ganchos. As buscas que podem
+        reabrir estados (UCS, A*) passam a chave do estado em `key`.
+        """
+        if key is not None:
+            self.expanded.add(key)
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        for hook in self.hooks:
+            hook(algorithm, node, frontier_size, closed_size)
+
+    def on_push(self, key):
+        """Conta uma reabertura quando um estado já expandido volta à fronteira."""
+        if key in self.expanded:
+            self.reopenings += 1
+
+    def timed(self, category: str, function: Callable) -> Callable:
+        """
+        Envolve `function` para somar seu tempo em `time_<category>`. Chamadas
+        aninhadas (get_heuristic chamando get_heuristic_vector) só contam uma vez.
+        """
+        attribute = f"time_{category}"
+
+        def wrapper(*args, **kwargs):
+            if self._timing:
+                return function(*args, **kwargs)
+            self._timing = True
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                setattr(self, attribute, getattr(self, attribute) + perf_counter() - start)
+                self._timing = False
+        return wrapper
+
+    def instrument_problem(self, problem):
+        """Passa a medir o tempo dos métodos de heurística desta instância do problema."""
+        for name in HEURISTIC_METHODS:
+            # Descarta os envoltórios de uma busca instrumentada anterior sobre o mesmo problema.
+            problem.__dict__.pop(name, None)
+            setattr(problem, name, self.timed('heuristic', getattr(problem, name)))
+
+    def instrument_frontier(self, frontier):
+        """Passa a medir o tempo de push/pop desta fronteira."""
+        frontier.push = self.timed('queue', frontier.push)
+        frontier.pop = self.timed('queue', frontier.pop)
+
+    def as_row(self) -> Dict[str, Any]:
+        """Valores das colunas STATS_COLUMNS."""
+        return {
+            'peak_frontier': self.peak_frontier,
+            'peak_closed': self.peak_closed,
+            'stale_pops': self.stale_pops,
+            'reopenings': self.reopenings,
+            'time_successors_sec': round(self.time_successors, 4),
+            'time_heuristic_sec': round(self.time_heuristic, 4),
+            'time_queue_sec': round(self.time_queue, 4),
+            'peak_memory_bytes': self.peak_memory_bytes if self.peak_memory_bytes is not None else 'N/A',
+        }
@@ -5,30 +5,299 @@ Define a interface (classe abstrata) para um algoritmo de busca.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from array import array
+from time import perf_counter
+from typing import Iterable, Optional, List, Tuple
 import random
 
 from core.node import Node
+from core.state import State
 from problem.problem_interface import Problem
+from problem.state_space import ACTIONS, ACTION_CODES, BLANK_ACTIONS
+from .budget import SearchBudget
+from .instrumentation import SearchStats, ExpansionHook
+
+
+class DenseTree:
+    """
+    Árvore de busca do modo denso guardada em vetores paralelos.
+
+    Cada nó gerado recebe um id sequencial; `index`, `parent` e `action`
+    guardam o índice do estado no StateSpace, o id do nó pai (-1 na raiz)
+    e o código da ação. Só o caminho da solução vira objetos Node.
+    """
+
+    def __init__(self, root_index: int):
+        self.index = array('i', [root_index])
+        self.parent = array('i', [-1])
+        self.action = array('b', [-1])
+
+    def add(self, state_index: int, parent_id: int, action: int) -> int:
+        """Registra um novo nó e retorna seu id."""
+        self.index.append(state_index)
+        self.parent.append(parent_id)
+        self.action.append(action)
+        return len(self.index) - 1
+
+    def to_node(self, problem: Problem, node_id: int) -> Node:
+        """Materializa a cadeia de Nodes da raiz até o nó `node_id`."""
+        chain = []
+        while node_id != -1:
+            chain.append(node_id)
+            node_id = self.parent[node_id]
+
+        space = problem.state_space
+        root_id = chain.pop()
+        node = Node(space.state_at(self.index[root_id]))
+        for node_id in reversed(chain):
+            action = self.action[node_id]
+            cost = problem.dense_costs[node.state.blank_pos * len(ACTIONS) + action]
+            node = Node(space.state_at(self.index[node_id]), node, ACTIONS[action], node.path_cost + cost)
+        return node
+
+
+class NodePool:
+    """
+    Árvore de busca do caminho por objetos (qualquer tamanho de tabuleiro)
+    guardada em vetores paralelos, no lugar de um Node por nó gerado.
+
+    Cada nó recebe um id sequencial; `states`, `parent`, `action`, `cost` e
+    `depth` guardam o estado, o id do pai (-1 na raiz), o código da ação,
+    g(n) e a profundidade. As buscas referenciam nós pelo id, e só o
+    caminho da solução é materializado como Nodes (ver `to_node`).
+    """
+
+    def __init__(self, root_state: State):
+        self.states: List[State] = [root_state]
+        self.parent = array('i', [-1])
+        self.action = array('b', [-1])
+        self.cost = array('d', [0.0])
+        self.depth = array('i', [0])
+
+    def add(self, state: State, parent_id: int, action: str, cost: float) -> int:
+        """Registra um novo nó (filho de `parent_id`, com g(n) = `cost`) e retorna seu id."""
+        self.states.append(state)
+        self.parent.append(parent_id)
+        self.action.append(ACTION_CODES[action])
+        self.cost.append(cost)
+        self.depth.append(self.depth[parent_id] + 1)
+        return len(self.states) - 1
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def get_path(self, node_id: int) -> List[State]:
+        """Sequência de estados da raiz até o nó `node_id`, seguindo os ids dos pais."""
+        path = []
+        while node_id != -1:
+            path.append(self.states[node_id])
+            node_id = self.parent[node_id]
+        return path[::-1]
+
+    def to_node(self, node_id: int) -> Node:
+        """Materializa a cadeia de Nodes da raiz até o nó `node_id`."""
+        chain = []
+        while node_id != -1:
+            chain.append(node_id)
+            node_id = self.parent[node_id]
+
+        root_id = chain.pop()
+        node = Node(self.states[root_id])
+        for node_id in reversed(chain):
+            node = Node(self.states[node_id], node, ACTIONS[self.action[node_id]], self.cost[node_id])
+        return node
 
 
 class SearchAlgorithm(ABC):
     """Classe base para os algoritmos de busca, com lógica compartilhada."""
 
-    def __init__(self, randomize_successors: bool = False):
+    # Parâmetros do problema que podem mudar o resultado da busca. O runner
+    # executa uma única vez as unidades que só diferem nos demais (ver
+    # ExperimentRunner._plan) e recalcula o custo do caminho para cada uma.
+    search_parameters: Tuple[str, ...] = ('cost_type', 'heuristic')
+
+    # Buscas anytime registram cada solução melhorada em `solutions` (dicionários
+    # com instante, custo, peso e limite de subotimalidade); o runner grava
+    # esse perfil à parte e não usa o cache para elas.
+    anytime = False
+
+    def __init__(self, randomize_successors: bool = False, lazy_successors: bool = False):
         self.randomize = randomize_successors
+        # Com `lazy_successors`, os sucessores saem de geradores que descartam
+        # o movimento inverso ao que gerou o nó (ver `_iter_pool_successors`).
+        self.lazy = lazy_successors
         self.nodes_generated = 0
+        self.nodes_pruned = 0
         self.nodes_visited = 0
+        # Instrumentação opcional (ver algorithms.instrumentation).
+        self.stats: Optional[SearchStats] = None
+        self._instrumented = False
+        self._hooks: List[ExpansionHook] = []
+        # Orçamento opcional (ver algorithms.budget); o motivo da parada fica em `budget_exceeded`.
+        self.budget: Optional[SearchBudget] = None
+        self.budget_exceeded: Optional[str] = None
 
     @abstractmethod
     def search(self, problem: Problem) -> Optional[Node]:
         """Executa a busca e retorna o nó objetivo ou None se falhar."""
         pass
 
+    def enable_instrumentation(self):
+        """Liga a coleta de SearchStats nas próximas buscas; o resultado fica em `self.stats`."""
+        self._instrumented = True
+
+    def add_hook(self, hook: ExpansionHook):
+        """Registra um gancho chamado a cada expansão (liga a instrumentação)."""
+        self._hooks.append(hook)
+        self._instrumented = True
+
+    def set_budget(self, budget: Optional[SearchBudget]):
+        """Limita as próximas buscas a `budget` (None remove o limite)."""
+        self.budget = budget
+
+    def _start_budget(self) -> Optional[SearchBudget]:
+        """Arma o orçamento da busca atual, ou retorna None se não houver um."""
+        self.budget_exceeded = None
+        if self.budget is not None:
+            self.budget.start()
+        return self.budget
+
+    def _start_stats(self, problem: Problem) -> Optional[SearchStats]:
+        """Cria o SearchStats da busca atual, ou None se a instrumentação estiver desligada."""
+        if not self._instrumented:
+            self.stats = None
+            return None
+        self.stats = SearchStats(self._hooks)
+        self.stats.instrument_problem(problem)
+        return self.stats
+
     def _get_successors(self, node: Node, problem: Problem) -> List[Node]:
         """Gera sucessores, com opção de embaralhar a ordem para o Experimento 4."""
-        successors = node.expand(problem)
+        if self.lazy:
+            return self._pruned_successors(node, problem)
+        if self.stats is not None:
+            start = perf_counter()
+            successors = node.expand(problem)
+            self.stats.time_successors += perf_counter() - start
+        else:
+            successors = node.expand(problem)
+        self.nodes_generated += len(successors)
+        if self.randomize:
+            random.shuffle(successors)
+        return successors
+
+    def _pruned_successors(self, node: Node, problem: Problem) -> List[Node]:
+        """
+        `_get_successors` sem o filho que desfaz `node.action` (sempre o pai,
+        que as buscas descartariam depois). Embaralha a lista completa de
+        ações antes de podar, para manter a mesma ordem do modo normal.
+        """
+        start = perf_counter() if self.stats is not None else 0.0
+        actions = problem.get_actions(node.state)
+        if self.randomize:
+            random.shuffle(actions)
+        inverse = ACTION_CODES[node.action] ^ 1 if node.action is not None else -1
+        successors = []
+        for action in actions:
+            if ACTION_CODES[action] == inverse:
+                self.nodes_pruned += 1
+                continue
+            successors.append(Node(problem.get_result(node.state, action), node, action,
+                                   node.path_cost + problem.get_cost(node.state, action)))
+        if self.stats is not None:
+            self.stats.time_successors += perf_counter() - start
+        self.nodes_generated += len(successors)
+        return successors
+
+    def _get_pool_successors(self, problem: Problem, state: State,
+                             parent_action: int = -1) -> Iterable[Tuple[str, State, float]]:
+        """
+        Equivalente de `_get_successors` para a NodePool: retorna triplas
+        (ação, estado, custo do passo) na mesma ordem de `expand`, sem criar
+        Nodes, embaralhadas da mesma forma quando pedido. `parent_action` é
+        o código da ação que gerou `state` (-1 na raiz).
+        """
+        if self.lazy:
+            return self._iter_pool_successors(problem, state, parent_action)
+        start = perf_counter() if self.stats is not None else 0.0
+        successors = list(problem.successors(state))
+        if self.stats is not None:
+            self.stats.time_successors += perf_counter() - start
         self.nodes_generated += len(successors)
         if self.randomize:
             random.shuffle(successors)
         return successors
+
+    def _iter_pool_successors(self, problem: Problem, state: State, parent_action: int):
+        """
+        Versão preguiçosa de `_get_pool_successors`: cada filho só é
+        construído quando pedido, e o movimento inverso a `parent_action`
+        (que voltaria ao pai) é descartado sem chamar get_result.
+
+        `nodes_generated` conta só os filhos construídos e `nodes_pruned` os
+        inversos descartados; quando a busca consome o gerador até o fim, a
+        soma dos dois é o `nodes_generated` do modo normal. A BFS, que para
+        no primeiro filho objetivo, pode construir menos filhos ainda.
+        """
+        actions = problem.get_actions(state)
+        if self.randomize:
+            # Embaralha antes de podar: a ordem dos filhos restantes é a mesma do modo normal.
+            random.shuffle(actions)
+        inverse = parent_action ^ 1 if parent_action >= 0 else -1
+        stats = self.stats
+        for action in actions:
+            if ACTION_CODES[action] == inverse:
+                self.nodes_pruned += 1
+                continue
+            start = perf_counter() if stats is not None else 0.0
+            child = problem.get_result(state, action)
+            step_cost = problem.get_cost(state, action)
+            if stats is not None:
+                stats.time_successors += perf_counter() - start
+            self.nodes_generated += 1
+            yield action, child, step_cost
+
+    def _get_dense_successors(self, problem: Problem, index: int,
+                              parent_action: int = -1) -> Iterable[Tuple[int, int, float]]:
+        """
+        Equivalente denso de `_get_successors`: retorna triplas (ação, índice,
+        custo do passo) na mesma ordem de `expand`, embaralhadas da mesma forma
+        quando pedido. Com `lazy_successors`, devolve um gerador que descarta
+        o inverso de `parent_action`, como `_iter_pool_successors`.
+        """
+        space = problem.state_space
+        blank_pos = index // space.PERMS_PER_BLANK
+        if self.lazy:
+            return self._iter_dense_successors(problem, index, blank_pos, parent_action)
+        base = space.NUM_ACTIONS * index
+        cost_base = space.NUM_ACTIONS * blank_pos
+        neighbors = space.neighbors
+        costs = problem.dense_costs
+        start = perf_counter() if self.stats is not None else 0.0
+        successors = [(action, neighbors[base + action], costs[cost_base + action])
+                      for action in BLANK_ACTIONS[blank_pos]]
+        if self.stats is not None:
+            self.stats.time_successors += perf_counter() - start
+        self.nodes_generated += len(successors)
+        if self.randomize:
+            random.shuffle(successors)
+        return successors
+
+    def _iter_dense_successors(self, problem: Problem, index: int, blank_pos: int, parent_action: int):
+        """Versão preguiçosa de `_get_dense_successors` (ver `_iter_pool_successors`)."""
+        space = problem.state_space
+        base = space.NUM_ACTIONS * index
+        cost_base = space.NUM_ACTIONS * blank_pos
+        neighbors = space.neighbors
+        costs = problem.dense_costs
+        actions = BLANK_ACTIONS[blank_pos]
+        if self.randomize:
+            actions = list(actions)
+            random.shuffle(actions)
+        inverse = parent_action ^ 1 if parent_action >= 0 else -1
+        for action in actions:
+            if action == inverse:
+                self.nodes_pruned += 1
+                continue
+            self.nodes_generated += 1
+            yield action, neighbors[base + action], costs[cost_base + action]
@@ -1,36 +1,114 @@
 # -*- coding: utf-8 -*-
-import heapq
+from array import array
 from typing import Optional
 
 from core.node import Node
 from problem.problem_interface import Problem
-from .search_interface import SearchAlgorithm
+from .frontier import make_frontier
+from .search_interface import SearchAlgorithm, DenseTree, NodePool
 
 
 class UniformCostSearch(SearchAlgorithm):
-    """A3: Busca de Custo Uniforme (Dijkstra)"""
+    """
+    A3: Busca de Custo Uniforme (Dijkstra)
+
+    `frontier_type` e `tie_breaking` escolhem a fila de prioridade (ver
+    algorithms.frontier); o padrão é o heap binário com desempate por ordem
+    de inserção. Com 'indexed', cada estado fica no máximo uma vez na fila.
+    """
+
+    def __init__(self, randomize_successors: bool = False, frontier_type: str = 'heap',
+                 tie_breaking: str = 'low_g', lazy_successors: bool = False):
+        super().__init__(randomize_successors, lazy_successors)
+        self.frontier_type = frontier_type
+        self.tie_breaking = tie_breaking
+        self.frontier = None
 
     def search(self, problem: Problem) -> Optional[Node]:
-        initial_node = Node(problem.initial_state)
-        frontier = [(0, initial_node)]  # (cost, node) - Fila de Prioridade
-        heapq.heapify(frontier)
+        if problem.state_space is not None:
+            return self._search_dense(problem)
+
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        pool = NodePool(problem.initial_state)
+        # Itens da fronteira: id do nó na NodePool; a chave é o estado.
+        frontier = self.frontier = make_frontier(self.frontier_type, self.tie_breaking)  # Fila de Prioridade por custo
+        if stats is not None:
+            stats.instrument_frontier(frontier)
+        frontier.push(0, 0, 0, problem.initial_state)
         visited = {}  # Dicionário para armazenar o menor custo para cada estado
         self.nodes_generated = 1
+        self.nodes_pruned = 0
+        self.nodes_visited = 0
+
+        while frontier:
+            if budget is not None and budget.exhausted(self, len(frontier), len(visited)):
+                return None
+            cost, _, node_id = frontier.pop()
+            self.nodes_visited += 1
+            state = pool.states[node_id]
+
+            if state in visited and visited[state] < cost:
+                if stats is not None:
+                    stats.stale_pops += 1
+                continue
+
+            if problem.is_goal(state):
+                return pool.to_node(node_id)
+
+            visited[state] = cost
+
+            for action, child, step_cost in self._get_pool_successors(problem, state, pool.action[node_id]):
+                child_cost = cost + step_cost
+                if child not in visited or child_cost < visited[child]:
+                    frontier.push(child_cost, child_cost, pool.add(child, node_id, action, child_cost), child)
+                    if stats is not None:
+                        stats.on_push(child)
+            if stats is not None:
+                stats.on_expand(self, node_id, len(frontier), len(visited), state)
+        return None
+
+    def _search_dense(self, problem: Problem) -> Optional[Node]:
+        """Mesma busca sobre os índices do StateSpace, com custos fechados em um vetor."""
+        space = problem.state_space
+        stats = self._start_stats(problem)
+        budget = self._start_budget()
+        start = space.index_of(problem.initial_state)
+        tree = DenseTree(start)
+        # Itens da fronteira: id do nó; a chave é o índice do estado.
+        frontier = self.frontier = make_frontier(self.frontier_type, self.tie_breaking)
+        if stats is not None:
+            stats.instrument_frontier(frontier)
+        frontier.push(0, 0, 0, start)
+        visited = array('d', [float('inf')]) * space.SIZE
+        self.nodes_generated = 1
+        self.nodes_pruned = 0
         self.nodes_visited = 0
 
         while frontier:
-            cost, node = heapq.heappop(frontier)
+            if budget is not None and budget.exhausted(self, len(frontier), len(tree.index)):
+                return None
+            cost, _, node_id = frontier.pop()
             self.nodes_visited += 1
+            index = tree.index[node_id]
 
-            if node.state in visited and visited[node.state] < cost:
+            if visited[index] < cost:
+                if stats is not None:
+                    stats.stale_pops += 1
                 continue
 
-            if problem.is_goal(node.state):
-                return node
+            if index in problem.dense_goals:
+                return tree.to_node(problem, node_id)
 
-            visited[node.state] = cost
+            visited[index] = cost
 
-            for child in self._get_successors(node, problem):
-                if child.state not in visited or child.path_cost < visited[child.state]:
-                    heapq.heappush(frontier, (child.path_cost, child))
+            for action, child, step_cost in self._get_dense_successors(problem, index, tree.action[node_id]):
+                child_cost = cost + step_cost
+                if child_cost < visited[child]:
+                    frontier.push(child_cost, child_cost, tree.add(child, node_id, action), child)
+                    if stats is not None:
+                        stats.on_push(child)
+            if stats is not None:
+                # No modo denso, os visitados são os nós da DenseTree.
+                stats.on_expand(self, node_id, len(frontier), len(tree.index), index)
         return None
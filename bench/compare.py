@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compara dois arquivos de resultados de bench.run e aponta regressões.
+
+Um caso regride quando a mediana nova é pelo menos `--threshold` maior que
+a antiga e o teste de Mann-Whitney (unilateral) sobre as amostras dá
+p < `--alpha`. Melhoras significativas são listadas da mesma forma. O
+código de saída é 1 se houver alguma regressão, para uso em scripts.
+
+Uso:
+    python -m bench.compare antigo.json novo.json [--threshold 0.10] [--alpha 0.05]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+from bench.stats import mann_whitney_greater
+
+
+def compare(old: Dict, new: Dict, threshold: float, alpha: float) -> List[Tuple[str, str, float, float]]:
+    """Retorna (nome, veredito, razão das medianas, p-valor) para cada caso presente nos dois arquivos."""
+    old_results = {result['name']: result for result in old['results']}
+    rows = []
+    for result in new['results']:
+        before = old_results.get(result['name'])
+        if before is None:
+            continue
+        ratio = result['median_ns'] / before['median_ns']
+        p_slower = mann_whitney_greater(result['samples_ns'], before['samples_ns'])
+        p_faster = mann_whitney_greater(before['samples_ns'], result['samples_ns'])
+        if ratio >= 1 + threshold and p_slower < alpha:
+            rows.append((result['name'], 'REGRESSÃO', ratio, p_slower))
+        elif ratio <= 1 - threshold and p_faster < alpha:
+            rows.append((result['name'], 'melhora', ratio, p_faster))
+        else:
+            rows.append((result['name'], 'igual', ratio, min(p_slower, p_faster)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark.")
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="variação relativa mínima da mediana (padrão: 10%%)")
+    parser.add_argument('--alpha', type=float, default=0.05, help="nível de significância (padrão: 0.05)")
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+
+    rows = compare(old, new, args.threshold, args.alpha)
+    for name, verdict, ratio, p_value in rows:
+        print(f"{name:<55} {verdict:<10} {100 * (ratio - 1):+7.1f}%  p={p_value:.3f}")
+    regressions = sum(1 for row in rows if row[1] == 'REGRESSÃO')
+    print(f"{regressions} regressão(ões) em {len(rows)} casos comparados.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
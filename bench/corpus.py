@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""
+Corpus fixo de estados iniciais do 8-Puzzle, agrupados pela profundidade da
+solução ótima (número de movimentos, calculado pelo oráculo de distâncias com
+C1). O arquivo gerado fica versionado em bench/corpus/, para que todas as
+execuções do benchmark usem exatamente os mesmos estados.
+
+Para regenerar (o resultado é determinístico para a mesma semente):
+    python -m bench.corpus
+"""
+
+import json
+import os
+import random
+from typing import Dict, List
+
+from core.state import State
+from problem.eight_puzzle import EightPuzzleProblem
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "eight_puzzle.json")
+BUCKET_DEPTHS = (4, 8, 12, 16, 20, 24)
+STATES_PER_BUCKET = 5
+CORPUS_SEED = 2025
+
+
+def build_corpus(seed: int = CORPUS_SEED, per_bucket: int = STATES_PER_BUCKET) -> Dict[int, List[State]]:
+    """Sorteia `per_bucket` estados para cada profundidade de BUCKET_DEPTHS."""
+    oracle = EightPuzzleProblem(State(tuple(range(9))), 'C1').get_distance_oracle()
+    by_depth: Dict[int, List[int]] = {depth: [] for depth in BUCKET_DEPTHS}
+    for index, cost in enumerate(oracle.table[:]):
+        # Em C1 cada movimento custa 2.
+        depth = cost // 2
+        if depth in by_depth:
+            by_depth[depth].append(index)
+
+    rng = random.Random(seed)
+    return {depth: [oracle.space.state_at(index) for index in sorted(rng.sample(indices, per_bucket))]
+            for depth, indices in by_depth.items()}
+
+
+def save_corpus(corpus: Dict[int, List[State]], path: str = CORPUS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Cada tabuleiro vira uma string de dígitos (0 é o espaço vazio).
+    data = {str(depth): ["".join(map(str, state.board)) for state in states] for depth, states in corpus.items()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+        f.write("\n")
+
+
+def load_corpus(path: str = CORPUS_PATH) -> Dict[int, List[State]]:
+    """Lê o corpus versionado: {profundidade: [estados]}."""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return {int(depth): [State(tuple(map(int, board))) for board in boards] for depth, boards in data.items()}
+
+
+if __name__ == '__main__':
+    corpus = build_corpus()
+    save_corpus(corpus)
+    for depth, states in corpus.items():
+        print(f"Profundidade {depth}: {', '.join(map(str, states))}")
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+"""
+Suíte de benchmarks das buscas sobre o corpus fixo de bench/corpus/.
+
+- Micro: Node.expand, get_result, get_heuristic (H1/H2) e is_goal, medidos
+  em nanossegundos por operação sobre todos os estados do corpus.
+- Macro: cada algoritmo x custo x heurística resolvendo os estados das
+  profundidades indicadas; a amostra é o tempo total do caso.
+
+Cada caso roda `warmup` vezes sem medir e `repeats` vezes medindo com
+perf_counter_ns. O pico de memória é medido em uma execução extra com
+tracemalloc, fora das amostras de tempo.
+
+Uso:
+    python -m bench.run [--quick] [--filter TEXTO] [-o bench/results/base.json]
+    python -m bench.compare bench/results/base.json bench/results/novo.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bench.corpus import load_corpus
+from bench.stats import summarize
+from core.node import Node
+from core.state import State
+from problem.eight_puzzle import EightPuzzleProblem
+from algorithms import (
+    BreadthFirstSearch,
+    DepthFirstSearch,
+    UniformCostSearch,
+    GreedyBestFirstSearch,
+    AStarSearch,
+    IterativeDeepeningAStar,
+    BidirectionalBreadthFirstSearch,
+    BidirectionalUniformCostSearch
+)
+
+DEFAULT_RESULTS_DIR = os.path.join("bench", "results")
+ALL_COST_TYPES = ['C1', 'C2', 'C3', 'C4']
+ALL_HEURISTICS = ['H1', 'H2']
+# Passadas sobre o corpus por amostra dos micro, para que cada amostra dure milissegundos.
+MICRO_PASSES = 200
+
+# Maior profundidade do corpus usada por algoritmo: as buscas sem heurística
+# exploram boa parte do espaço nos estados mais fundos, e a DFS em qualquer um.
+MAX_DEPTH = {
+    BreadthFirstSearch: 16,
+    DepthFirstSearch: 8,
+    UniformCostSearch: 16,
+    BidirectionalBreadthFirstSearch: 24,
+    BidirectionalUniformCostSearch: 24,
+    GreedyBestFirstSearch: 24,
+    AStarSearch: 24,
+    IterativeDeepeningAStar: 20,
+}
+
+
+class Case:
+    """
+    Um caso do benchmark. `run` executa uma amostra e retorna quantos nós
+    foram visitados (0 nos micro) e quantas operações foram feitas.
+    """
+
+    def __init__(self, name: str, kind: str, run: Callable[[], Tuple[int, int]]):
+        self.name = name
+        self.kind = kind
+        self.run = run
+
+
+def micro_cases(states: List[State]) -> List[Case]:
+    """Operações do laço quente das buscas, aplicadas MICRO_PASSES vezes a todos os estados do corpus."""
+    cases = []
+    passes = range(MICRO_PASSES)
+    problem = EightPuzzleProblem(states[0], 'C4')
+    nodes = [Node(state) for state in states]
+    moves = [(state, action) for state in states for action in problem.get_actions(state)]
+
+    def expand():
+        for _ in passes:
+            for node in nodes:
+                node.expand(problem)
+        return 0, MICRO_PASSES * len(nodes)
+    cases.append(Case('micro/Node.expand[C4]', 'micro', expand))
+
+    def get_result():
+        for _ in passes:
+            for state, action in moves:
+                problem.get_result(state, action)
+        return 0, MICRO_PASSES * len(moves)
+    cases.append(Case('micro/get_result', 'micro', get_result))
+
+    for heuristic in ALL_HEURISTICS:
+        h_problem = EightPuzzleProblem(states[0], 'C1', heuristic)
+
+        def get_heuristic(h_problem=h_problem):
+            for _ in passes:
+                for state in states:
+                    h_problem.get_heuristic(state)
+            return 0, MICRO_PASSES * len(states)
+        cases.append(Case(f'micro/get_heuristic[{heuristic}]', 'micro', get_heuristic))
+
+    def is_goal():
+        for _ in passes:
+            for state in states:
+                problem.is_goal(state)
+        return 0, MICRO_PASSES * len(states)
+    cases.append(Case('micro/is_goal', 'micro', is_goal))
+    return cases
+
+
+def macro_cases(corpus: Dict[int, List[State]]) -> List[Case]:
+    """Um caso por algoritmo x custo x heurística, sobre os estados até MAX_DEPTH do algoritmo."""
+    combos = []
+    for algo in [BreadthFirstSearch, DepthFirstSearch, UniformCostSearch,
+                 BidirectionalBreadthFirstSearch, BidirectionalUniformCostSearch]:
+        for cost in ALL_COST_TYPES:
+            combos.append((algo, cost, None))
+    for heuristic in ALL_HEURISTICS:
+        combos.append((GreedyBestFirstSearch, 'C1', heuristic))
+    for algo in [AStarSearch, IterativeDeepeningAStar]:
+        for cost in ALL_COST_TYPES:
+            for heuristic in ALL_HEURISTICS:
+                combos.append((algo, cost, heuristic))
+
+    cases = []
+    for algo, cost, heuristic in combos:
+        states = [state for depth, bucket in corpus.items() if depth <= MAX_DEPTH[algo] for state in bucket]
+
+        def solve(algo=algo, cost=cost, heuristic=heuristic, states=states):
+            visited = 0
+            for state in states:
+                algorithm = algo()
+                algorithm.search(EightPuzzleProblem(state, cost, heuristic))
+                visited += algorithm.nodes_visited
+            return visited, len(states)
+        cases.append(Case(f'macro/{algo.__name__}[{cost},{heuristic or "-"}]', 'macro', solve))
+    return cases
+
+
+def measure(case: Case, repeats: int, warmup: int) -> Dict:
+    """Executa o caso e resume as amostras de tempo, a taxa de nós e o pico de memória."""
+    for _ in range(warmup):
+        case.run()
+
+    samples = []
+    nodes = operations = 0
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        nodes, operations = case.run()
+        samples.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    case.run()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median_ns, iqr_ns = summarize(samples)
+    return {
+        'name': case.name,
+        'kind': case.kind,
+        'samples_ns': samples,
+        'median_ns': median_ns,
+        'iqr_ns': iqr_ns,
+        'operations': operations,
+        'ns_per_op': median_ns / operations if operations else None,
+        'nodes_visited': nodes,
+        'nodes_per_sec': nodes / (median_ns / 1e9) if nodes and median_ns else None,
+        'peak_bytes': peak_bytes,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(cases: List[Case], repeats: int, warmup: int) -> Dict:
+    results = []
+    for case in cases:
+        result = measure(case, repeats, warmup)
+        results.append(result)
+        rate = f"{result['nodes_per_sec']:,.0f} nós/s" if result['nodes_per_sec'] else \
+            f"{result['ns_per_op']:,.0f} ns/op"
+        print(f"  {case.name:<55} mediana {result['median_ns'] / 1e6:10.2f} ms "
+              f"(IQR {result['iqr_ns'] / 1e6:.2f})  {rate}  pico {result['peak_bytes'] / 1024:,.0f} KiB")
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'warmup': warmup,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks das buscas do 8-Puzzle.")
+    parser.add_argument('-o', '--output', help="arquivo JSON de saída (padrão: bench/results/<data>.json)")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--quick', action='store_true', help="3 repetições e 2 estados por profundidade")
+    parser.add_argument('--filter', default='', help="executa só os casos cujo nome contém o texto")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    repeats = args.repeats
+    if args.quick:
+        corpus = {depth: states[:2] for depth, states in corpus.items()}
+        repeats = 3
+    all_states = [state for states in corpus.values() for state in states]
+    cases = [case for case in micro_cases(all_states) + macro_cases(corpus) if args.filter in case.name]
+
+    report = run_suite(cases, repeats, args.warmup)
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+    print(f"Resultados salvos em {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""
+Estatísticas das amostras de tempo: mediana, intervalo interquartil e o
+teste de Mann-Whitney (exato, sem dependências) usado pela comparação.
+"""
+
+from functools import lru_cache
+from statistics import median, quantiles
+from typing import Sequence, Tuple
+
+
+def iqr(samples: Sequence[float]) -> float:
+    """Intervalo interquartil (Q3 - Q1); 0 com menos de duas amostras."""
+    if len(samples) < 2:
+        return 0.0
+    q1, _, q3 = quantiles(samples, n=4, method='inclusive')
+    return q3 - q1
+
+
+def summarize(samples: Sequence[float]) -> Tuple[float, float]:
+    """(mediana, IQR) das amostras."""
+    return median(samples), iqr(samples)
+
+
+@lru_cache(maxsize=None)
+def _u_counts(n: int, m: int) -> Tuple[int, ...]:
+    """
+    Número de ordenações de n + m valores distintos para cada valor de U
+    (quantos pares (x, y) têm x > y), pela recorrência sobre o maior valor.
+    """
+    if n == 0 or m == 0:
+        return (1,)
+    # O maior valor é um x (vence os m valores de y) ou um y (não contribui).
+    with_x = _u_counts(n - 1, m)
+    with_y = _u_counts(n, m - 1)
+    counts = [0] * (n * m + 1)
+    for u, c in enumerate(with_x):
+        counts[u + m] += c
+    for u, c in enumerate(with_y):
+        counts[u] += c
+    return tuple(counts)
+
+
+def mann_whitney_greater(x: Sequence[float], y: Sequence[float]) -> float:
+    """
+    p-valor unilateral de H1: "x tende a ser maior que y". Empates contam
+    meio ponto; a distribuição exata de U ignora a correção de empates, o
+    que é adequado para tempos medidos em nanossegundos.
+    """
+    n, m = len(x), len(y)
+    if not n or not m:
+        return 1.0
+    u = sum(1.0 if a > b else 0.5 if a == b else 0.0 for a in x for b in y)
+    counts = _u_counts(n, m)
+    total = sum(counts)
+    # P(U >= u) sob H0.
+    return sum(c for value, c in enumerate(counts) if value >= u) / total
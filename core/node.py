@@ -32,12 +32,9 @@ class Node:
 
     def expand(self, problem: Problem) -> List[Node]:
         """Gera os nós filhos (sucessores) a partir do nó atual."""
-        children = []
-        for action in problem.get_actions(self.state):
-            next_state = problem.get_result(self.state, action)
-            cost = self.path_cost + problem.get_cost(self.state, action)
-            children.append(Node(next_state, self, action, cost))
-        return children
+        path_cost = self.path_cost
+        return [Node(next_state, self, action, path_cost + cost)
+                for action, next_state, cost in problem.successors(self.state)]
 
     def get_path(self) -> List[State]:
         """Retorna a sequência de estados do início até o nó atual."""
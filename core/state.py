@@ -2,36 +2,108 @@
 
 """
 Este arquivo define a classe State, que representa uma configuração
-do tabuleiro do 8-Puzzle.
+do tabuleiro do quebra-cabeça deslizante (8-Puzzle e variações N x N).
 """
 
+from math import isqrt
 from typing import Tuple
 
+# Cada peça ocupa BITS_PER_TILE bits no inteiro compactado: a posição i do
+# tabuleiro fica nos bits [4*i, 4*i + 4). Tabuleiros com mais de 16 casas
+# precisam de peças maiores que 15 e usam mais bits (ver tile_bits).
+BITS_PER_TILE = 4
+TILE_MASK = (1 << BITS_PER_TILE) - 1
+
+
+def tile_bits(size: int) -> int:
+    """Bits por peça para um tabuleiro size x size (4 até o 15-Puzzle, 5 até o 24-Puzzle...)."""
+    return max(BITS_PER_TILE, (size * size - 1).bit_length())
+
+
+def encode_board(board: Tuple[int, ...], bits: int = BITS_PER_TILE) -> int:
+    """Compacta um tabuleiro (tupla de peças) em um único inteiro."""
+    code = 0
+    for i, piece in enumerate(board):
+        code |= piece << (bits * i)
+    return code
+
+
+def decode_board(code: int, size: int = 3) -> Tuple[int, ...]:
+    """Reconstrói a tupla do tabuleiro a partir do inteiro compactado."""
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    return tuple((code >> (bits * i)) & mask for i in range(size * size))
+
+
 class State:
     """
-    Representa um estado (configuração do tabuleiro) do 8-Puzzle.
+    Representa um estado (configuração do tabuleiro) do quebra-cabeça.
     O estado é imutável para ser usado em conjuntos (sets) e dicionários de forma segura.
     O valor 0 representa o espaço vazio.
+
+    O tabuleiro é armazenado compactado em um único inteiro (4 bits por peça
+    até 4x4, 5 bits até 5x5), o que torna o hash e a comparação operações
+    sobre um int e dispensa o __dict__ por instância. A tupla só é
+    reconstruída quando `board` é lido.
     """
+    __slots__ = ('code', 'blank_pos', 'size')
+
     def __init__(self, board: Tuple[int, ...]):
-        if len(board) != 9:
-            raise ValueError("O tabuleiro deve ter 9 elementos.")
-        self.board = board
+        size = isqrt(len(board))
+        if size < 2 or size * size != len(board):
+            raise ValueError("O tabuleiro deve ter N x N elementos (9 para o 8-Puzzle).")
+        self.size = size
+        self.code = encode_board(board, tile_bits(size))
         # Pré-calcula e armazena a posição do espaço vazio para acesso rápido.
-        self.blank_pos = self.board.index(0)
+        self.blank_pos = board.index(0)
+
+    @classmethod
+    def from_code(cls, code: int, blank_pos: int, size: int = 3) -> 'State':
+        """Cria um estado diretamente do inteiro compactado, sem validação."""
+        state = cls.__new__(cls)
+        state.code = code
+        state.blank_pos = blank_pos
+        state.size = size
+        return state
+
+    @property
+    def board(self) -> Tuple[int, ...]:
+        """Tupla com as peças, decodificada sob demanda."""
+        return decode_board(self.code, self.size)
+
+    def tile_at(self, pos: int) -> int:
+        """Retorna a peça na posição `pos` sem decodificar o tabuleiro inteiro."""
+        bits = _TILE_BITS[self.size]
+        return (self.code >> (bits * pos)) & ((1 << bits) - 1)
+
+    def move_blank(self, swap_pos: int) -> 'State':
+        """Troca o espaço vazio com a peça em `swap_pos` operando direto nos bits."""
+        bits = _TILE_BITS[self.size]
+        tile = (self.code >> (bits * swap_pos)) & ((1 << bits) - 1)
+        # O espaço vazio vale 0, então basta mover o valor da peça de posição.
+        code = self.code + (tile << (bits * self.blank_pos)) - (tile << (bits * swap_pos))
+        return State.from_code(code, swap_pos, self.size)
 
     def __eq__(self, other):
-        return isinstance(other, State) and self.board == other.board
+        return isinstance(other, State) and self.code == other.code and self.size == other.size
 
     def __hash__(self):
-        return hash(self.board)
+        # O inteiro compactado já é único por tabuleiro, então o hash de int
+        # é a própria identidade do valor.
+        return hash(self.code)
 
     def __str__(self):
-        return "".join(map(str, self.board)).replace('0', '_')
+        if self.size <= 3:
+            return "".join(map(str, self.board)).replace('0', '_')
+        # Com peças de dois dígitos a concatenação seria ambígua.
+        return ",".join(str(x) if x != 0 else '_' for x in self.board)
 
     def to_matrix_str(self) -> str:
-        """Retorna uma representação do estado em formato de matriz 3x3."""
-        b = [str(x) if x != 0 else '_' for x in self.board]
-        return (f"{b[0]} {b[1]} {b[2]}\n"
-                f"{b[3]} {b[4]} {b[5]}\n"
-                f"{b[6]} {b[7]} {b[8]}")
+        """Retorna uma representação do estado em formato de matriz N x N."""
+        width = len(str(self.size * self.size - 1))
+        b = [str(x).rjust(width) if x != 0 else '_'.rjust(width) for x in self.board]
+        return "\n".join(" ".join(b[row * self.size:(row + 1) * self.size]) for row in range(self.size))
+
+
+# Bits por peça indexados pelo lado do tabuleiro, para os métodos do laço quente.
+_TILE_BITS = tuple(tile_bits(size) if size >= 2 else BITS_PER_TILE for size in range(16))
@@ -5,21 +5,44 @@ Ponto de entrada principal para executar os experimentos do 8-Puzzle.
 
 Para executar uma parte do experimento, descomente a chamada de função
 `runner.run_experiment` correspondente.
+
+Uso: python main.py [--jobs N] [--seed S] [--resume] [--no-cache] [--instrument] [--trace-memory]
+     [--depth-first-variants] [--adaptive [--min-runs N] [--ci-target METRICA=ALVO ...]]
+     [--max-seconds S] [--max-nodes N] [--max-entries N]
 """
 
+import argparse
+import os
+
 from runner import ExperimentRunner
+from utils.result_cache import DEFAULT_CACHE_PATH
+from utils.sequential_sampling import DEFAULT_MIN_RUNS, DEFAULT_TARGETS
 from algorithms import (
     BreadthFirstSearch,
     DepthFirstSearch,
     UniformCostSearch,
     GreedyBestFirstSearch,
-    AStarSearch
+    AStarSearch,
+    WeightedAStarSearch,
+    AnytimeRepairingAStar,
+    IterativeDeepeningSearch,
+    DepthFirstBranchAndBound
 )
 
 
-def main():
-    """Define e executa os cenários de teste para o trabalho."""
-    runner = ExperimentRunner(output_dir="results")
+def main(jobs: int = 1, seed: int | None = None, resume: bool = False, cache: bool = True,
+         instrument: bool = False, trace_memory: bool = False, depth_first_variants: bool = False,
+         adaptive: bool = False, min_runs: int = DEFAULT_MIN_RUNS, ci_targets: dict | None = None,
+         budget: dict | None = None):
+    """
+    Define e executa os cenários de teste para o trabalho. Com `adaptive`, os
+    `num_runs` de cada parte são o máximo de estados iniciais por cenário;
+    `budget` limita cada busca (ver ExperimentRunner).
+    """
+    runner = ExperimentRunner(output_dir="results", jobs=jobs, seed=seed, resume=resume,
+                              cache_path=DEFAULT_CACHE_PATH if cache else None,
+                              instrument=instrument, trace_memory=trace_memory,
+                              adaptive=adaptive, ci_targets=ci_targets, min_runs=min_runs, budget=budget)
     all_cost_types = ['C1', 'C2', 'C3', 'C4']
     all_heuristics = ['H1', 'H2']
 
@@ -46,14 +69,22 @@ def main():
     for heuristic in all_heuristics:
         # CORREÇÃO: Usamos 'C1' como um custo padrão para evitar o erro.
         # A Busca Gulosa não usa o custo do caminho durante a busca, e o runner.py
-        # recalcula o custo correto para todas as funções de custo (C1-C4) no final.
+        # recalcula o custo do caminho encontrado para cada função de custo (C1-C4).
         part3_scenarios.append({
             'algorithm': GreedyBestFirstSearch,
             'heuristic': heuristic,
-            'cost_type': 'C1'}) # Alterado de 'N/A' para 'C1'
+            'cost_type': 'C1',  # Alterado de 'N/A' para 'C1'
+            'cost_functions': all_cost_types})
     for cost in all_cost_types:
         for heuristic in all_heuristics:
             part3_scenarios.append({'algorithm': AStarSearch, 'cost_type': cost, 'heuristic': heuristic})
+    # Entre as duas: A* Ponderada (custo até 2x o ótimo) e a ARA*, que melhora a
+    # solução até provar a ótima; o perfil de cada uma vai para Part3_anytime_results.csv.
+    for cost in all_cost_types:
+        for heuristic in all_heuristics:
+            part3_scenarios.append({'algorithm': WeightedAStarSearch, 'cost_type': cost, 'heuristic': heuristic,
+                                    'options': {'weight': 2.0}})
+            part3_scenarios.append({'algorithm': AnytimeRepairingAStar, 'cost_type': cost, 'heuristic': heuristic})
     runner.run_experiment("Part3", part3_scenarios, num_runs=30)
 
     # --- Parte 4: Randomização da Vizinhança ---
@@ -67,6 +98,19 @@ def main():
                 'random_successors': True,
                 'executions': 10
             })
+    if depth_first_variants:
+        # IDDFS e DFBnB com memória proporcional à profundidade; as tabelas de
+        # transposição limitadas mantêm o tempo das buscas sem heurística viável.
+        for algo, options in [(IterativeDeepeningSearch, {'transposition_size': 100_000}),
+                              (DepthFirstBranchAndBound, {'transposition_size': 200_000})]:
+            for cost in all_cost_types:
+                part4_scenarios.append({
+                    'algorithm': algo,
+                    'cost_type': cost,
+                    'random_successors': True,
+                    'executions': 10,
+                    'options': options
+                })
     runner.run_experiment("Part4", part4_scenarios, num_runs=15)
 
     print("\nTodos os experimentos selecionados foram concluídos.")
@@ -74,4 +118,44 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Executa os experimentos do 8-Puzzle.")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help=f"processos em paralelo (esta máquina tem {os.cpu_count()} CPUs)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="semente mestre; a mesma semente reproduz os mesmos resultados")
+    parser.add_argument('--resume', action='store_true',
+                        help="retoma uma execução interrompida, pulando as unidades já concluídas")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"não consulta nem grava o cache de resultados ({DEFAULT_CACHE_PATH})")
+    parser.add_argument('--instrument', action='store_true',
+                        help="acrescenta ao CSV picos de fronteira/visitados, descartes e tempos por fase")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="mede também o pico de memória com tracemalloc (mais lento)")
+    parser.add_argument('--depth-first-variants', action='store_true',
+                        help="inclui IDDFS e DFBnB na Parte 4 (bem mais lento)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="para de sortear estados para um cenário quando os ICs de 95%% atingem os alvos")
+    parser.add_argument('--min-runs', type=int, default=DEFAULT_MIN_RUNS,
+                        help=f"estados iniciais mínimos por cenário com --adaptive (padrão: {DEFAULT_MIN_RUNS})")
+    parser.add_argument('--ci-target', action='append', default=[], metavar='METRICA=ALVO',
+                        help="meia largura do IC relativa à média aceita para uma métrica; repetível "
+                             f"(padrão: {', '.join(f'{m}={t}' for m, t in DEFAULT_TARGETS.items())})")
+    parser.add_argument('--max-seconds', type=float,
+                        help="interrompe cada busca depois deste tempo (outcome 'budget_time' no CSV)")
+    parser.add_argument('--max-nodes', type=int,
+                        help="interrompe cada busca depois de gerar este número de nós")
+    parser.add_argument('--max-entries', type=int,
+                        help="interrompe cada busca quando fronteira + visitados passam deste número de entradas")
+    args = parser.parse_args()
+    ci_targets = None
+    if args.ci_target:
+        try:
+            ci_targets = {metric: float(target) for metric, target in
+                          (item.split('=', 1) for item in args.ci_target)}
+        except ValueError:
+            parser.error("--ci-target espera METRICA=ALVO, por exemplo nodes_visited=0.2")
+    main(jobs=args.jobs, seed=args.seed, resume=args.resume, cache=not args.no_cache,
+         instrument=args.instrument, trace_memory=args.trace_memory,
+         depth_first_variants=args.depth_first_variants,
+         adaptive=args.adaptive, min_runs=args.min_runs, ci_targets=ci_targets,
+         budget={'max_seconds': args.max_seconds, 'max_nodes': args.max_nodes, 'max_entries': args.max_entries})
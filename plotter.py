@@ -1,17 +1,254 @@
 # -*- coding: utf-8 -*-
 
 """
-Este script lê os arquivos de resultado .csv da pasta 'results' e gera
-gráficos comparativos para análise, salvando-os na pasta 'plots'.
+Este script lê os resultados da pasta 'results' e gera gráficos
+comparativos para análise, salvando-os na pasta 'plots'.
+
+Os dados vêm do armazenamento colunar gravado pelo runner
+(`<Parte>_columns/`, ver utils.result_store) ou, na falta dele, do CSV.
+Só as colunas usadas são lidas, e cada gráfico desenha agregados por grupo
+já calculados (médias com barras de erro do intervalo de 95% pela
+aproximação normal, ou quartis para os boxplots) em vez de reamostrar as
+linhas cruas.
+
+Cada figura de FIGURES declara a parte e as colunas que lê. O manifesto
+`plots/manifest.json` guarda, por figura, um hash do conteúdo dos arquivos
+de entrada, das colunas e do código do plotter; só as figuras cujo hash
+mudou (ou cujo arquivo sumiu) são refeitas, em um pool de processos com o
+backend não interativo Agg. matplotlib e seaborn só são importados nos
+processos que desenham.
+
+Uso: python plotter.py [--jobs N] [--force]
 
 Dependências: pandas, matplotlib, seaborn
 Para instalar: pip install pandas matplotlib seaborn
 """
 
+import argparse
+import hashlib
+import json
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.result_store import input_files, load_results
+
+MANIFEST_NAME = 'manifest.json'
+# Arquivos cujo código define a aparência das figuras.
+_CODE_FILES = (os.path.abspath(__file__),
+               os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils', 'result_store.py'))
+
+
+def aggregate(df, by, value: str):
+    """
+    Média, contagem e meia largura do IC de 95% de `value` por grupo. Valores
+    nulos (buscas sem solução) ficam fora da média, mas são contados em `failed`.
+    """
+    grouped = df.assign(**{value: df[value].astype(float)}).groupby(by, observed=True, sort=True)[value]
+    agg = grouped.agg(['mean', 'std', 'count', 'size'])
+    agg['ci95'] = 1.96 * agg['std'].fillna(0) / agg['count'].clip(lower=1) ** 0.5
+    agg['failed'] = agg['size'] - agg['count']
+    return agg
+
+
+def box_stats(df, by, value: str) -> List[Dict]:
+    """
+    Estatísticas de boxplot (quartis e bigodes de 1,5 IQR) de `value` por
+    grupo, no formato de `Axes.bxp`, calculadas de uma vez com groupby.
+    """
+    values = df.assign(**{value: df[value].astype(float)}).dropna(subset=[value])
+    grouped = values.groupby(by, observed=True, sort=True)[value]
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    iqr = quartiles[0.75] - quartiles[0.25]
+    # Bigodes: o valor mais extremo dentro de 1,5 IQR dos quartis.
+    bounds = values.join((quartiles[0.25] - 1.5 * iqr).rename('low'), on=by) \
+                   .join((quartiles[0.75] + 1.5 * iqr).rename('high'), on=by)
+    inside = bounds[(bounds[value] >= bounds['low']) & (bounds[value] <= bounds['high'])]
+    whiskers = inside.groupby(by, observed=True, sort=True)[value].agg(['min', 'max'])
+    stats = []
+    for key, row in quartiles.iterrows():
+        label = ' / '.join(map(str, key)) if isinstance(key, tuple) else str(key)
+        stats.append({'label': label, 'q1': row[0.25], 'med': row[0.5], 'q3': row[0.75],
+                      'whislo': whiskers.loc[key, 'min'], 'whishi': whiskers.loc[key, 'max'], 'fliers': []})
+    return stats
+
+
+def _bar_plot(plt, agg, hue: Optional[str] = None):
+    """Barras das médias agregadas, com as barras de erro de `ci95`."""
+    means, errors = agg['mean'], agg['ci95']
+    if hue is not None:
+        means, errors = means.unstack(hue), errors.unstack(hue)
+    return means.plot.bar(yerr=errors, capsize=3, rot=0, ax=plt.gca(), legend=hue is not None)
+
+
+def render_part1_cost(plt, df):
+    """Gráfico 1 da Parte 1: Custo Médio do Caminho."""
+    _bar_plot(plt, aggregate(df, ['cost_function', 'algorithm'], 'path_cost'), hue='algorithm')
+    plt.title('Parte 1: Custo Médio do Caminho por Algoritmo e Função de Custo')
+    plt.ylabel('Custo Médio do Caminho')
+    plt.xlabel('Função de Custo')
+
+
+def render_part1_nodes(plt, df):
+    """Gráfico 2 da Parte 1: Média de Nós Visitados."""
+    _bar_plot(plt, aggregate(df, 'algorithm', 'nodes_visited'))
+    plt.title('Parte 1: Média de Nós Visitados por Algoritmo')
+    plt.ylabel('Média de Nós Visitados (Log Scale)')
+    plt.xlabel('Algoritmo')
+    plt.yscale('log')  # Escala de log é útil quando os valores variam muito
+
+
+def render_part2_nodes(plt, df):
+    """Média de Nós Visitados (UCS vs A*)."""
+    # Prepara a coluna de 'legenda' para o gráfico
+    is_astar = df['algorithm'] == 'AStarSearch'
+    df['algorithm_heuristic'] = ('A*(' + df['heuristic'].astype('string') + ')').where(is_astar, 'UCS')
+    _bar_plot(plt, aggregate(df, ['cost_function', 'algorithm_heuristic'], 'nodes_visited'),
+              hue='algorithm_heuristic')
+    plt.title('Parte 2: Média de Nós Visitados (UCS vs. A*)')
+    plt.ylabel('Média de Nós Visitados (Log Scale)')
+    plt.xlabel('Função de Custo')
+    plt.yscale('log')
+    plt.legend(title='Algoritmo (Heurística)')
+
+
+def _part3_labels(df):
+    """Prepara a coluna de 'legenda' da Parte 3."""
+    df['algorithm_heuristic'] = (df['algorithm'].astype('string').str.replace('Search', '')
+                                 + '(' + df['heuristic'].astype('string') + ')')
+    return df
+
+
+def render_part3_nodes(plt, df):
+    """Média de Nós Visitados (Greedy vs A*)."""
+    _bar_plot(plt, aggregate(_part3_labels(df), 'algorithm_heuristic', 'nodes_visited'))
+    plt.title('Parte 3: Média de Nós Visitados (Greedy vs. A*)')
+    plt.ylabel('Média de Nós Visitados (Log Scale)')
+    plt.xlabel('Algoritmo (Heurística)')
+    plt.xticks(rotation=15)
+    plt.yscale('log')
+
+
+def render_part3_cost(plt, df):
+    """Custo Médio do Caminho (Greedy vs A*)."""
+    _bar_plot(plt, aggregate(_part3_labels(df), ['algorithm_heuristic', 'cost_function'], 'path_cost'),
+              hue='cost_function')
+    plt.title('Parte 3: Custo Médio do Caminho (Greedy vs. A*)')
+    plt.ylabel('Custo Médio do Caminho')
+    plt.xlabel('Algoritmo (Heurística)')
+    plt.xticks(rotation=15)
+
+
+def render_part3_anytime(plt, df):
+    """
+    Perfil das buscas anytime da Parte 3: cada ponto é uma solução (ou um
+    limite mais apertado) registrada, com o instante desde o início da busca
+    e o limite de subotimalidade comprovado naquele momento.
+    """
+    import seaborn as sns
+
+    df = _part3_labels(df)
+    sns.scatterplot(data=df.astype({'time_sec': float, 'suboptimality_bound': float}), x='time_sec',
+                    y='suboptimality_bound', hue='algorithm_heuristic', alpha=0.6, ax=plt.gca())
+    plt.title('Parte 3: Limite de Subotimalidade Comprovado ao Longo do Tempo')
+    plt.ylabel('Limite de Subotimalidade (custo / ótimo)')
+    plt.xlabel('Tempo desde o Início da Busca (s, Log Scale)')
+    plt.xscale('log')
+    plt.legend(title='Algoritmo (Heurística)')
+
+
+def render_part4_nodes(plt, df):
+    """
+    Distribuição dos nós visitados com a vizinhança embaralhada: cada caixa
+    junta as execuções de todos os estados iniciais de um algoritmo e custo.
+    """
+    stats = box_stats(df, ['algorithm', 'cost_function'], 'nodes_visited')
+    plt.gca().bxp(stats, showfliers=False)
+    plt.title('Parte 4: Nós Visitados com Sucessores Aleatórios')
+    plt.ylabel('Nós Visitados (Log Scale)')
+    plt.xlabel('Algoritmo / Função de Custo')
+    plt.xticks(rotation=20)
+    plt.yscale('log')
+
+
+def render_part4_spread(plt, df):
+    """
+    Variabilidade causada só pela ordem dos sucessores: para cada estado
+    inicial, algoritmo e custo, o coeficiente de variação do comprimento do
+    caminho entre as execuções; cada caixa resume os estados iniciais.
+    """
+    lengths = df.assign(path_length=df['path_length'].astype(float))
+    per_state = lengths.groupby(['algorithm', 'cost_function', 'initial_state'],
+                                observed=True)['path_length'].agg(['mean', 'std'])
+    per_state['cv'] = per_state['std'] / per_state['mean']
+    stats = box_stats(per_state.reset_index(), ['algorithm', 'cost_function'], 'cv')
+    plt.gca().bxp(stats, showfliers=False)
+    plt.title('Parte 4: Variação do Comprimento do Caminho entre Execuções')
+    plt.ylabel('Coeficiente de Variação por Estado Inicial')
+    plt.xlabel('Algoritmo / Função de Custo')
+    plt.xticks(rotation=20)
+
+
+class Figure:
+    """Uma figura do plotter: o arquivo gerado, a parte e as colunas lidas e a função que desenha."""
+
+    def __init__(self, filename: str, part: str, columns: List[str], render: Callable):
+        self.filename = filename
+        self.part = part
+        self.columns = columns
+        self.render = render
+
+
+FIGURES = [
+    Figure('part1_avg_cost.png', 'Part1', ['algorithm', 'cost_function', 'path_cost'], render_part1_cost),
+    Figure('part1_avg_nodes.png', 'Part1', ['algorithm', 'nodes_visited', 'path_cost'], render_part1_nodes),
+    Figure('part2_nodes_ucs_vs_astar.png', 'Part2',
+           ['algorithm', 'cost_function', 'heuristic', 'nodes_visited', 'path_cost'], render_part2_nodes),
+    Figure('part3_avg_nodes_greedy_vs_astar.png', 'Part3',
+           ['algorithm', 'heuristic', 'nodes_visited', 'path_cost'], render_part3_nodes),
+    Figure('part3_avg_cost_greedy_vs_astar.png', 'Part3',
+           ['algorithm', 'cost_function', 'heuristic', 'path_cost'], render_part3_cost),
+    Figure('part3_anytime_profile.png', 'Part3_anytime',
+           ['algorithm', 'heuristic', 'time_sec', 'suboptimality_bound', 'path_cost'], render_part3_anytime),
+    Figure('part4_nodes_boxplot.png', 'Part4',
+           ['algorithm', 'cost_function', 'nodes_visited', 'path_cost'], render_part4_nodes),
+    Figure('part4_path_length_spread.png', 'Part4',
+           ['algorithm', 'cost_function', 'initial_state', 'path_length', 'path_cost'], render_part4_spread),
+]
+FIGURES_BY_NAME = {figure.filename: figure for figure in FIGURES}
+
+
+def render_figure(results_dir: str, plots_dir: str, filename: str) -> Tuple[str, int, int]:
+    """
+    Desenha uma figura e retorna (arquivo, linhas sem solução, total de linhas).
+    Roda nos processos do pool: o backend e as bibliotecas de gráficos são
+    carregados aqui, sob demanda.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Configurações globais para os gráficos para melhor visualização
+    sns.set_theme(style="whitegrid", palette="viridis")
+    plt.rcParams['figure.figsize'] = (12, 7)
+    plt.rcParams['font.size'] = 12
+
+    figure = FIGURES_BY_NAME[filename]
+    df = load_results(results_dir, figure.part, figure.columns)
+    failed = int(df['path_cost'].isna().sum())
+    plt.figure()
+    figure.render(plt, df)
+    plt.tight_layout()
+    plt.savefig(os.path.join(plots_dir, filename))
+    plt.close()
+    return filename, failed, len(df)
+
+
+def _file_digest(path: str, digest) -> None:
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
 
 
 class ResultPlotter:
@@ -22,133 +259,120 @@ class ResultPlotter:
     def __init__(self, results_dir="results", plots_dir="plots"):
         self.results_dir = results_dir
         self.plots_dir = plots_dir
+        self.manifest_path = os.path.join(plots_dir, MANIFEST_NAME)
 
         if not os.path.exists(self.plots_dir):
             os.makedirs(self.plots_dir)
 
-        # Configurações globais para os gráficos para melhor visualização
-        sns.set_theme(style="whitegrid", palette="viridis")
-        plt.rcParams['figure.figsize'] = (12, 7)
-        plt.rcParams['font.size'] = 12
-
-    def _load_data(self, part_name: str) -> pd.DataFrame | None:
-        """Carrega os dados de um arquivo CSV para um DataFrame pandas."""
-        filepath = os.path.join(self.results_dir, f"{part_name}_results.csv")
-        if not os.path.exists(filepath):
-            print(f"Aviso: Arquivo de resultado '{filepath}' não encontrado. Pulando gráficos para esta parte.")
-            return None
-
-        df = pd.read_csv(filepath)
-        # Converte colunas para numérico, tratando erros
-        for col in ['path_cost', 'nodes_visited', 'nodes_generated', 'execution_time_sec']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        df.dropna(inplace=True)  # Remove linhas onde a conversão falhou (e.g., 'inf')
-        return df
+    def _input_hashes(self, parts) -> Dict[str, Optional[str]]:
+        """Hash do conteúdo dos arquivos de resultados e do código do plotter, por parte (None sem dados)."""
+        code = hashlib.sha256()
+        for path in _CODE_FILES:
+            _file_digest(path, code)
+        hashes = {}
+        for part in parts:
+            files = input_files(self.results_dir, part)
+            if not files:
+                hashes[part] = None
+                continue
+            digest = code.copy()
+            for path in files:
+                digest.update(os.path.basename(path).encode())
+                _file_digest(path, digest)
+            hashes[part] = digest.hexdigest()
+        return hashes
+
+    def _figure_hash(self, figure: Figure, part_hash: str) -> str:
+        return hashlib.sha256(f"{part_hash}|{figure.filename}|{figure.columns}".encode()).hexdigest()
+
+    def _load_manifest(self) -> Dict[str, str]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, str]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def build(self, figures: List[Figure], jobs: int = 1, force: bool = False) -> List[str]:
+        """
+        Refaz as figuras pedidas cujas entradas mudaram (todas, com `force`)
+        e retorna os nomes das refeitas. Figuras de partes sem resultados são puladas.
+        """
+        hashes = self._input_hashes({figure.part for figure in figures})
+        for part in sorted(part for part, part_hash in hashes.items() if part_hash is None):
+            print(f"Aviso: Resultados de '{part}' não encontrados em '{self.results_dir}'. "
+                  f"Pulando gráficos para esta parte.")
+        manifest = self._load_manifest()
+        stale = []
+        for figure in figures:
+            if hashes[figure.part] is None:
+                continue
+            figure_hash = self._figure_hash(figure, hashes[figure.part])
+            if force or manifest.get(figure.filename) != figure_hash \
+                    or not os.path.exists(os.path.join(self.plots_dir, figure.filename)):
+                stale.append((figure, figure_hash))
+        up_to_date = sum(1 for figure in figures if hashes[figure.part] is not None) - len(stale)
+        if up_to_date:
+            print(f"{up_to_date} figura(s) já atualizada(s).")
+        if not stale:
+            return []
+
+        print(f"Gerando {len(stale)} figura(s) com {min(jobs, len(stale))} processo(s)...")
+        if jobs <= 1 or len(stale) == 1:
+            results = (render_figure(self.results_dir, self.plots_dir, figure.filename) for figure, _ in stale)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=min(jobs, len(stale)))
+            results = executor.map(render_figure, [self.results_dir] * len(stale), [self.plots_dir] * len(stale),
+                                   [figure.filename for figure, _ in stale])
+        try:
+            for (figure, figure_hash), (filename, failed, rows) in zip(stale, results):
+                # O manifesto é atualizado a cada figura pronta, para sobreviver a interrupções.
+                manifest[filename] = figure_hash
+                self._save_manifest(manifest)
+                note = f" ({failed} de {rows} linhas sem solução, nulas e fora das médias)" if failed else ""
+                print(f"  {filename}{note}")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return [figure.filename for figure, _ in stale]
+
+    def plot_part(self, part_name: str, jobs: int = 1, force: bool = False) -> List[str]:
+        """Gera os gráficos de uma parte do experimento."""
+        return self.build([figure for figure in FIGURES if figure.part == part_name], jobs, force)
 
     def plot_part1(self):
         """Gera gráficos para o Experimento Parte 1."""
-        df = self._load_data("Part1")
-        if df is None: return
-
-        print("Gerando gráficos para a Parte 1...")
-
-        # Gráfico 1: Custo Médio do Caminho
-        plt.figure()
-        sns.barplot(data=df, x='cost_function', y='path_cost', hue='algorithm')
-        plt.title('Parte 1: Custo Médio do Caminho por Algoritmo e Função de Custo')
-        plt.ylabel('Custo Médio do Caminho')
-        plt.xlabel('Função de Custo')
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.plots_dir, 'part1_avg_cost.png'))
-        plt.close()
-
-        # Gráfico 2: Média de Nós Visitados
-        plt.figure()
-        sns.barplot(data=df, x='algorithm', y='nodes_visited')
-        plt.title('Parte 1: Média de Nós Visitados por Algoritmo')
-        plt.ylabel('Média de Nós Visitados (Log Scale)')
-        plt.xlabel('Algoritmo')
-        plt.yscale('log')  # Escala de log é útil quando os valores variam muito
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.plots_dir, 'part1_avg_nodes.png'))
-        plt.close()
+        return self.plot_part("Part1")
 
     def plot_part2(self):
         """Gera gráficos para o Experimento Parte 2."""
-        df = self._load_data("Part2")
-        if df is None: return
-
-        print("Gerando gráficos para a Parte 2...")
-
-        # Prepara a coluna de 'legenda' para o gráfico
-        df['algorithm_heuristic'] = df.apply(
-            lambda row: f"A*({row['heuristic']})" if row['algorithm'] == 'AStarSearch' else 'UCS',
-            axis=1
-        )
-
-        # Gráfico 1: Média de Nós Visitados (UCS vs A*)
-        plt.figure()
-        sns.barplot(data=df, x='cost_function', y='nodes_visited', hue='algorithm_heuristic')
-        plt.title('Parte 2: Média de Nós Visitados (UCS vs. A*)')
-        plt.ylabel('Média de Nós Visitados (Log Scale)')
-        plt.xlabel('Função de Custo')
-        plt.yscale('log')
-        plt.legend(title='Algoritmo (Heurística)')
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.plots_dir, 'part2_nodes_ucs_vs_astar.png'))
-        plt.close()
+        return self.plot_part("Part2")
 
     def plot_part3(self):
         """Gera gráficos para o Experimento Parte 3."""
-        df = self._load_data("Part3")
-        if df is None: return
-
-        print("Gerando gráficos para a Parte 3...")
-
-        # Prepara a coluna de 'legenda'
-        df['algorithm_heuristic'] = df.apply(
-            lambda row: f"{row['algorithm'].replace('Search', '')}({row['heuristic']})",
-            axis=1
-        )
-
-        # Gráfico 1: Média de Nós Visitados (Greedy vs A*)
-        plt.figure()
-        sns.barplot(data=df, x='algorithm_heuristic', y='nodes_visited',
-                    order=sorted(df['algorithm_heuristic'].unique()))
-        plt.title('Parte 3: Média de Nós Visitados (Greedy vs. A*)')
-        plt.ylabel('Média de Nós Visitados (Log Scale)')
-        plt.xlabel('Algoritmo (Heurística)')
-        plt.xticks(rotation=15)
-        plt.yscale('log')
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.plots_dir, 'part3_avg_nodes_greedy_vs_astar.png'))
-        plt.close()
-
-        # Gráfico 2: Custo Médio do Caminho (Greedy vs A*)
-        plt.figure()
-        sns.barplot(data=df, x='algorithm_heuristic', y='path_cost', hue='cost_function',
-                    order=sorted(df['algorithm_heuristic'].unique()))
-        plt.title('Parte 3: Custo Médio do Caminho (Greedy vs. A*)')
-        plt.ylabel('Custo Médio do Caminho')
-        plt.xlabel('Algoritmo (Heurística)')
-        plt.xticks(rotation=15)
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.plots_dir, 'part3_avg_cost_greedy_vs_astar.png'))
-        plt.close()
-
-    def plot_all(self):
-        """Chama todas as funções de plotagem."""
+        return self.plot_part("Part3")
+
+    def plot_part4(self):
+        """Gera os boxplots de variabilidade do Experimento Parte 4."""
+        return self.plot_part("Part4")
+
+    def plot_all(self, jobs: int = 1, force: bool = False):
+        """Gera todos os gráficos cujas entradas mudaram."""
         print("Iniciando geração de todos os gráficos...")
-        self.plot_part1()
-        self.plot_part2()
-        self.plot_part3()
-        # A Parte 4 é mais sobre a variabilidade, um boxplot seria ideal,
-        # mas a análise principal é ver se os valores mudam ou não,
-        # o que é mais fácil de ver diretamente nos dados.
+        self.build(FIGURES, jobs, force)
         print("\nGeração de gráficos concluída. Verifique a pasta 'plots'.")
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Gera os gráficos dos experimentos.")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="processos desenhando figuras em paralelo (padrão: número de CPUs)")
+    parser.add_argument('--force', action='store_true', help="refaz todas as figuras, mesmo as atualizadas")
+    args = parser.parse_args()
     plotter = ResultPlotter()
-    plotter.plot_all()
-
+    plotter.plot_all(jobs=args.jobs, force=args.force)
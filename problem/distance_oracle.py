@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Oráculo de distâncias exatas do 8-Puzzle.
+
+Para cada função de custo, uma única busca de Dijkstra reversa a partir dos
+9 estados objetivo calcula o custo ótimo de todos os 181.440 estados. A
+tabela (um byte por índice do StateSpace) é salva em disco e carregada com
+mmap, de modo que vários processos compartilham as mesmas páginas sem cópia.
+
+Para pré-calcular as tabelas de C1 a C4:
+    python -m problem.distance_oracle
+"""
+
+import heapq
+import mmap
+import os
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from core.state import State
+from problem.state_space import StateSpace, BLANK_ACTIONS
+
+DEFAULT_CACHE_DIR = "cache"
+# Valor reservado para estados sem caminho até um objetivo (não ocorre no
+# espaço solucionável, mas mantém a tabela bem definida).
+UNREACHABLE = 255
+
+
+class DistanceOracle:
+    """Custo ótimo até o objetivo mais próximo, consultado em O(1) pelo índice do estado."""
+
+    # Oráculos já carregados no processo, por (diretório, tipo de custo).
+    _loaded: Dict[Tuple[str, str], 'DistanceOracle'] = {}
+
+    def __init__(self, cost_type: str, table, space: StateSpace, costs: Sequence[float]):
+        self.cost_type = cost_type
+        self.table = table
+        self.space = space
+        self.costs = costs
+
+    @staticmethod
+    def compute_table(space: StateSpace, costs: Sequence[float], goals: Iterable[int]) -> bytearray:
+        """
+        Dijkstra reverso com múltiplas origens (todos os objetivos com distância 0).
+        Como os movimentos são reversíveis, o predecessor de `u` pela ação `a`
+        é o vizinho `p = vizinho(u, a)`, e o passo p -> u usa a ação inversa
+        (a ^ 1) com o espaço vazio na posição de `p`; é esse custo que conta,
+        o que trata corretamente a penalidade de C4 por posição resultante.
+        """
+        num_actions = space.NUM_ACTIONS
+        dist = [float('inf')] * space.SIZE
+        frontier = []
+        for goal in goals:
+            dist[goal] = 0
+            frontier.append((0, goal))
+        heapq.heapify(frontier)
+
+        while frontier:
+            d, u = heapq.heappop(frontier)
+            if d > dist[u]:
+                continue
+            for action in BLANK_ACTIONS[space.blank_at(u)]:
+                p = space.neighbors[num_actions * u + action]
+                step = int(costs[space.blank_at(p) * num_actions + (action ^ 1)])
+                if d + step < dist[p]:
+                    dist[p] = d + step
+                    heapq.heappush(frontier, (d + step, p))
+
+        if max(d for d in dist if d != float('inf')) >= UNREACHABLE:
+            raise ValueError("Custo ótimo não cabe em um byte; use um formato de tabela maior.")
+        return bytearray(UNREACHABLE if d == float('inf') else d for d in dist)
+
+    @classmethod
+    def load(cls, cost_type: str, space: StateSpace, costs: Sequence[float], goals: Iterable[int],
+             cache_dir: str = DEFAULT_CACHE_DIR) -> 'DistanceOracle':
+        """
+        Mapeia a tabela do disco com mmap, calculando e salvando se ainda não existir.
+        O resultado é reaproveitado pelas chamadas seguintes no mesmo processo.
+        """
+        key = (os.path.abspath(cache_dir), cost_type)
+        if key in cls._loaded:
+            return cls._loaded[key]
+
+        filepath = os.path.join(cache_dir, f"oracle_{cost_type}.bin")
+        if not os.path.exists(filepath) or os.path.getsize(filepath) != space.SIZE:
+            table = cls.compute_table(space, costs, goals)
+            os.makedirs(cache_dir, exist_ok=True)
+            # Escreve em um arquivo temporário e renomeia, para que outro
+            # processo nunca mapeie uma tabela pela metade.
+            tmp_path = f"{filepath}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(table)
+            os.replace(tmp_path, filepath)
+
+        with open(filepath, 'rb') as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        oracle = cls(cost_type, table, space, costs)
+        cls._loaded[key] = oracle
+        return oracle
+
+    def cost_at(self, index: int) -> float:
+        """Custo ótimo do estado de índice `index`."""
+        value = self.table[index]
+        return float('inf') if value == UNREACHABLE else float(value)
+
+    def cost(self, state: State) -> float:
+        """Custo ótimo de `state` até o objetivo mais próximo."""
+        return self.cost_at(self.space.index_of(state))
+
+    def is_optimal(self, state: State, path_cost: float) -> bool:
+        """Verifica se `path_cost` é o custo ótimo a partir de `state`."""
+        return path_cost == self.cost(state)
+
+    def path(self, state: State) -> List[State]:
+        """
+        Extrai um caminho ótimo de `state` até um objetivo, seguindo a cada
+        passo a primeira ação (na ordem de ACTIONS) que mantém
+        dist(u) = custo(u, a) + dist(vizinho).
+        """
+        space = self.space
+        num_actions = space.NUM_ACTIONS
+        index = space.index_of(state)
+        if self.table[index] == UNREACHABLE:
+            return []
+
+        path = [space.state_at(index)]
+        while self.table[index] != 0:
+            blank_pos = space.blank_at(index)
+            for action in BLANK_ACTIONS[blank_pos]:
+                neighbor = space.neighbors[num_actions * index + action]
+                if self.table[index] == self.costs[blank_pos * num_actions + action] + self.table[neighbor]:
+                    index = neighbor
+                    break
+            path.append(space.state_at(index))
+        return path
+
+
+if __name__ == '__main__':
+    from problem.eight_puzzle import EightPuzzleProblem
+
+    for c_type in ['C1', 'C2', 'C3', 'C4']:
+        problem = EightPuzzleProblem(State(tuple(range(9))), c_type)
+        oracle = problem.get_distance_oracle()
+        print(f"Tabela {c_type}: custo ótimo máximo = {max(oracle.table[:])}")
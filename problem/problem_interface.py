@@ -5,7 +5,7 @@ Define a interface (classe abstrata) para um problema de busca.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Sequence, Tuple
 
 from core.state import State
 
@@ -14,6 +14,10 @@ class Problem(ABC):
     Classe abstrata para formalizar um problema de busca.
     Isso permite que os algoritmos de busca sejam genéricos e não acoplados ao 8-Puzzle.
     """
+    # Espaço de estados denso opcional; quando definido, os algoritmos usam
+    # os índices da tabela de transições no lugar de objetos State.
+    state_space = None
+
     def __init__(self, initial_state: State, cost_type: str, heuristic_type: str | None = None):
         self.initial_state = initial_state
         self.cost_type = cost_type
@@ -39,7 +43,53 @@ class Problem(ABC):
         """Calcula o custo de uma ação em um determinado estado."""
         pass
 
+    def successors(self, state: State) -> Iterator[Tuple[str, State, float]]:
+        """
+        Gera (ação, próximo estado, custo do passo) para cada ação de `state`,
+        na ordem de `get_actions`. Por padrão combina get_actions, get_result e
+        get_cost; problemas concretos podem fazer tudo em uma passada.
+        """
+        for action in self.get_actions(state):
+            yield action, self.get_result(state, action), self.get_cost(state, action)
+
     @abstractmethod
     def get_heuristic(self, state: State) -> float:
         """Calcula o valor da heurística para um estado."""
         pass
+
+    def get_goal_states(self) -> List[State]:
+        """
+        Lista explícita dos estados objetivo, usada para semear buscas para trás.
+        Problemas cujo objetivo é só um teste não precisam implementá-la.
+        """
+        raise NotImplementedError(f"{type(self).__name__} não enumera seus estados objetivo.")
+
+    def get_predecessors(self, state: State) -> List[Tuple[str, State, float]]:
+        """
+        Retorna (ação, estado anterior, custo) para cada estado que leva a
+        `state` em um passo, onde a ação e o custo são os do movimento para frente.
+        """
+        raise NotImplementedError(f"{type(self).__name__} não gera predecessores.")
+
+    def get_heuristics(self, states: Sequence[State]) -> Sequence[float]:
+        """
+        Calcula a heurística de vários estados de uma vez. Por padrão chama
+        `get_heuristic` para cada um; problemas concretos podem vetorizar.
+        """
+        return [self.get_heuristic(state) for state in states]
+
+    def get_heuristic_vector(self, state: State) -> Tuple[float, ...]:
+        """
+        Componentes da heurística (por exemplo, uma por objetivo), que podem ser
+        atualizados incrementalmente ao longo da busca. Por padrão há um único
+        componente igual a `get_heuristic`.
+        """
+        return (self.get_heuristic(state),)
+
+    def update_heuristic_vector(self, vector: Tuple[float, ...], state: State, next_state: State) -> Tuple[float, ...]:
+        """Calcula o vetor de `next_state` a partir do vetor do estado pai `state`."""
+        return self.get_heuristic_vector(next_state)
+
+    def heuristic_from_vector(self, vector: Tuple[float, ...]) -> float:
+        """Combina os componentes do vetor no valor da heurística."""
+        return min(vector)
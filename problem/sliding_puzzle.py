@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+
+"""
+Implementação do quebra-cabeça deslizante N x N (8-Puzzle, 15-Puzzle,
+24-Puzzle...), com as mesmas variações de custo e heurísticas do 8-Puzzle.
+"""
+
+from math import isqrt
+from operator import add
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: sem ele, get_heuristics avalia estado a estado.
+    np = None
+
+from core.state import State, tile_bits
+from problem.problem_interface import Problem
+from problem.state_space import ACTIONS, ACTION_CODES
+
+# Ação que desfaz cada movimento do espaço vazio.
+INVERSE_ACTIONS: Dict[str, str] = {'CIMA': 'BAIXO', 'BAIXO': 'CIMA', 'ESQUERDA': 'DIREITA', 'DIREITA': 'ESQUERDA'}
+
+COST_TYPES = ('C1', 'C2', 'C3', 'C4')
+
+# Um movimento pré-calculado: (ação, código da ação, nova posição do vazio, custo do passo).
+Move = Tuple[str, int, int, float]
+
+
+def count_inversions(values: List[int]) -> int:
+    """Conta os pares fora de ordem em O(n log n) com merge sort."""
+    if len(values) < 2:
+        return 0
+    middle = len(values) // 2
+    left, right = values[:middle], values[middle:]
+    inversions = count_inversions(left) + count_inversions(right)
+
+    # Intercala as metades ordenadas; cada elemento da direita que passa à
+    # frente de um da esquerda forma inversões com todos os restantes dela.
+    i = j = k = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            values[k] = left[i]
+            i += 1
+        else:
+            values[k] = right[j]
+            inversions += len(left) - i
+            j += 1
+        k += 1
+    values[k:] = left[i:] + right[j:]
+    return inversions
+
+
+def parity_class(board: Tuple[int, ...]) -> int:
+    """
+    Classe de paridade (0 ou 1) de um tabuleiro N x N, que nenhum movimento
+    muda: dois tabuleiros só se alcançam se estiverem na mesma classe. Em
+    lados ímpares é a paridade das inversões; em lados pares, cada movimento
+    vertical muda a paridade das inversões e a da linha do espaço vazio,
+    então a classe é a paridade da soma das duas.
+    """
+    size = isqrt(len(board))
+    inversions = count_inversions([tile for tile in board if tile != 0])
+    if size % 2 == 1:
+        return inversions % 2
+    return (inversions + board.index(0) // size) % 2
+
+
+class PuzzleTables:
+    """
+    Tabelas pré-calculadas para um tamanho de tabuleiro, compartilhadas por
+    todos os problemas desse tamanho: movimentos por posição do espaço vazio,
+    estados objetivo e as tabelas das heurísticas H1 e H2.
+
+    Os objetivos são os tabuleiros com as peças em ordem e o espaço vazio em
+    qualquer posição, restritos à classe de paridade `goal_class` (ver
+    `parity_class`). Em lados ímpares todos estão na classe 0; em lados pares
+    metade está em cada classe, e cada problema usa as tabelas da classe do
+    seu estado inicial, para que as heurísticas não considerem objetivos
+    inalcançáveis.
+    """
+    _by_size: Dict[Tuple[int, int], 'PuzzleTables'] = {}
+
+    def __init__(self, size: int, goal_class: int = 0):
+        self.size = size
+        self.goal_class = goal_class
+        cells = size * size
+
+        # Deslocamento do espaço vazio para CIMA, BAIXO, ESQUERDA e DIREITA.
+        self.action_deltas: Dict[str, int] = dict(zip(ACTIONS, (-size, size, -1, 1)))
+        self.blank_actions: List[Tuple[str, ...]] = []
+        for blank_pos in range(cells):
+            row, col = blank_pos // size, blank_pos % size
+            actions = []
+            if row > 0: actions.append('CIMA')
+            if row < size - 1: actions.append('BAIXO')
+            if col > 0: actions.append('ESQUERDA')
+            if col < size - 1: actions.append('DIREITA')
+            self.blank_actions.append(tuple(actions))
+
+        # Casas centrais penalizadas em C4: a casa do meio em lados ímpares e
+        # o bloco 2x2 do meio em lados pares.
+        middle = [size // 2] if size % 2 else [size // 2 - 1, size // 2]
+        self.centre: FrozenSet[int] = frozenset(r * size + c for r in middle for c in middle)
+
+        # Objetivos: peças 1..N²-1 em ordem, com o espaço vazio em qualquer posição da classe.
+        base_goal = tuple(range(1, cells))
+        self.goal_states: List[State] = []
+        for i in range(cells):
+            goal_board = base_goal[:i] + (0,) + base_goal[i:]
+            if parity_class(goal_board) == goal_class:
+                self.goal_states.append(State(goal_board))
+        self.goal_boards: List[Tuple[int, ...]] = [g.board for g in self.goal_states]
+        self.goal_codes: FrozenSet[int] = frozenset(g.code for g in self.goal_states)
+
+        self._build_heuristic_tables()
+        # As mesmas tabelas como matrizes NumPy, criadas sob demanda.
+        self.heuristic_arrays: Dict[str, 'np.ndarray'] = {}
+
+        # Por custo: movimentos válidos de cada posição do espaço vazio, já com o custo.
+        self.moves: Dict[str, List[Tuple[Move, ...]]] = {
+            cost_type: self._build_moves(cost_type) for cost_type in COST_TYPES}
+        # Por custo: custo de cada ação indexado por `posição do vazio * 4 + código da ação`.
+        self.step_costs: Dict[str, List[float]] = {}
+        for cost_type, moves in self.moves.items():
+            costs = [0.0] * (cells * len(ACTIONS))
+            for blank_pos, blank_moves in enumerate(moves):
+                for _, code, _, cost in blank_moves:
+                    costs[blank_pos * len(ACTIONS) + code] = cost
+            self.step_costs[cost_type] = costs
+
+    @classmethod
+    def get(cls, size: int, goal_class: int = 0) -> 'PuzzleTables':
+        """Retorna as tabelas do tamanho e da classe pedidos, construindo-as na primeira chamada."""
+        key = (size, goal_class)
+        if key not in cls._by_size:
+            cls._by_size[key] = cls(size, goal_class)
+        return cls._by_size[key]
+
+    @staticmethod
+    def goal_class_for(board: Tuple[int, ...]) -> int:
+        """
+        Classe dos objetivos alcançáveis a partir de `board`. Em lados ímpares
+        é sempre 0: um tabuleiro da outra classe não tem solução, e a busca
+        apenas esgota o espaço alcançável.
+        """
+        return parity_class(board) if isqrt(len(board)) % 2 == 0 else 0
+
+    def _build_moves(self, cost_type: str) -> List[Tuple[Move, ...]]:
+        """Implementa as funções de custo C1, C2, C3, C4 para cada movimento do espaço vazio."""
+        moves = []
+        for blank_pos in range(self.size * self.size):
+            blank_moves = []
+            for action in self.blank_actions[blank_pos]:
+                dst = blank_pos + self.action_deltas[action]
+                is_vertical = action in ('CIMA', 'BAIXO')
+                if cost_type == 'C1':
+                    cost = 2.0
+                elif cost_type == 'C2':
+                    cost = 2.0 if is_vertical else 3.0
+                elif cost_type == 'C3':
+                    cost = 3.0 if is_vertical else 2.0
+                elif dst in self.centre:  # C4
+                    cost = 5.0
+                else:
+                    cost = 2.0 if is_vertical else 3.0
+                blank_moves.append((action, ACTION_CODES[action], dst, cost))
+            moves.append(tuple(blank_moves))
+        return moves
+
+    def _build_heuristic_tables(self):
+        """
+        Pré-calcula, para cada (peça, posição), a distância de Manhattan e o
+        indicador de peça fora do lugar em relação a cada objetivo, e a
+        variação desses vetores quando uma peça se move entre posições vizinhas.
+        """
+        size = self.size
+        cells = size * size
+        num_goals = len(self.goal_states)
+        goal_positions = [{tile: pos for pos, tile in enumerate(board)} for board in self.goal_boards]
+
+        # Por heurística: tabela[peça * N² + posição] = contribuição da peça para cada objetivo.
+        manhattan = [(0,) * num_goals for _ in range(cells * cells)]
+        misplaced = [(0,) * num_goals for _ in range(cells * cells)]
+        for tile in range(1, cells):
+            for pos in range(cells):
+                r1, c1 = pos // size, pos % size
+                manhattan[tile * cells + pos] = tuple(
+                    abs(r1 - g[tile] // size) + abs(c1 - g[tile] % size) for g in goal_positions)
+                misplaced[tile * cells + pos] = tuple(
+                    0 if goal_board[pos] == tile else 1 for goal_board in self.goal_boards)
+
+        # Por heurística: deltas[(peça * N² + origem) * N² + destino] = variação do vetor ao mover a peça.
+        self.heuristic_tables: Dict[str, List[Tuple[int, ...]]] = {}
+        self.heuristic_deltas: Dict[str, List[Tuple[int, ...] | None]] = {}
+        for name, table in (('H1', misplaced), ('H2', manhattan)):
+            deltas: List[Tuple[int, ...] | None] = [None] * (cells * cells * cells)
+            for tile in range(1, cells):
+                for src in range(cells):
+                    for action in self.blank_actions[src]:
+                        dst = src + self.action_deltas[action]
+                        deltas[(tile * cells + src) * cells + dst] = tuple(
+                            new - old for new, old in zip(table[tile * cells + dst], table[tile * cells + src]))
+            self.heuristic_tables[name] = table
+            self.heuristic_deltas[name] = deltas
+
+
+class SlidingPuzzleProblem(Problem):
+    """
+    Quebra-cabeça deslizante de lado arbitrário. O tamanho é inferido do
+    estado inicial, e as funções de custo C1-C4 e heurísticas H1/H2 seguem
+    as mesmas definições do 8-Puzzle. Os objetivos são os da classe de
+    paridade do estado inicial (ver PuzzleTables).
+    """
+
+    def __init__(self, initial_state: State, cost_type: str, heuristic_type: str | None = None):
+        super().__init__(initial_state, cost_type, heuristic_type)
+        self.size = initial_state.size
+        self.cells = self.size * self.size
+        self.tables = PuzzleTables.get(self.size, PuzzleTables.goal_class_for(initial_state.board))
+        # None com um custo desconhecido: get_cost e successors acusam o erro quando chamados.
+        self._moves: Optional[List[Tuple[Move, ...]]] = self.tables.moves.get(cost_type)
+        self._step_costs: Optional[List[float]] = self.tables.step_costs.get(cost_type)
+
+    def get_actions(self, state: State) -> List[str]:
+        """Retorna as ações possíveis (CIMA, BAIXO, ESQUERDA, DIREITA)."""
+        return list(self.tables.blank_actions[state.blank_pos])
+
+    def get_result(self, state: State, action: str) -> State:
+        """Move o espaço vazio e retorna um novo objeto State."""
+        return state.move_blank(state.blank_pos + self.tables.action_deltas[action])
+
+    def is_goal(self, state: State) -> bool:
+        """Verifica se o estado corresponde a um dos objetivos."""
+        return state.code in self.tables.goal_codes
+
+    def get_goal_states(self) -> List[State]:
+        """Os estados objetivo alcançáveis (N² em lados ímpares, N²/2 em lados pares)."""
+        return list(self.tables.goal_states)
+
+    def get_predecessors(self, state: State) -> List[Tuple[str, State, float]]:
+        """
+        Os movimentos são reversíveis: cada vizinho de `state` é um predecessor,
+        alcançado de volta pela ação inversa. O custo é calculado a partir do
+        predecessor, o que em C4 cobra a penalidade quando `state` tem o
+        espaço vazio no centro.
+        """
+        predecessors = []
+        for action in self.tables.blank_actions[state.blank_pos]:
+            previous = self.get_result(state, action)
+            forward_action = INVERSE_ACTIONS[action]
+            predecessors.append((forward_action, previous, self.get_cost(previous, forward_action)))
+        return predecessors
+
+    def get_cost(self, state: State, action: str) -> float:
+        """Custo de C1, C2, C3 ou C4, lido da tabela pré-calculada por (posição do vazio, ação)."""
+        if self._step_costs is None:
+            raise ValueError(f"Tipo de custo desconhecido: {self.cost_type}")
+        return self._step_costs[state.blank_pos * len(ACTIONS) + ACTION_CODES[action]]
+
+    def successors(self, state: State) -> Iterator[Tuple[str, State, float]]:
+        """
+        Percorre os movimentos pré-calculados da posição do espaço vazio: cada
+        sucessor custa só uma construção de State, sem comparar nomes de ações.
+        """
+        moves = self._moves
+        if moves is None:
+            raise ValueError(f"Tipo de custo desconhecido: {self.cost_type}")
+        for action, _, dst, cost in moves[state.blank_pos]:
+            yield action, state.move_blank(dst), cost
+
+    def get_heuristic(self, state: State) -> float:
+        """Implementa as heurísticas H1 e H2, garantindo admissibilidade."""
+        if not self.heuristic_type:
+            return 0.0
+
+        if self.heuristic_type in self.tables.heuristic_tables:
+            return self.heuristic_from_vector(self.get_heuristic_vector(state))
+
+        raise ValueError(f"Tipo de heurística desconhecido: {self.heuristic_type}")
+
+    def get_heuristics(self, states: Sequence[State]) -> Sequence[float]:
+        """
+        Avalia H1/H2 de muitos estados de uma vez com NumPy. Os tabuleiros são
+        desempacotados em uma matriz (n, N²); indexar a tabela (peça, posição)
+        x objetivo com ela produz um tensor (n, N² células, objetivos), que é
+        somado nas células e minimizado nos objetivos.
+        """
+        if np is None or self.heuristic_type not in self.tables.heuristic_tables:
+            return super().get_heuristics(states)
+
+        table = self.tables.heuristic_arrays.get(self.heuristic_type)
+        if table is None:
+            table = np.array(self.tables.heuristic_tables[self.heuristic_type], dtype=np.int16)
+            self.tables.heuristic_arrays[self.heuristic_type] = table
+
+        bits = tile_bits(self.size)
+        cells = np.arange(self.cells, dtype=np.uint64)
+        if bits * self.cells <= 64:
+            codes = np.fromiter((state.code for state in states), dtype=np.uint64, count=len(states))
+            boards = ((codes[:, None] >> (np.uint64(bits) * cells)) & np.uint64((1 << bits) - 1)).astype(np.intp)
+        else:
+            # O código não cabe em 64 bits (24-Puzzle em diante): desempacota em Python.
+            boards = np.array([state.board for state in states], dtype=np.intp)
+        per_goal = table[boards * self.cells + cells.astype(np.intp)].sum(axis=1)
+        return per_goal.min(axis=1) * 2.0
+
+    def get_heuristic_vector(self, state: State) -> Tuple[float, ...]:
+        """
+        H1: número de peças fora do lugar em relação a cada objetivo.
+        H2: soma das distâncias de Manhattan em relação a cada objetivo.
+        """
+        table = self.tables.heuristic_tables.get(self.heuristic_type)
+        if table is None:
+            return super().get_heuristic_vector(state)
+        cells = self.cells
+        return tuple(map(sum, zip(*[table[tile * cells + pos] for pos, tile in enumerate(state.board) if tile])))
+
+    def update_heuristic_vector(self, vector: Tuple[float, ...], state: State, next_state: State) -> Tuple[float, ...]:
+        """Só a peça movida muda de posição, então basta somar o delta pré-calculado dela."""
+        deltas = self.tables.heuristic_deltas.get(self.heuristic_type)
+        if deltas is None:
+            return super().update_heuristic_vector(vector, state, next_state)
+        # A peça estava onde agora está o espaço vazio e foi para o antigo espaço vazio.
+        cells = self.cells
+        tile = state.tile_at(next_state.blank_pos)
+        return tuple(map(add, vector, deltas[(tile * cells + next_state.blank_pos) * cells + state.blank_pos]))
+
+    def heuristic_from_vector(self, vector: Tuple[float, ...]) -> float:
+        """O objetivo mais próximo define a heurística; o fator 2 é o menor custo de um passo."""
+        if self.heuristic_type in self.tables.heuristic_tables:
+            return min(vector) * 2.0
+        return super().heuristic_from_vector(vector)
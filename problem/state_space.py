@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Espaço de estados denso do 8-Puzzle.
+
+Todos os 181.440 estados alcançáveis a partir de um estado solucionável
+recebem um índice inteiro (posto de permutação), e a tabela de transições
+é construída uma única vez por processo. Com isso os algoritmos podem
+usar vetores planos (array/bytearray) indexados pelo posto no lugar de
+conjuntos e dicionários de objetos State.
+"""
+
+from array import array
+from itertools import permutations
+from typing import Dict, Optional, Tuple
+
+from core.state import State, encode_board, BITS_PER_TILE, TILE_MASK
+
+# Códigos inteiros das ações, na mesma ordem devolvida por get_actions.
+ACTIONS: Tuple[str, ...] = ('CIMA', 'BAIXO', 'ESQUERDA', 'DIREITA')
+ACTION_CODES: Dict[str, int] = {name: code for code, name in enumerate(ACTIONS)}
+ACTION_DELTAS: Tuple[int, ...] = (-3, 3, -1, 1)
+
+_FACTORIALS = (1, 1, 2, 6, 24, 120, 720, 5040)
+
+
+def _valid_actions(blank_pos: int) -> Tuple[int, ...]:
+    """Códigos das ações válidas para o espaço vazio em `blank_pos`."""
+    row, col = blank_pos // 3, blank_pos % 3
+    actions = []
+    if row > 0: actions.append(0)
+    if row < 2: actions.append(1)
+    if col > 0: actions.append(2)
+    if col < 2: actions.append(3)
+    return tuple(actions)
+
+
+# Ações válidas para cada posição do espaço vazio.
+BLANK_ACTIONS: Tuple[Tuple[int, ...], ...] = tuple(_valid_actions(b) for b in range(9))
+
+
+class StateSpace:
+    """
+    Tabela de transições do 8-Puzzle indexada pelo posto da permutação.
+
+    O índice de um estado é `blank_pos * 20160 + posto(peças) // 2`, onde
+    `posto(peças)` é o código de Lehmer das 8 peças lidas sem o espaço vazio.
+    Só as permutações pares (as solucionáveis) pertencem ao espaço, e cada par
+    de postos consecutivos contém exatamente uma delas, daí a divisão por 2.
+    """
+    SIZE = 181440
+    PERMS_PER_BLANK = 20160
+    NUM_ACTIONS = 4
+
+    _instance: Optional['StateSpace'] = None
+
+    def __init__(self):
+        even_perms = [p for p in permutations(range(1, 9)) if self._is_even(p)]
+
+        # codes[i] guarda o tabuleiro compactado do estado de índice i.
+        self.codes = array('q')
+        for blank_pos in range(9):
+            for perm in even_perms:
+                self.codes.append(encode_board(perm[:blank_pos] + (0,) + perm[blank_pos:]))
+
+        # neighbors[4 * i + a] é o índice do estado obtido com a ação a, ou -1.
+        self.neighbors = array('i', [-1]) * (self.SIZE * self.NUM_ACTIONS)
+        index_of_code = {code: i for i, code in enumerate(self.codes)}
+        for i, code in enumerate(self.codes):
+            blank_pos = i // self.PERMS_PER_BLANK
+            for action in BLANK_ACTIONS[blank_pos]:
+                swap_pos = blank_pos + ACTION_DELTAS[action]
+                tile = (code >> (BITS_PER_TILE * swap_pos)) & TILE_MASK
+                next_code = code + (tile << (BITS_PER_TILE * blank_pos)) - (tile << (BITS_PER_TILE * swap_pos))
+                self.neighbors[self.NUM_ACTIONS * i + action] = index_of_code[next_code]
+
+    @classmethod
+    def get(cls) -> 'StateSpace':
+        """Retorna a instância do processo, construindo a tabela na primeira chamada."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def _is_even(perm: Tuple[int, ...]) -> bool:
+        inversions = sum(1 for i in range(len(perm)) for j in range(i + 1, len(perm)) if perm[i] > perm[j])
+        return inversions % 2 == 0
+
+    def index_of(self, state: State) -> int:
+        """Calcula o índice (posto) de um estado solucionável."""
+        remaining = 0x1FE  # bits 1..8 ligados: peças ainda não usadas
+        rank = 0
+        parity = 0
+        tiles = [t for t in state.board if t != 0]
+        for i, tile in enumerate(tiles[:-1]):
+            smaller = (remaining & ((1 << tile) - 1)).bit_count()
+            rank += smaller * _FACTORIALS[7 - i]
+            parity += smaller
+            remaining &= ~(1 << tile)
+        if parity % 2:
+            raise ValueError(f"O estado {state} não é solucionável e está fora do espaço denso.")
+        return state.blank_pos * self.PERMS_PER_BLANK + rank // 2
+
+    def state_at(self, index: int) -> State:
+        """Reconstrói o objeto State de um índice."""
+        return State.from_code(self.codes[index], index // self.PERMS_PER_BLANK)
+
+    def blank_at(self, index: int) -> int:
+        """Posição do espaço vazio no estado de índice `index`."""
+        return index // self.PERMS_PER_BLANK
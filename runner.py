@@ -7,105 +7,692 @@ dos experimentos, coletar dados e salvá-los em arquivos CSV.
 
 import os
 import csv
+import io
+import json
+import random
 import time
-from typing import List, Dict
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
+from core.node import Node
+from core.state import State
 from problem.eight_puzzle import EightPuzzleProblem
-from algorithms import GreedyBestFirstSearch
+from problem.sliding_puzzle import SlidingPuzzleProblem
+from algorithms.budget import SearchBudget
+from algorithms.instrumentation import STATS_COLUMNS
 from utils.puzzle_utils import generate_random_state, calculate_path_cost
+from utils.result_cache import ResultCache
+from utils.result_store import ResultStore, columns_path
+from utils.sequential_sampling import DEFAULT_MIN_RUNS, DEFAULT_TARGETS, SequentialSampler
+
+HEADERS = [
+    'run_id', 'initial_state', 'algorithm', 'cost_function', 'heuristic', 'random_successors',
+    'goal_state_found', 'path_length', 'path_cost', 'nodes_generated', 'nodes_visited', 'execution_time_sec',
+    'search_run_id', 'outcome'
+]
+
+# Valores da coluna 'outcome': 'budget_<motivo>' (ver algorithms.budget) quando o orçamento se esgota.
+OUTCOME_SOLVED = 'solved'
+OUTCOME_NO_SOLUTION = 'no_solution'
+
+# Colunas do perfil das buscas anytime (`<parte>_anytime_results.csv`): uma
+# linha por solução melhorada, com o instante desde o início da busca.
+ANYTIME_HEADERS = [
+    'run_id', 'initial_state', 'algorithm', 'cost_function', 'heuristic', 'solution', 'time_sec',
+    'path_cost', 'path_length', 'weight', 'suboptimality_bound', 'nodes_generated', 'nodes_visited'
+]
+
+# Colunas do relatório de convergência da amostragem adaptativa.
+CONVERGENCE_HEADERS = [
+    'scenario', 'algorithm', 'cost_type', 'heuristic', 'random_successors', 'runs', 'cost_function',
+    'metric', 'samples', 'mean', 'ci95_half_width', 'relative_half_width', 'target', 'converged'
+]
+
+# Algoritmos sem heurística percorrem boa parte do espaço de estados; suas
+# unidades são enviadas primeiro ao pool para não ficarem para o final.
+UNINFORMED_ALGORITHMS = ('BreadthFirstSearch', 'DepthFirstSearch', 'UniformCostSearch')
+
+
+def unit_seed(master_seed: int, run_index: int, scenario_index: int, exec_count: int) -> int:
+    """
+    Semente de uma unidade de trabalho (estado inicial x cenário x execução),
+    derivada só da semente mestre e da posição da unidade. Sementes str usam
+    SHA-512 em random.Random, então o valor não depende do processo.
+    """
+    return random.Random(f"{master_seed}:{run_index}:{scenario_index}:{exec_count}").getrandbits(32)
+
+
+def budget_limits(scenario: Dict, budget: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Limites de orçamento de um cenário: os globais, sobrescritos pelos de `scenario['budget']`."""
+    return {**(budget or {}), **scenario.get('budget', {})}
+
+
+def _within_budget(limits: Dict[str, Any], nodes_generated: int, execution_time: float) -> bool:
+    """
+    Se uma busca já concluída (do cache) também terminaria dentro dos limites.
+    As entradas em memória nunca passam dos nós gerados, então esses servem
+    de limite superior para elas.
+    """
+    return all(limit is None or value <= limit for limit, value in (
+        (limits.get('max_nodes'), nodes_generated), (limits.get('max_entries'), nodes_generated),
+        (limits.get('max_seconds'), execution_time)))
+
+
+def search_unit(unit: Tuple[int, State, Dict, int, int], cache_path: Optional[str] = None,
+                instrument: bool = False, trace_memory: bool = False,
+                budget: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Executa a busca de uma unidade de trabalho e retorna o resultado e se ele
+    veio do cache. É uma função de módulo para poder ser enviada aos
+    processos do pool; o tempo é medido aqui, dentro do processo que executa
+    a busca. Com `cache_path`, o ResultCache é consultado antes da busca e,
+    em um acerto, o resultado traz o tempo da execução original.
+    Com `instrument`, o resultado traz `nodes_pruned` (movimentos inversos
+    descartados com `lazy_successors`) e as colunas STATS_COLUMNS, e o cache
+    não é usado (ele não guarda essas medidas); `trace_memory` mede o pico de
+    memória com tracemalloc, o que também deixa a busca mais lenta.
+    `budget` traz os limites globais de SearchBudget, combinados com os do
+    cenário (ver `budget_limits`); uma busca interrompida por eles traz o
+    motivo em `budget_exceeded` e não vai para o cache. Um acerto do cache só
+    é usado se a busca original coube nos limites. Buscas anytime não usam o
+    cache (ele não guarda o perfil) e trazem as soluções em `anytime`.
+    """
+    run_id, initial_state, scenario, puzzle_size, seed = unit
+    algo_class = scenario['algorithm']
+    cost_type = scenario.get('cost_type')
+    heuristic_type = scenario.get('heuristic')
+    random_succ = scenario.get('random_successors', False)
+    dense = scenario.get('dense', False)
+    options = scenario.get('options', {})
+    limits = budget_limits(scenario, budget)
+
+    cache = ResultCache.get(cache_path) if cache_path and not instrument and not algo_class.anytime else None
+    key = cache.problem_key(initial_state, scenario, seed) if cache else None
+    cached = cache.lookup(key) if cache else None
+    if cached is not None and _within_budget(limits, cached[2], cached[4]):
+        actions, path_cost, nodes_generated, nodes_visited, execution_time = cached
+        return {'actions': actions, 'path_cost': path_cost, 'nodes_generated': nodes_generated,
+                'nodes_visited': nodes_visited, 'execution_time': execution_time, 'stats': None,
+                'budget_exceeded': None, 'anytime': None}, True
+
+    # Os sucessores aleatórios usam o módulo random: semeá-lo por unidade
+    # torna o resultado independente de quantos processos são usados.
+    random.seed(seed)
+    if puzzle_size == 3:
+        problem = EightPuzzleProblem(initial_state, cost_type, heuristic_type, dense=dense)
+    else:
+        problem = SlidingPuzzleProblem(initial_state, cost_type, heuristic_type)
+    algorithm = algo_class(randomize_successors=random_succ, **options)
+    algorithm.set_budget(SearchBudget.from_dict(limits))
+    if instrument:
+        algorithm.enable_instrumentation()
+    if trace_memory:
+        tracemalloc.start()
+
+    start_time = time.perf_counter()
+    solution_node = algorithm.search(problem)
+    end_time = time.perf_counter()
+
+    if trace_memory:
+        algorithm.stats.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    actions = _path_actions(solution_node) if solution_node else None
+    path_cost = solution_node.path_cost if solution_node else None
+    execution_time = end_time - start_time
+    if cache and algorithm.budget_exceeded is None:
+        cache.store(key, actions, path_cost, algorithm.nodes_generated, algorithm.nodes_visited, execution_time)
+    stats = None
+    if instrument:
+        stats = {'nodes_pruned': algorithm.nodes_pruned, **algorithm.stats.as_row()}
+    return {'actions': actions, 'path_cost': path_cost, 'nodes_generated': algorithm.nodes_generated,
+            'nodes_visited': algorithm.nodes_visited, 'execution_time': execution_time, 'stats': stats,
+            'budget_exceeded': algorithm.budget_exceeded,
+            'anytime': algorithm.solutions if algo_class.anytime else None}, False
+
+
+def unit_rows(unit: Tuple[int, State, Dict, int, int], result: Dict[str, Any],
+              search_run_id: int) -> List[Dict[str, Any]]:
+    """
+    Linhas do CSV de uma unidade a partir do resultado de `search_unit`, que
+    pode ter vindo da busca de outra unidade equivalente (`search_run_id`).
+    Há uma linha por função de custo em `scenario['cost_functions']` (por
+    padrão, só o `cost_type` do cenário). O custo do caminho é o da busca
+    quando ela otimizou essa mesma função de custo; nos demais casos é
+    recalculado a partir do caminho. Sem caminho, `outcome` separa as buscas
+    sem solução das interrompidas pelo orçamento, que trazem os contadores
+    parciais; uma busca anytime interrompida traz o melhor caminho que tinha,
+    também com `outcome` 'budget_<motivo>'.
+    """
+    run_id, initial_state, scenario, puzzle_size, seed = unit
+    algo_class = scenario['algorithm']
+    cost_type = scenario.get('cost_type')
+    cost_functions = _cost_functions(scenario)
+    actions = result['actions']
+
+    result_base = {
+        'run_id': run_id,
+        'initial_state': str(initial_state),
+        'algorithm': algo_class.__name__,
+        'heuristic': scenario.get('heuristic') or 'N/A',
+        'random_successors': scenario.get('random_successors', False),
+        'execution_time_sec': round(result['execution_time'], 4),
+        'nodes_generated': result['nodes_generated'],
+        'nodes_visited': result['nodes_visited'],
+        'search_run_id': search_run_id,
+    }
+    if result['stats'] is not None:
+        result_base.update(result['stats'])
+
+    if actions is None:
+        outcome = f"budget_{result['budget_exceeded']}" if result['budget_exceeded'] else OUTCOME_NO_SOLUTION
+        return [{**result_base, 'cost_function': c_type, 'goal_state_found': 'None',
+                 'path_length': 'inf', 'path_cost': 'inf', 'outcome': outcome} for c_type in cost_functions]
+
+    # O caminho é refeito a partir das ações (também para resultados do cache).
+    replay = SlidingPuzzleProblem(initial_state, cost_type)
+    path_states = [initial_state]
+    for action in actions:
+        path_states.append(replay.get_result(path_states[-1], action))
+
+    outcome = f"budget_{result['budget_exceeded']}" if result['budget_exceeded'] else OUTCOME_SOLVED
+    rows = []
+    for c_type in cost_functions:
+        if c_type == cost_type and 'cost_type' in algo_class.search_parameters:
+            path_cost = float(result['path_cost'])
+        else:
+            path_cost = calculate_path_cost(path_states, c_type)
+        rows.append({**result_base,
+                     'cost_function': c_type,
+                     'goal_state_found': str(path_states[-1]),
+                     'path_length': len(actions),
+                     'path_cost': path_cost,
+                     'outcome': outcome,
+                     })
+    return rows
+
+
+def anytime_rows(unit: Tuple[int, State, Dict, int, int], result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Linhas do perfil anytime de uma unidade (vazio para as demais buscas)."""
+    if not result.get('anytime'):
+        return []
+    run_id, initial_state, scenario, puzzle_size, seed = unit
+    base = {'run_id': run_id, 'initial_state': str(initial_state), 'algorithm': scenario['algorithm'].__name__,
+            'cost_function': scenario.get('cost_type'), 'heuristic': scenario.get('heuristic') or 'N/A'}
+    return [{**base, **solution, 'solution': i + 1, 'time_sec': round(solution['time_sec'], 4),
+             'suboptimality_bound': round(solution['suboptimality_bound'], 4)}
+            for i, solution in enumerate(result['anytime'])]
+
+
+def run_unit(unit: Tuple[int, State, Dict, int, int], cache_path: Optional[str] = None,
+             instrument: bool = False, trace_memory: bool = False,
+             budget: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """Executa a busca de uma unidade e retorna as linhas do CSV e se o resultado veio do cache."""
+    result, hit = search_unit(unit, cache_path, instrument, trace_memory, budget)
+    return unit_rows(unit, result, unit[0]), hit
+
+
+def _cost_functions(scenario: Dict) -> List[Optional[str]]:
+    """Funções de custo com que as linhas do cenário são gravadas."""
+    return scenario.get('cost_functions', [scenario.get('cost_type')])
+
+
+def _path_actions(node: Node) -> List[str]:
+    """Ações do início até `node`."""
+    actions = []
+    while node.parent is not None:
+        actions.append(node.action)
+        node = node.parent
+    return actions[::-1]
+
+
+def _scenario_key(scenario: Dict) -> str:
+    """Descrição estável de um cenário, gravada no manifesto para detectar mudanças."""
+    return (f"{scenario['algorithm'].__name__}|{scenario.get('cost_type')}|{scenario.get('heuristic')}|"
+            f"{scenario.get('random_successors', False)}|{scenario.get('executions', 1)}|"
+            f"{scenario.get('dense', False)}|{sorted(scenario.get('options', {}).items())}|"
+            f"{scenario.get('cost_functions')}|{sorted(scenario.get('budget', {}).items())}")
+
+
+def _describe_unit(unit: Tuple[int, State, Dict, int, int]) -> str:
+    scenario = unit[2]
+    return (f"{scenario['algorithm'].__name__}, Custo={scenario.get('cost_type') or 'N/A'}, "
+            f"Heuristica={scenario.get('heuristic') or 'N/A'}, Rand={scenario.get('random_successors', False)}")
+
+
+def _sync(f):
+    """Esvazia o buffer do arquivo e força a gravação em disco."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _write_atomic(path: str, content: str):
+    """Grava o arquivo por completo ou não grava: escreve em um temporário e renomeia."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+        _sync(f)
+    os.replace(tmp_path, path)
 
 
 class ExperimentRunner:
     """Orquestra a execução dos experimentos e salva os resultados em CSV."""
 
-    def __init__(self, output_dir="results"):
+    def __init__(self, output_dir="results", jobs: int = 1, seed: Optional[int] = None, resume: bool = False,
+                 cache_path: Optional[str] = None, instrument: bool = False, trace_memory: bool = False,
+                 adaptive: bool = False, ci_targets: Optional[Dict[str, float]] = None,
+                 min_runs: int = DEFAULT_MIN_RUNS, budget: Optional[Dict[str, Any]] = None):
+        """
+        :param jobs: Número de processos; 1 executa tudo no processo atual.
+        :param seed: Semente mestre. Sem ela, uma semente é sorteada uma vez
+                     para todas as partes e exibida, para que a execução
+                     possa ser repetida.
+        :param resume: Retoma execuções interrompidas a partir do manifesto e do
+                       registro de progresso de cada parte, pulando as unidades
+                       já concluídas e continuando a escrever no mesmo CSV. O
+                       registro de buscas da parte guarda os resultados que
+                       ainda servem a unidades equivalentes, para que elas não
+                       sejam buscadas de novo.
+        :param cache_path: Arquivo SQLite do ResultCache; None desativa o cache.
+        :param instrument: Acrescenta ao CSV as colunas de instrumentação das
+                           buscas (picos, entradas descartadas, tempos por fase).
+        :param trace_memory: Mede também o pico de memória com tracemalloc
+                             (implica `instrument`; aumenta o tempo medido).
+        :param adaptive: Amostragem sequencial: `num_runs` passa a ser o máximo
+                         de estados iniciais, e cada cenário para de receber
+                         estados assim que o IC de 95% de cada métrica de
+                         `ci_targets` (meia largura relativa à média; padrão em
+                         utils.sequential_sampling) fica dentro do alvo, após
+                         ao menos `min_runs` estados. O IC alcançado por cenário
+                         é gravado em `<parte>_convergence.csv`.
+        :param budget: Limites globais de cada busca, com os argumentos de
+                       algorithms.budget.SearchBudget (max_seconds, max_nodes,
+                       max_entries, check_interval). A chave 'budget' de um
+                       cenário sobrescreve esses limites para ele. Buscas
+                       interrompidas ficam no CSV com `outcome` 'budget_<motivo>'.
+        """
         self.output_dir = output_dir
+        self.jobs = jobs
+        # Uma só semente para as partes: elas sorteiam os mesmos estados iniciais (ver _sample_states).
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self._seed_drawn = seed is None
+        self.resume = resume
+        self.cache_path = cache_path
+        self.trace_memory = trace_memory
+        self.instrument = instrument or trace_memory
+        self.headers = HEADERS + ['nodes_pruned'] + STATS_COLUMNS if self.instrument else HEADERS
+        self.adaptive = {'targets': dict(DEFAULT_TARGETS if ci_targets is None else ci_targets),
+                         'min_runs': min_runs} if adaptive else None
+        self.budget = {key: value for key, value in (budget or {}).items() if value is not None}
+        if self.adaptive:
+            unknown = sorted(set(self.adaptive['targets']) - set(self.headers))
+            if unknown:
+                raise ValueError(f"Métricas sem coluna no CSV: {', '.join(unknown)}")
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-    def run_experiment(self, part_name: str, scenarios: List[Dict], num_runs: int):
+    def run_experiment(self, part_name: str, scenarios: List[Dict], num_runs: int, puzzle_size: int = 3):
         """
         Executa uma parte do experimento.
         :param part_name: Nome da parte (e.g., "Part1")
         :param scenarios: Lista de dicionários, cada um definindo um cenário de teste.
         :param num_runs: Número de estados iniciais aleatórios a serem testados.
+        :param puzzle_size: Lado do tabuleiro (3 para o 8-Puzzle, 4 para o 15-Puzzle...).
         """
         filepath = os.path.join(self.output_dir, f"{part_name}_results.csv")
-        headers = [
-            'run_id', 'initial_state', 'algorithm', 'cost_function', 'heuristic', 'random_successors',
-            'goal_state_found', 'path_length', 'path_cost', 'nodes_generated', 'nodes_visited', 'execution_time_sec'
-        ]
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            writer.writeheader()
-
-            print(f"\n--- Iniciando Experimento: {part_name} ---")
-            run_id_counter = 1
-
-            for i in range(num_runs):
-                initial_state = generate_random_state()
-                print(f"  Run {i + 1}/{num_runs} com Estado Inicial: {initial_state}")
-
-                for scenario in scenarios:
-                    algo_class = scenario['algorithm']
-                    cost_type = scenario.get('cost_type')
-                    heuristic_type = scenario.get('heuristic')
-                    random_succ = scenario.get('random_successors', False)
-                    num_executions = scenario.get('executions', 1)
-
-                    for exec_count in range(num_executions):
-                        print(
-                            f"    Executando: {algo_class.__name__}, Custo={cost_type or 'N/A'}, Heuristica={heuristic_type or 'N/A'}, Rand={random_succ} ({exec_count + 1}/{num_executions})")
-
-                        problem = EightPuzzleProblem(initial_state, cost_type, heuristic_type)
-                        algorithm = algo_class(randomize_successors=random_succ)
-
-                        start_time = time.time()
-                        solution_node = algorithm.search(problem)
-                        end_time = time.time()
-
-                        result_base = {
-                            'run_id': run_id_counter,
-                            'initial_state': str(initial_state),
-                            'algorithm': algo_class.__name__,
-                            'heuristic': heuristic_type or 'N/A',
-                            'random_successors': random_succ,
-                            'execution_time_sec': round(end_time - start_time, 4),
-                            'nodes_generated': algorithm.nodes_generated,
-                            'nodes_visited': algorithm.nodes_visited,
-                        }
-
-                        if solution_node:
-                            path_states = solution_node.get_path()
-
-                            if algo_class is GreedyBestFirstSearch:
-                                for c_type in ['C1', 'C2', 'C3', 'C4']:
-                                    recalculated_cost = calculate_path_cost(path_states, c_type)
-                                    writer.writerow({**result_base,
-                                                     'cost_function': c_type,
-                                                     'goal_state_found': str(solution_node.state),
-                                                     'path_length': solution_node.depth,
-                                                     'path_cost': recalculated_cost,
-                                                     })
-                                run_id_counter += 1
-                                continue
-
-                            result_base.update({
-                                'cost_function': cost_type,
-                                'goal_state_found': str(solution_node.state),
-                                'path_length': solution_node.depth,
-                                'path_cost': solution_node.path_cost,
-                            })
-                        else:
-                            result_base.update({
-                                'cost_function': cost_type,
-                                'goal_state_found': 'None',
-                                'path_length': 'inf',
-                                'path_cost': 'inf',
-                            })
-
-                        writer.writerow(result_base)
-                        run_id_counter += 1
-
-        print(f"--- Experimento {part_name} concluído. Resultados salvos em {filepath} ---")
+        manifest_path = os.path.join(self.output_dir, f"{part_name}_manifest.json")
+        progress_path = os.path.join(self.output_dir, f"{part_name}_progress.log")
+        searches_path = os.path.join(self.output_dir, f"{part_name}_searches.jsonl")
+
+        manifest = self._load_manifest(manifest_path, scenarios, num_runs, puzzle_size,
+                                       self.headers, self.adaptive, self.budget) if self.resume else None
+        if manifest is None:
+            master_seed = self.seed
+            initial_states = self._sample_states(num_runs, puzzle_size, master_seed)
+            manifest = {
+                'part': part_name,
+                'seed': master_seed,
+                'puzzle_size': puzzle_size,
+                'num_runs': num_runs,
+                'scenarios': [_scenario_key(scenario) for scenario in scenarios],
+                'columns': self.headers,
+                'adaptive': self.adaptive,
+                'budget': self.budget,
+                'initial_states': [list(state.board) for state in initial_states],
+            }
+            _write_atomic(manifest_path, json.dumps(manifest, indent=1))
+            done, offset = 0, None
+            for path in (progress_path, searches_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            master_seed = manifest['seed']
+            if self._seed_drawn:
+                # Retomando sem semente: as próximas partes seguem a da execução original.
+                self.seed = master_seed
+            initial_states = [State(tuple(board)) for board in manifest['initial_states']]
+            done, offset = self._read_progress(progress_path)
+
+        print(f"\n--- Iniciando Experimento: {part_name} (semente {master_seed}, {self.jobs} processo(s)) ---")
+        for i, initial_state in enumerate(initial_states):
+            print(f"  Run {i + 1}/{num_runs} com Estado Inicial: {initial_state}")
+        units = self._build_units(initial_states, scenarios, puzzle_size, master_seed)
+        if done:
+            print(f"  Retomando: {done} de {len(units)} unidades já concluídas.")
+
+        store_path = columns_path(self.output_dir, part_name)
+        previous_rows: Dict[int, List[Dict[str, str]]] = {}
+        fresh = offset is None or not os.path.exists(filepath)
+        if fresh:
+            csvfile = open(filepath, 'w', newline='', encoding='utf-8')
+            csv.DictWriter(csvfile, fieldnames=self.headers).writeheader()
+            store = ResultStore.create(store_path, self.headers)
+        else:
+            # Descarta uma linha escrita pela metade depois da última unidade registrada.
+            os.truncate(filepath, offset)
+            if self.adaptive:
+                previous_rows = self._read_rows(filepath)
+            csvfile = open(filepath, 'a', newline='', encoding='utf-8')
+            # Os lotes colunares podem ter ficado para trás do CSV: refaz a partir dele.
+            store = ResultStore.rebuild_from_csv(store_path, filepath, self.headers)
+        # Buscas já concluídas que ainda servem a unidades equivalentes pendentes.
+        recorded = self._load_searches(searches_path, 0 if fresh else done)
+
+        # Perfil das buscas anytime, em um CSV à parte com as unidades já registradas no progresso.
+        anytime_path = os.path.join(self.output_dir, f"{part_name}_anytime_results.csv")
+        has_anytime = any(scenario['algorithm'].anytime for scenario in scenarios)
+        anytime_file = nullcontext()
+        if has_anytime:
+            self._prepare_anytime(anytime_path, None if fresh else done)
+            anytime_file = open(anytime_path, 'a', newline='', encoding='utf-8')
+
+        # Um só pool para a parte inteira (a amostragem adaptativa o usa a cada rodada).
+        pool = ProcessPoolExecutor(max_workers=self.jobs) if self.jobs > 1 else nullcontext()
+        sampler = None
+        with csvfile, open(progress_path, 'a', encoding='utf-8') as progress, pool as executor, \
+                anytime_file as anytime_out, open(searches_path, 'a', encoding='utf-8') as searches_log:
+            writer = csv.DictWriter(csvfile, fieldnames=self.headers)
+            anytime_writer = csv.DictWriter(anytime_out, fieldnames=ANYTIME_HEADERS) if anytime_out else None
+            _sync(csvfile)
+            hits = executed = exceeded = 0
+            if self.adaptive:
+                sampler = SequentialSampler(len(scenarios), self.adaptive['targets'], self.adaptive['min_runs'])
+                results = self._execute_adaptive(units, scenarios, sampler, done, previous_rows, executor,
+                                                 recorded, searches_log)
+            else:
+                results = self._execute(units, executor, done, recorded, searches_log)
+            for unit, rows, hit, search_run_id, profile in results:
+                hits += hit
+                executed += 1
+                if search_run_id != unit[0]:
+                    origin = f", busca do run_id {search_run_id}"
+                else:
+                    origin = ', cache' if hit else ''
+                if rows[0]['outcome'].startswith('budget_'):
+                    exceeded += 1
+                    origin += f", orçamento esgotado ({rows[0]['outcome'][len('budget_'):]})"
+                print(f"    Concluído (run_id {unit[0]}{origin}): {_describe_unit(unit)}")
+                if profile:
+                    anytime_writer.writerows(profile)
+                    _sync(anytime_out)
+                writer.writerows(rows)
+                store.append(rows)
+                # As linhas vão para o disco antes do registro que as dá por concluídas.
+                _sync(csvfile)
+                progress.write(f"{unit[0]} {csvfile.tell()}\n")
+                _sync(progress)
+            store.flush()
+
+        if self.cache_path and not self.instrument and executed:
+            print(f"  Cache: {hits} de {executed} unidades reaproveitadas ({100 * hits / executed:.1f}%).")
+        if exceeded:
+            print(f"  Orçamento: {exceeded} de {executed} unidades interrompidas (outcome 'budget_*' no CSV).")
+        if sampler is not None:
+            convergence_path = os.path.join(self.output_dir, f"{part_name}_convergence.csv")
+            self._write_convergence(convergence_path, scenarios, sampler)
+            sampled = sum(sampler.runs[s] * scenario.get('executions', 1) for s, scenario in enumerate(scenarios))
+            converged = sum(sampler.converged(s, _cost_functions(scenario)) for s, scenario in enumerate(scenarios))
+            print(f"  Amostragem adaptativa: {sampled} de {len(units)} unidades necessárias; "
+                  f"{converged} de {len(scenarios)} cenários atingiram os alvos ({convergence_path}).")
+        if has_anytime:
+            print(f"  Perfil das buscas anytime salvo em {anytime_path}.")
+        print(f"--- Experimento {part_name} concluído. Resultados salvos em {filepath} e {store_path} ---")
+
+    @staticmethod
+    def _load_manifest(manifest_path: str, scenarios: List[Dict], num_runs: int, puzzle_size: int,
+                       headers: List[str], adaptive: Optional[Dict] = None,
+                       budget: Optional[Dict] = None) -> Optional[Dict]:
+        """Lê o manifesto de uma execução anterior; None se não houver nenhum."""
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if (manifest['scenarios'] != [_scenario_key(scenario) for scenario in scenarios]
+                or manifest['num_runs'] != num_runs or manifest['puzzle_size'] != puzzle_size
+                or manifest.get('columns', HEADERS) != headers or manifest.get('adaptive') != adaptive
+                or manifest.get('budget', {}) != (budget or {})):
+            raise ValueError(f"O manifesto {manifest_path} foi gerado com outra configuração; "
+                             f"execute sem resume para recomeçar.")
+        return manifest
+
+    @staticmethod
+    def _read_progress(progress_path: str) -> Tuple[int, Optional[int]]:
+        """
+        Retorna quantas unidades estão concluídas e o tamanho do CSV depois da
+        última delas. As unidades são gravadas em ordem, então as concluídas
+        formam sempre um prefixo; uma última linha incompleta é ignorada.
+        """
+        done, offset = 0, None
+        if os.path.exists(progress_path):
+            with open(progress_path, encoding='utf-8') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) != 2 or not line.endswith('\n'):
+                        break
+                    done, offset = int(fields[0]), int(fields[1])
+        return done, offset
+
+    @staticmethod
+    def _read_rows(filepath: str) -> Dict[int, List[Dict[str, str]]]:
+        """Linhas já gravadas no CSV, agrupadas por run_id."""
+        rows: Dict[int, List[Dict[str, str]]] = {}
+        with open(filepath, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                rows.setdefault(int(row['run_id']), []).append(row)
+        return rows
+
+    @staticmethod
+    def _load_searches(path: str, done: int) -> Dict[int, Tuple[Dict[str, Any], bool]]:
+        """
+        Resultados gravados no registro de buscas por unidades até o run_id
+        `done`, que ainda servem a unidades equivalentes não concluídas. O
+        registro é reescrito só com eles (e só com linhas completas).
+        """
+        recorded: Dict[int, Tuple[Dict[str, Any], bool]] = {}
+        lines = []
+        if done and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    entry = json.loads(line)
+                    if entry['run_id'] <= done:
+                        recorded[entry['run_id']] = entry['result'], entry['hit']
+                        lines.append(line)
+        _write_atomic(path, ''.join(lines))
+        return recorded
+
+    @staticmethod
+    def _prepare_anytime(path: str, done: Optional[int]):
+        """
+        Deixa o CSV do perfil anytime pronto para receber linhas: novo, só com
+        o cabeçalho (`done` None), ou, ao retomar, só com as linhas completas
+        das unidades até o run_id `done`.
+        """
+        lines = []
+        if done is not None and os.path.exists(path):
+            with open(path, newline='', encoding='utf-8') as f:
+                lines = [line for line in f.readlines()[1:] if line.endswith('\n')]
+            lines = [line for line, row in zip(lines, csv.reader(lines)) if int(row[0]) <= done]
+        header = io.StringIO()
+        csv.writer(header).writerow(ANYTIME_HEADERS)
+        _write_atomic(path, header.getvalue() + ''.join(lines))
+
+    @staticmethod
+    def _write_convergence(path: str, scenarios: List[Dict], sampler: SequentialSampler):
+        """Grava o IC alcançado por cenário, função de custo e métrica."""
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=CONVERGENCE_HEADERS, lineterminator='\n')
+        writer.writeheader()
+        for s, scenario in enumerate(scenarios):
+            base = {'scenario': s, 'algorithm': scenario['algorithm'].__name__,
+                    'cost_type': scenario.get('cost_type') or 'N/A', 'heuristic': scenario.get('heuristic') or 'N/A',
+                    'random_successors': scenario.get('random_successors', False)}
+            writer.writerows({**base, **row} for row in sampler.summary(s, _cost_functions(scenario)))
+        _write_atomic(path, output.getvalue())
+
+    @staticmethod
+    def _sample_states(num_runs: int, puzzle_size: int, master_seed: int) -> List[State]:
+        """
+        Sorteia os estados iniciais a partir da semente mestre. Todas as partes
+        usam a mesma sequência, então uma parte com `num_runs` estados recebe
+        os primeiros estados de qualquer outra do mesmo tamanho de tabuleiro, e
+        as buscas determinísticas repetidas entre partes (UCS nas Partes 1 e 2,
+        A* nas Partes 2 e 3) são reaproveitadas pelo ResultCache.
+        """
+        state_rng = random.Random(f"{master_seed}:states")
+        return [generate_random_state(puzzle_size, state_rng) for _ in range(num_runs)]
+
+    @staticmethod
+    def _build_units(initial_states: List[State], scenarios: List[Dict], puzzle_size: int,
+                     master_seed: int) -> List[Tuple[int, State, Dict, int, int]]:
+        """
+        Enumera as unidades na ordem da execução serial; o run_id de cada
+        unidade é a sua posição nessa ordem.
+        """
+        units = []
+        for i, initial_state in enumerate(initial_states):
+            for s, scenario in enumerate(scenarios):
+                for exec_count in range(scenario.get('executions', 1)):
+                    seed = unit_seed(master_seed, i, s, exec_count)
+                    units.append((len(units) + 1, initial_state, scenario, puzzle_size, seed))
+        return units
+
+    def _plan(self, units: List[Tuple[int, State, Dict, int, int]]) -> Dict[int, int]:
+        """
+        Agrupa as unidades que fariam exatamente a mesma busca e retorna, para
+        cada run_id, o run_id da primeira unidade do grupo, a única executada.
+
+        Duas unidades são equivalentes quando têm a mesma chave do ResultCache:
+        mesmo estado, algoritmo, opções e os parâmetros do problema listados em
+        `search_parameters` do algoritmo (BFS e DFS, por exemplo, ignoram o
+        custo). Com sucessores aleatórios a semente também entra na chave, então
+        só se juntam unidades que compartilham a semente, e os limites de
+        orçamento precisam ser os mesmos.
+        """
+        first: Dict[Tuple[str, str], int] = {}
+        return {unit[0]: first.setdefault((ResultCache.problem_key(unit[1], unit[2], unit[4]),
+                                           str(sorted(budget_limits(unit[2], self.budget).items()))), unit[0])
+                for unit in units}
+
+    def _execute(self, units: List[Tuple[int, State, Dict, int, int]],
+                 executor: Optional[ProcessPoolExecutor] = None, done: int = 0,
+                 recorded: Optional[Dict[int, Tuple[Dict[str, Any], bool]]] = None, searches_log=None):
+        """
+        Gera (unidade, linhas, acerto do cache, run_id da busca, linhas do
+        perfil anytime) na ordem das unidades com run_id maior que `done`. Cada
+        busca distinta do plano roda uma vez e suas linhas são replicadas para
+        as unidades equivalentes, com o tempo medido na busca original e
+        `search_run_id` apontando para ela. Com um `executor`, cada busca
+        é uma tarefa separada do pool (sem lotes, para que uma célula cara não
+        atrase as demais), as sem heurística são enviadas primeiro e os
+        resultados que chegam fora de ordem esperam em um buffer.
+
+        O plano cobre todas as `units`, inclusive as já concluídas, para que
+        uma execução retomada aponte para as mesmas buscas da original. O
+        resultado de uma busca que ainda serve a unidades seguintes é gravado
+        em `searches_log` antes das linhas da unidade; ao retomar, `recorded`
+        traz esses resultados, e só as buscas sem resultado gravado rodam.
+        """
+        plan = self._plan(units)
+        recorded = recorded or {}
+        remaining = [unit for unit in units if unit[0] > done]
+        # Quantas unidades ainda vão usar cada resultado, para liberá-lo depois da última.
+        pending = Counter(plan[unit[0]] for unit in remaining)
+        if len(pending) < len(remaining):
+            print(f"  Plano: {len(pending)} buscas distintas para {len(remaining)} unidades.")
+        searches = [unit for unit in units if unit[0] in pending and unit[0] not in recorded]
+        results: Dict[int, Tuple[Dict[str, Any], bool]] = {run_id: recorded[run_id] for run_id in pending
+                                                           if run_id in recorded}
+        search = partial(search_unit, cache_path=self.cache_path, instrument=self.instrument,
+                         trace_memory=self.trace_memory, budget=self.budget)
+
+        def rows_for(unit, get_result):
+            search_run_id = plan[unit[0]]
+            searched = search_run_id not in results
+            if searched:
+                results[search_run_id] = get_result(search_run_id)
+            result, hit = results[search_run_id]
+            pending[search_run_id] -= 1
+            if not pending[search_run_id]:
+                del results[search_run_id]
+            elif searched and searches_log is not None:
+                searches_log.write(json.dumps({'run_id': search_run_id, 'hit': hit, 'result': result}) + '\n')
+                _sync(searches_log)
+            return unit, unit_rows(unit, result, search_run_id), hit, search_run_id, anytime_rows(unit, result)
+
+        if executor is None:
+            by_run_id = {unit[0]: unit for unit in searches}
+            for unit in remaining:
+                yield rows_for(unit, lambda run_id: search(by_run_id[run_id]))
+            return
+
+        order = sorted(searches, key=lambda unit: unit[2]['algorithm'].__name__ not in UNINFORMED_ALGORITHMS)
+        futures = {unit[0]: executor.submit(search, unit) for unit in order}
+        for unit in remaining:
+            yield rows_for(unit, lambda run_id: futures.pop(run_id).result())
+
+    def _execute_adaptive(self, units: List[Tuple[int, State, Dict, int, int]], scenarios: List[Dict],
+                          sampler: SequentialSampler, done: int, previous_rows: Dict[int, List[Dict[str, str]]],
+                          executor: Optional[ProcessPoolExecutor] = None,
+                          recorded: Optional[Dict[int, Tuple[Dict[str, Any], bool]]] = None, searches_log=None):
+        """
+        Como `_execute`, mas rodada a rodada (uma rodada é um estado inicial):
+        antes de cada rodada, os cenários que já atingiram os alvos do
+        `sampler` saem, e as unidades deles não são executadas. As primeiras
+        `min_runs` rodadas, em que nenhum cenário pode parar, vão juntas ao
+        pool. Unidades com run_id <= `done` (de uma execução retomada) não são
+        refeitas: suas linhas gravadas alimentam o `sampler`, o que reproduz as
+        decisões da execução original, e `recorded` e `searches_log` são os
+        de `_execute`.
+        """
+        scenario_index = {id(scenario): s for s, scenario in enumerate(scenarios)}
+        per_round = sum(scenario.get('executions', 1) for scenario in scenarios)
+        rounds = [units[start:start + per_round] for start in range(0, len(units), per_round)]
+
+        def active(round_units):
+            return [unit for unit in round_units
+                    if not sampler.converged(scenario_index[id(unit[2])], _cost_functions(unit[2]))]
+
+        r = 0
+        while r < len(rounds):
+            span = max(sampler.min_runs - r, 1)
+            batch = [active(round_units) for round_units in rounds[r:r + span]]
+            if not batch[0]:
+                break  # Todos os cenários convergiram; os que param não voltam a receber amostras.
+            results = self._execute([unit for round_units in batch for unit in round_units], executor,
+                                    done, recorded, searches_log)
+            for round_units in batch:
+                for unit in round_units:
+                    if unit[0] <= done:
+                        sampler.add(scenario_index[id(unit[2])], previous_rows[unit[0]])
+                        continue
+                    item = next(results)
+                    sampler.add(scenario_index[id(unit[2])], item[1])
+                    yield item
+                sampler.end_round()
+            r += span
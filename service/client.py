@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+Gerador de carga para o service.server.
+
+Abre `--connections` conexões, e cada uma envia pedidos `solve` um após o
+outro até o total de `--requests`. Os estados são sorteados (com semente)
+entre `--distinct` estados aleatórios, de modo que pedidos repetidos
+exercitam o LRU e a junção de buscas em andamento. Ao final mostra a vazão,
+os percentis de latência vistos pelo cliente e o `stats` do servidor.
+
+Uso:
+    python -m service.client [--port 8765 | --unix /tmp/puzzle.sock] [--requests 500]
+        [--connections 8] [--distinct 100] [--algorithm AStarSearch] [--cost C3] [--heuristic H2]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from statistics import quantiles
+from typing import Any, Dict, List, Optional, Tuple
+
+from service.server import DEFAULT_HOST, DEFAULT_PORT
+from utils.puzzle_utils import generate_random_state
+
+
+async def _connect(host: str, port: int, unix_path: Optional[str]):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  message: Dict[str, Any]) -> Dict[str, Any]:
+    """Envia um pedido e espera a resposta (um pedido por vez na conexão)."""
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("o servidor fechou a conexão")
+    return json.loads(line)
+
+
+async def run_load(args) -> Tuple[float, List[float], Counter, Dict[str, Any]]:
+    """Executa a carga e retorna (duração, latências em ms, respostas por origem, stats do servidor)."""
+    rng = random.Random(args.seed)
+    states = [str(generate_random_state(rng=rng)) for _ in range(args.distinct)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait({'id': i, 'op': 'solve', 'state': rng.choice(states), 'algorithm': args.algorithm,
+                          'cost': args.cost, 'heuristic': args.heuristic or None, 'timeout': args.timeout})
+
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+
+    async def worker():
+        reader, writer = await _connect(args.host, args.port, args.unix)
+        try:
+            while not queue.empty():
+                message = queue.get_nowait()
+                start = time.perf_counter()
+                response = await request(reader, writer, message)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not response.get('ok'):
+                    outcomes['erro'] += 1
+                elif response['outcome'].startswith('budget_'):
+                    outcomes[response['outcome']] += 1
+                else:
+                    outcomes[response['source']] += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await _connect(args.host, args.port, args.unix)
+    server_stats = await request(reader, writer, {'op': 'stats'})
+    writer.close()
+    return elapsed, latencies, outcomes, server_stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de resolução.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="conecta neste socket Unix em vez de TCP")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--distinct', type=int, default=100, help="estados distintos sorteados")
+    parser.add_argument('--algorithm', default='AStarSearch')
+    parser.add_argument('--cost', default='C3')
+    parser.add_argument('--heuristic', default='H2', help="'' para buscar sem heurística")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=2025)
+    args = parser.parse_args(argv)
+
+    elapsed, latencies, outcomes, server_stats = asyncio.run(run_load(args))
+    print(f"{len(latencies)} pedidos em {elapsed:.2f} s: {len(latencies) / elapsed:,.1f} pedidos/s "
+          f"com {args.connections} conexão(ões)")
+    if len(latencies) >= 2:
+        cuts = quantiles(latencies, n=100, method='inclusive')
+        print(f"Latência no cliente: p50 {cuts[49]:.2f} ms, p90 {cuts[89]:.2f} ms, "
+              f"p99 {cuts[98]:.2f} ms, máx {max(latencies):.2f} ms")
+    print("Origem das respostas: " + ", ".join(f"{name} {count}" for name, count in sorted(outcomes.items())))
+    print("Servidor: " + json.dumps(server_stats))
+
+
+if __name__ == '__main__':
+    main()
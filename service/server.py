@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+
+"""
+Serviço local de resolução do quebra-cabeça deslizante, com JSON por linha.
+
+Cada linha recebida é um objeto JSON e recebe uma linha de resposta com o
+mesmo `id` (as respostas podem sair fora de ordem):
+
+    {"id": 1, "op": "solve", "state": "1234_5678", "algorithm": "AStarSearch",
+     "cost": "C3", "heuristic": "H2", "timeout": 5}
+    {"id": 2, "op": "stats"}
+    {"id": 3, "op": "ping"}
+
+O estado pode ser uma string de dígitos (com '_' ou '0' no espaço vazio,
+como no CSV do runner) ou uma lista de inteiros. As buscas rodam em um
+pool de processos que carrega as tabelas uma vez e as mantém quentes entre
+pedidos. Pedidos iguais em andamento compartilham a mesma busca, e as
+soluções recentes ficam em um LRU. Com `max_pending` buscas pendentes, o
+servidor para de ler novos pedidos até uma delas terminar (contrapressão
+pelo próprio socket).
+
+O `timeout` do pedido vira o prazo da busca (algorithms.budget), contado
+desde a chegada do pedido, então o processo também para de buscar quando ele
+se esgota, mesmo que a busca ainda estivesse na fila do pool. Com
+`max_nodes`, cada busca também para ao gerar esse número de nós. Uma busca
+interrompida responde com `outcome` 'budget_<motivo>' e sem caminho (as
+anytime, com a melhor solução que tinham), e não entra no LRU. Um pedido que se junta a uma busca em andamento fica com o
+prazo de quem a iniciou, limitado pelo seu próprio `timeout` (mais uma
+pequena folga para a resposta chegar do processo). Nos
+tabuleiros maiores que 3x3, só são aceitas buscas com heurística: as sem
+ela percorreriam uma fração enorme do espaço de estados.
+
+Uso:
+    python -m service.server [--port 8765 | --unix /tmp/puzzle.sock] [--jobs N] [--max-nodes N]
+    python -m service.client --requests 500 --connections 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from statistics import quantiles
+from typing import Any, Dict, List, Optional, Tuple
+
+import algorithms
+from core.state import State
+from problem.eight_puzzle import EightPuzzleProblem
+from problem.sliding_puzzle import COST_TYPES, PuzzleTables, SlidingPuzzleProblem
+from problem.state_space import StateSpace
+from algorithms.budget import SearchBudget
+from utils.puzzle_utils import is_solvable
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+HEURISTICS = (None, 'H1', 'H2', 'H*')
+# Latências guardadas para os percentis do `stats` (as mais recentes).
+LATENCY_WINDOW = 10_000
+# Folga além do `timeout` para a resposta da busca interrompida chegar do
+# processo (o orçamento só é conferido a cada `check_interval` expansões).
+RESPONSE_GRACE_SEC = 0.5
+# Valores de `outcome` nas respostas (os mesmos da coluna do runner).
+OUTCOME_SOLVED = 'solved'
+OUTCOME_NO_SOLUTION = 'no_solution'
+
+# (tamanho, código do estado, algoritmo, custo, heurística)
+SolveKey = Tuple[int, int, str, str, Optional[str]]
+
+
+class RequestError(ValueError):
+    """Pedido malformado; vira uma resposta de erro sem derrubar a conexão."""
+
+
+def parse_state(value: Any) -> State:
+    """Aceita '1234_5678', '123405678' ou [1, 2, 3, 4, 0, 5, 6, 7, 8]."""
+    if isinstance(value, str):
+        text = value.replace('_', '0')
+        try:
+            board = tuple(map(int, text.split(','))) if ',' in text else tuple(map(int, text))
+        except ValueError:
+            raise RequestError(f"estado inválido: {value!r}") from None
+    elif isinstance(value, list) and all(isinstance(tile, int) for tile in value):
+        board = tuple(value)
+    else:
+        raise RequestError("'state' deve ser uma string de dígitos ou uma lista de inteiros")
+    if sorted(board) != list(range(len(board))):
+        raise RequestError(f"estado inválido: {value!r}")
+    try:
+        state = State(board)
+    except ValueError as e:
+        raise RequestError(str(e)) from None
+    if not is_solvable(board):
+        raise RequestError(f"estado sem solução: {value!r}")
+    return state
+
+
+def _warm_worker(dense: bool):
+    """Inicializador dos processos: constrói as tabelas antes do primeiro pedido."""
+    PuzzleTables.get(3)
+    if dense:
+        StateSpace.get()
+
+
+def _budget_result(reason: str, nodes_generated: int = 0, nodes_visited: int = 0,
+                   elapsed: float = 0.0) -> Dict[str, Any]:
+    """Resposta de uma busca interrompida pelo orçamento (ou que nem chegou a começar)."""
+    return {'actions': None, 'path_length': None, 'path_cost': None, 'outcome': f"budget_{reason}",
+            'nodes_generated': nodes_generated, 'nodes_visited': nodes_visited,
+            'search_time_sec': round(elapsed, 6)}
+
+
+def solve_job(board: Tuple[int, ...], algorithm: str, cost_type: str, heuristic: Optional[str],
+              dense: bool, deadline: float = float('inf'), max_nodes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Executa uma busca em um processo do pool e retorna o resultado
+    serializável. `deadline` é um instante de time.time(): o tempo que a
+    busca esperou na fila já sai do seu orçamento.
+    """
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        return _budget_result('time')
+    state = State(board)
+    if state.size == 3:
+        problem = EightPuzzleProblem(state, cost_type, heuristic, dense=dense)
+    else:
+        problem = SlidingPuzzleProblem(state, cost_type, heuristic)
+    search = getattr(algorithms, algorithm)()
+    search.set_budget(SearchBudget(max_seconds=None if remaining == float('inf') else remaining,
+                                   max_nodes=max_nodes))
+    start = time.perf_counter()
+    node = search.search(problem)
+    elapsed = time.perf_counter() - start
+    if node is None and search.budget_exceeded is not None:
+        return _budget_result(search.budget_exceeded, search.nodes_generated, search.nodes_visited, elapsed)
+
+    actions = None
+    if node is not None:
+        actions = []
+        path_node = node
+        while path_node.parent is not None:
+            actions.append(path_node.action)
+            path_node = path_node.parent
+        actions.reverse()
+    return {
+        'actions': actions,
+        'path_length': len(actions) if actions is not None else None,
+        'path_cost': float(node.path_cost) if node is not None else None,
+        # Uma busca anytime interrompida traz a melhor solução que tinha, com o motivo da parada.
+        'outcome': (f"budget_{search.budget_exceeded}" if search.budget_exceeded is not None
+                    else OUTCOME_SOLVED if node is not None else OUTCOME_NO_SOLUTION),
+        'nodes_generated': search.nodes_generated,
+        'nodes_visited': search.nodes_visited,
+        'search_time_sec': round(elapsed, 6),
+    }
+
+
+class SolveService:
+    """Estado do servidor: pool de processos, LRU, buscas em andamento e métricas."""
+
+    def __init__(self, jobs: int = 1, cache_size: int = 4096, max_pending: int = 64,
+                 default_timeout: float = 30.0, dense: bool = False, max_nodes: Optional[int] = None):
+        self.jobs = jobs
+        self.cache_size = cache_size
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.dense = dense
+        self.max_nodes = max_nodes
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.cache: 'OrderedDict[SolveKey, Dict[str, Any]]' = OrderedDict()
+        self.in_flight: Dict[SolveKey, asyncio.Future] = {}
+        self.pending: Optional[asyncio.Semaphore] = None
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.counters = {'requests': 0, 'solved': 0, 'cache_hits': 0, 'coalesced': 0,
+                         'searches': 0, 'timeouts': 0, 'budget_exceeded': 0, 'errors': 0}
+        self.started = time.monotonic()
+
+    def start(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_warm_worker,
+                                            initargs=(self.dense,))
+        self.pending = asyncio.Semaphore(self.max_pending)
+        # Sobe os processos já com as tabelas prontas.
+        for _ in range(self.jobs):
+            self.executor.submit(int)
+        _warm_worker(self.dense)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _remember(self, key: SolveKey, result: Dict[str, Any]):
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _search(self, key: SolveKey, state: State, deadline: float) -> asyncio.Future:
+        """Inicia a busca de `key` no pool com o prazo `deadline`, ou retorna a que já está em andamento."""
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.counters['coalesced'] += 1
+            return future
+        self.counters['searches'] += 1
+        _, _, algorithm, cost_type, heuristic = key
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, solve_job, state.board, algorithm, cost_type, heuristic, self.dense,
+            deadline, self.max_nodes)
+        self.in_flight[key] = future
+
+        def done(f: asyncio.Future):
+            del self.in_flight[key]
+            # Buscas interrompidas pelo orçamento não entram no LRU: com mais prazo, teriam resposta.
+            if not f.cancelled() and f.exception() is None and not f.result()['outcome'].startswith('budget_'):
+                self._remember(key, f.result())
+        future.add_done_callback(done)
+        return future
+
+    async def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        state = parse_state(request.get('state'))
+        algorithm = request.get('algorithm', 'AStarSearch')
+        if algorithm not in algorithms.__all__:
+            raise RequestError(f"algoritmo desconhecido: {algorithm!r}")
+        cost_type = request.get('cost', 'C1')
+        if cost_type not in COST_TYPES:
+            raise RequestError(f"custo desconhecido: {cost_type!r}")
+        heuristic = request.get('heuristic')
+        if heuristic not in HEURISTICS:
+            raise RequestError(f"heurística desconhecida: {heuristic!r}")
+        if state.size > 3 and ('heuristic' not in getattr(algorithms, algorithm).search_parameters
+                               or heuristic is None):
+            raise RequestError(f"{algorithm} sem heurística não é aceito em tabuleiros "
+                               f"{state.size}x{state.size}; use uma busca informada com 'heuristic'")
+        try:
+            timeout = float(request.get('timeout', self.default_timeout))
+        except (TypeError, ValueError):
+            raise RequestError("'timeout' deve ser um número de segundos") from None
+        if not timeout > 0:
+            raise RequestError("'timeout' deve ser positivo")
+        deadline = time.time() + timeout
+
+        key = (state.size, state.code, algorithm, cost_type, heuristic)
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.counters['cache_hits'] += 1
+            return {**result, 'source': 'cache'}
+
+        source = 'coalesced' if key in self.in_flight else 'search'
+        try:
+            # shield: o timeout de um pedido não cancela a busca compartilhada com outros;
+            # ela para sozinha no prazo de quem a iniciou.
+            result = await asyncio.wait_for(asyncio.shield(self._search(key, state, deadline)),
+                                            timeout + RESPONSE_GRACE_SEC)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            result = _budget_result('time')
+        except Exception as e:  # Erro dentro da busca (por exemplo, H* fora do 3x3)
+            raise RequestError(f"falha na busca: {e}") from None
+        if result['outcome'].startswith('budget_'):
+            self.counters['budget_exceeded'] += 1
+        return {**result, 'source': source}
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores, percentis de latência (ms) dos pedidos `solve` e ocupação."""
+        latencies = sorted(self.latencies)
+        percentiles = {}
+        if len(latencies) >= 2:
+            cuts = quantiles(latencies, n=100, method='inclusive')
+            percentiles = {'p50_ms': cuts[49], 'p90_ms': cuts[89], 'p99_ms': cuts[98]}
+        elif latencies:
+            percentiles = {'p50_ms': latencies[0], 'p90_ms': latencies[0], 'p99_ms': latencies[0]}
+        if latencies:
+            percentiles['max_ms'] = latencies[-1]
+        return {
+            **self.counters,
+            **{name: round(value, 3) for name, value in percentiles.items()},
+            'in_flight': len(self.in_flight),
+            'cache_entries': len(self.cache),
+            'workers': self.jobs,
+            'uptime_sec': round(time.monotonic() - self.started, 1),
+        }
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Responde um pedido; erros viram `{"ok": false, "error": ...}`."""
+        op = request.get('op', 'solve')
+        start = time.perf_counter()
+        self.counters['requests'] += 1
+        try:
+            if op == 'solve':
+                response = await self.solve(request)
+                self.counters['solved'] += 1
+                self.latencies.append((time.perf_counter() - start) * 1000)
+            elif op == 'stats':
+                response = self.stats()
+            elif op == 'ping':
+                response = {}
+            else:
+                raise RequestError(f"operação desconhecida: {op!r}")
+            response['ok'] = True
+        except RequestError as e:
+            self.counters['errors'] += 1
+            response = {'ok': False, 'error': str(e)}
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Lê pedidos de uma conexão e responde cada um assim que fica pronto."""
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(request: Optional[Dict[str, Any]]):
+            try:
+                if request is None:
+                    self.counters['requests'] += 1
+                    self.counters['errors'] += 1
+                    response = {'ok': False, 'error': "a linha não é um objeto JSON"}
+                else:
+                    response = await self.handle(request)
+                async with write_lock:
+                    writer.write(json.dumps(response).encode() + b'\n')
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                self.pending.release()
+
+        try:
+            while True:
+                # Contrapressão: sem vaga, a conexão não é lida até uma busca terminar.
+                await self.pending.acquire()
+                line = await reader.readline()
+                if not line:
+                    self.pending.release()
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    request = None
+                task = asyncio.create_task(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service: SolveService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                unix_path: Optional[str] = None):
+    """Sobe o servidor TCP (ou no socket Unix) e atende até ser interrompido."""
+    service.start()
+    try:
+        if unix_path:
+            server = await asyncio.start_unix_server(service.serve_connection, path=unix_path)
+            where = unix_path
+        else:
+            server = await asyncio.start_server(service.serve_connection, host, port)
+            where = f"{host}:{port}"
+        print(f"Servindo em {where} com {service.jobs} processo(s) de busca.", flush=True)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        if unix_path and os.path.exists(unix_path):
+            os.unlink(unix_path)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serviço de resolução do 8-Puzzle (JSON por linha).")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="escuta neste socket Unix em vez de TCP")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="processos de busca (padrão: número de CPUs)")
+    parser.add_argument('--cache-size', type=int, default=4096, help="soluções mantidas no LRU")
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help="pedidos em andamento antes de parar de ler as conexões")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="tempo limite padrão por pedido (s), também aplicado à busca")
+    parser.add_argument('--max-nodes', type=int, help="nós gerados por busca antes de interrompê-la")
+    parser.add_argument('--dense', action='store_true', help="usa o modo denso do 8-Puzzle nas buscas")
+    args = parser.parse_args(argv)
+
+    service = SolveService(jobs=args.jobs, cache_size=args.cache_size, max_pending=args.max_pending,
+                           default_timeout=args.timeout, dense=args.dense, max_nodes=args.max_nodes)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from algorithms import DepthFirstBranchAndBound, DepthFirstSearch
+from algorithms.budget import SearchBudget
+from core.state import State
+from problem.eight_puzzle import EightPuzzleProblem
+
+
+@pytest.mark.parametrize('dense', [False, True])
+def test_time_budget_is_checked_on_depth_cutoff_pops(dense):
+    # Com limite de profundidade 1 só a raiz é expandida; as demais retiradas são cortes.
+    problem = EightPuzzleProblem(State((8, 6, 7, 2, 5, 4, 3, 0, 1)), 'C1', dense=dense)
+    search = DepthFirstSearch(depth_limit=1)
+    search.set_budget(SearchBudget(max_seconds=0, check_interval=2))
+
+    assert search.search(problem) is None
+    assert search.budget_exceeded == 'time'
+    assert search.nodes_visited == 1
+
+
+def test_interrupted_branch_and_bound_returns_its_incumbent():
+    # Com 14000 nós a DFBnB já achou soluções, mas ainda não provou a ótima (custo 48).
+    problem = EightPuzzleProblem(State((0, 5, 2, 8, 6, 7, 3, 4, 1)), 'C1', 'H2')
+    search = DepthFirstBranchAndBound()
+    search.set_budget(SearchBudget(max_nodes=14000, check_interval=1))
+
+    node = search.search(problem)
+
+    assert search.budget_exceeded == 'nodes'
+    assert search.solutions_found >= 1
+    assert node is not None and problem.is_goal(node.state)
+    assert node.path_cost == search.solutions[-1]['path_cost'] > 48
+    assert search.solutions[-1]['suboptimality_bound'] > 1
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+from algorithms import AStarSearch
+from algorithms.idastar import IterativeDeepeningAStar
+from core.state import State
+from problem.eight_puzzle import EightPuzzleProblem
+
+
+def test_inverse_moves_are_pruned_before_generation():
+    state = State((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    search = IterativeDeepeningAStar()
+    node = search.search(EightPuzzleProblem(state, 'C3', 'H2'))
+
+    assert node.path_cost == AStarSearch().search(EightPuzzleProblem(state, 'C3', 'H2')).path_cost
+    # Cada nó expandido tem exatamente um movimento inverso, exceto as raízes de
+    # cada iteração; o objetivo é visitado, mas não expandido.
+    assert search.nodes_pruned == search.nodes_visited - search.iterations - 1
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import csv
+
+from utils.result_store import ResultStore, read_columns
+
+HEADERS = ['run_id', 'algorithm', 'cost_function', 'path_cost']
+
+
+def test_rebuild_keeps_every_row_of_multi_row_units(tmp_path):
+    # 5 unidades com 4 linhas cada (uma por função de custo), como a Busca Gulosa com cost_functions.
+    csv_path = tmp_path / 'Part3_results.csv'
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS)
+        writer.writeheader()
+        for run_id in range(1, 6):
+            for cost in ('C1', 'C2', 'C3', 'C4'):
+                writer.writerow({'run_id': run_id, 'algorithm': 'GreedySearch',
+                                 'cost_function': cost, 'path_cost': run_id})
+
+    store_path = str(tmp_path / 'Part3_columns')
+    ResultStore.rebuild_from_csv(store_path, str(csv_path), HEADERS, batch_rows=3)
+
+    df = read_columns(store_path)
+    assert len(df) == 20
+    assert df['run_id'].tolist() == [run_id for run_id in range(1, 6) for _ in range(4)]
+
+
+def test_append_after_rebuild_continues_the_batch_sequence(tmp_path):
+    store_path = str(tmp_path / 'Part1_columns')
+    store = ResultStore.create(store_path, HEADERS, batch_rows=2)
+    store.append([{'run_id': 1, 'algorithm': 'BFS', 'cost_function': 'C1', 'path_cost': 1}] * 3)
+    store.flush()
+
+    reopened = ResultStore(store_path, HEADERS, batch_rows=2)
+    reopened.append([{'run_id': 1, 'algorithm': 'BFS', 'cost_function': 'C2', 'path_cost': 2}])
+    reopened.flush()
+
+    assert len(read_columns(store_path)) == 4
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import csv
+import io
+
+from algorithms import AStarSearch, BreadthFirstSearch
+from runner import ExperimentRunner
+
+# As três BFS fazem a mesma busca (BFS ignora o custo), então o plano roda só a primeira.
+SCENARIOS = [{'algorithm': BreadthFirstSearch, 'cost_type': cost} for cost in ('C1', 'C2', 'C3')] + \
+            [{'algorithm': AStarSearch, 'cost_type': 'C1', 'heuristic': 'H2'}]
+
+
+def _run(output_dir, resume=False):
+    with contextlib.redirect_stdout(io.StringIO()):
+        ExperimentRunner(str(output_dir), seed=3, resume=resume).run_experiment('P', SCENARIOS, 2)
+    with open(output_dir / 'P_results.csv', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_resume_reuses_searches_finished_before_the_crash(tmp_path):
+    clean = _run(tmp_path)
+    progress = tmp_path / 'P_progress.log'
+    # Simula uma queda logo depois da primeira unidade (a BFS representante do grupo).
+    progress.write_text(progress.read_text().splitlines(keepends=True)[0])
+
+    resumed = _run(tmp_path, resume=True)
+
+    assert [row['search_run_id'] for row in resumed] == [row['search_run_id'] for row in clean]
+    # As unidades equivalentes copiam o resultado gravado, inclusive o tempo da busca original.
+    assert [row['execution_time_sec'] for row in resumed[:3]] == [row['execution_time_sec'] for row in clean[:3]]
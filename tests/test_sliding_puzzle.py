@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import itertools
+import random
+
+from algorithms import AStarSearch, BreadthFirstSearch
+from core.state import State
+from problem.sliding_puzzle import PuzzleTables, SlidingPuzzleProblem, parity_class
+from utils.puzzle_utils import is_solvable
+
+
+def test_every_2x2_board_reaches_the_goal_set():
+    for board in itertools.permutations(range(4)):
+        assert is_solvable(board)
+        assert BreadthFirstSearch().search(SlidingPuzzleProblem(State(board), 'C1')) is not None
+
+
+def test_odd_width_keeps_the_inversion_parity_rule():
+    assert is_solvable((1, 2, 3, 4, 5, 6, 7, 8, 0))
+    assert not is_solvable((2, 1, 3, 4, 5, 6, 7, 8, 0))
+    assert len(PuzzleTables.get(3).goal_states) == 9
+
+
+def test_even_width_uses_only_goals_of_the_start_class():
+    rng = random.Random(1)
+    for goal_class in (0, 1):
+        state = PuzzleTables.get(4, goal_class).goal_states[0]
+        scramble = SlidingPuzzleProblem(state, 'C1')
+        for _ in range(12):
+            state = rng.choice(list(scramble.successors(state)))[1]
+        problem = SlidingPuzzleProblem(state, 'C1', 'H2')
+
+        assert len(problem.get_goal_states()) == 8
+        assert all(parity_class(goal.board) == goal_class for goal in problem.get_goal_states())
+        solution = AStarSearch().search(problem)
+        assert solution is not None and problem.get_heuristic(state) <= solution.path_cost
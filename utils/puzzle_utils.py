@@ -1,34 +1,38 @@
 # -*- coding: utf-8 -*-
 
 """
-Contém funções auxiliares para o problema do 8-Puzzle, como
+Contém funções auxiliares para o quebra-cabeça deslizante, como
 verificar se é solucionável e gerar estados aleatórios.
 """
 
 import random
+from math import isqrt
 from typing import Tuple, List
 
 from core.state import State
-from problem.eight_puzzle import EightPuzzleProblem
+from problem.sliding_puzzle import SlidingPuzzleProblem, parity_class
 
 
 def is_solvable(board: Tuple[int, ...]) -> bool:
-    """Verifica se uma configuração do 8-Puzzle é solucionável."""
-    inversions = 0
-    board_no_blank = [i for i in board if i != 0]
-    for i in range(len(board_no_blank)):
-        for j in range(i + 1, len(board_no_blank)):
-            if board_no_blank[i] > board_no_blank[j]:
-                inversions += 1
-    # Para uma grade 3x3, o número de inversões deve ser par.
-    return inversions % 2 == 0
+    """
+    Verifica se uma configuração N x N alcança algum dos objetivos do
+    problema (peças em ordem, espaço vazio em qualquer posição). Em lados
+    ímpares todos os objetivos estão na classe de paridade 0, então o número
+    de inversões deve ser par; em lados pares há objetivos nas duas classes
+    e toda configuração tem solução.
+    """
+    return isqrt(len(board)) % 2 == 0 or parity_class(board) == 0
 
 
-def generate_random_state() -> State:
-    """Gera um estado inicial aleatório e garantidamente solucionável."""
+def generate_random_state(size: int = 3, rng: random.Random | None = None) -> State:
+    """
+    Gera um estado inicial aleatório e garantidamente solucionável.
+    `rng` permite usar um gerador com semente própria em vez do módulo random.
+    """
+    rng = rng or random
     while True:
-        board = list(range(9))
-        random.shuffle(board)
+        board = list(range(size * size))
+        rng.shuffle(board)
         board_tuple = tuple(board)
         if is_solvable(board_tuple):
             return State(board_tuple)
@@ -43,25 +47,13 @@ def calculate_path_cost(path: List[State], cost_type: str) -> float:
         return 0.0
 
     total_cost = 0
-    temp_problem = EightPuzzleProblem(path[0], cost_type)
-
-    for i in range(len(path) - 1):
-        current_state = path[i]
-        next_state = path[i + 1]
-
-        blank_diff = next_state.blank_pos - current_state.blank_pos
-        action = ''
-        if blank_diff == -3:
-            action = 'CIMA'
-        elif blank_diff == 3:
-            action = 'BAIXO'
-        elif blank_diff == -1:
-            action = 'ESQUERDA'
-        elif blank_diff == 1:
-            action = 'DIREITA'
-        else:
-            continue
-
-        total_cost += temp_problem.get_cost(current_state, action)
+    temp_problem = SlidingPuzzleProblem(path[0], cost_type)
+
+    for current_state, next_state in zip(path, path[1:]):
+        # Estados não vizinhos não somam custo.
+        for _, successor, step_cost in temp_problem.successors(current_state):
+            if successor == next_state:
+                total_cost += step_cost
+                break
 
     return total_cost
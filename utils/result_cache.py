@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache persistente dos resultados de busca, em SQLite no modo WAL (vários
+processos do pool leem e gravam o mesmo arquivo).
+
+A chave é o conteúdo do problema: estado inicial, algoritmo, custo,
+heurística, opções e, quando os sucessores são aleatórios, a semente da
+unidade. Buscas determinísticas ignoram a semente, então a mesma busca
+repetida em partes diferentes é resolvida uma única vez.
+
+A versão do cache é um hash do código de algorithms/, core/ e problem/:
+qualquer mudança nas buscas, custos ou heurísticas invalida os resultados
+antigos. CACHE_VERSION permite invalidar manualmente (por exemplo, se o
+comportamento mudar por causa de uma dependência).
+"""
+
+import hashlib
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+from core.state import State
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = os.path.join("cache", "results.sqlite")
+
+# Um caractere por ação no caminho gravado.
+ACTION_LETTERS: Dict[str, str] = {'CIMA': 'C', 'BAIXO': 'B', 'ESQUERDA': 'E', 'DIREITA': 'D'}
+LETTER_ACTIONS: Dict[str, str] = {letter: action for action, letter in ACTION_LETTERS.items()}
+
+_SOURCE_DIRS = ('algorithms', 'core', 'problem')
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """Hash do código que determina o resultado de uma busca (calculado uma vez por processo)."""
+    global _code_version
+    if _code_version is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        for directory in _SOURCE_DIRS:
+            for name in sorted(os.listdir(os.path.join(root, directory))):
+                if name.endswith('.py'):
+                    digest.update(name.encode())
+                    with open(os.path.join(root, directory, name), 'rb') as f:
+                        digest.update(f.read())
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def encode_actions(actions: List[str]) -> str:
+    return "".join(ACTION_LETTERS[action] for action in actions)
+
+
+def decode_actions(path: str) -> List[str]:
+    return [LETTER_ACTIONS[letter] for letter in path]
+
+
+class ResultCache:
+    """Resultados de busca já calculados, consultados antes de `algorithm.search`."""
+
+    # Conexões abertas no processo, por caminho do arquivo.
+    _opened: Dict[str, 'ResultCache'] = {}
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.version = code_version()
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                version TEXT NOT NULL,
+                problem_key TEXT NOT NULL,
+                path TEXT,
+                path_cost REAL,
+                nodes_generated INTEGER NOT NULL,
+                nodes_visited INTEGER NOT NULL,
+                execution_time_sec REAL NOT NULL,
+                PRIMARY KEY (version, problem_key)
+            )""")
+        self.connection.commit()
+
+    @classmethod
+    def get(cls, path: str = DEFAULT_CACHE_PATH) -> 'ResultCache':
+        """Retorna a conexão do processo atual para `path`, abrindo-a na primeira chamada."""
+        if path not in cls._opened:
+            cls._opened[path] = cls(path)
+        return cls._opened[path]
+
+    @staticmethod
+    def problem_key(initial_state: State, scenario: Dict, seed: int) -> str:
+        """
+        Chave de conteúdo do problema. Custo e heurística só entram quando
+        estão em `search_parameters` do algoritmo, e a semente só quando a
+        busca é aleatória.
+        """
+        algorithm = scenario['algorithm']
+        random_succ = scenario.get('random_successors', False)
+        return "|".join(map(str, (
+            initial_state.size, initial_state.code, algorithm.__name__,
+            *(scenario.get(name) if name in algorithm.search_parameters else None
+              for name in ('cost_type', 'heuristic')),
+            random_succ,
+            scenario.get('dense', False), sorted(scenario.get('options', {}).items()),
+            seed if random_succ else None,
+        )))
+
+    def lookup(self, key: str) -> Optional[Tuple[Optional[List[str]], Optional[float], int, int, float]]:
+        """Retorna (ações ou None, custo, gerados, visitados, tempo) ou None se não houver registro."""
+        row = self.connection.execute(
+            "SELECT path, path_cost, nodes_generated, nodes_visited, execution_time_sec "
+            "FROM results WHERE version = ? AND problem_key = ?", (self.version, key)).fetchone()
+        if row is None:
+            return None
+        path, path_cost, nodes_generated, nodes_visited, execution_time = row
+        actions = decode_actions(path) if path is not None else None
+        return actions, path_cost, nodes_generated, nodes_visited, execution_time
+
+    def store(self, key: str, actions: Optional[List[str]], path_cost: Optional[float],
+              nodes_generated: int, nodes_visited: int, execution_time: float):
+        """Grava um resultado; `actions` é None quando a busca não encontrou solução."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.version, key, encode_actions(actions) if actions is not None else None,
+                 path_cost, nodes_generated, nodes_visited, execution_time))
+
+    def prune(self) -> int:
+        """Remove os resultados de versões anteriores do código e retorna quantos foram removidos."""
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM results WHERE version != ?", (self.version,))
+        return cursor.rowcount
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""
+Armazenamento colunar e tipado dos resultados dos experimentos.
+
+Cada parte ganha um diretório `<Parte>_columns/` com um `schema.json` e
+lotes `batch_<sequência>.npz` (NumPy, sem compressão), numerados na ordem
+de gravação. Dentro de um lote, cada coluna é um vetor:
+- inteiros em int64 e reais em float64;
+- textos como categorias: códigos int32 em `<coluna>` e os valores em
+  `<coluna>.categories` (código -1 = nulo);
+- colunas que podem ser nulas têm também a máscara `<coluna>.mask`.
+
+As sentinelas do CSV ('inf', 'None', 'N/A') viram nulos explícitos, e uma
+busca que falhou continua presente, com custo e comprimento nulos. Ao ler,
+só as colunas pedidas são carregadas dos arquivos, já como tipos do pandas
+(Int64/Float64 anuláveis, boolean e category).
+
+O CSV continua sendo a saída de referência do runner (é ele que a retomada
+usa); o diretório colunar pode sempre ser refeito a partir dele.
+"""
+
+import csv
+import glob
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Tipo de cada coluna conhecida; as demais são gravadas como categorias.
+COLUMN_TYPES: Dict[str, str] = {
+    'run_id': 'int',
+    'initial_state': 'category',
+    'algorithm': 'category',
+    'cost_function': 'category',
+    'heuristic': 'category',
+    'random_successors': 'bool',
+    'goal_state_found': 'category',
+    'path_length': 'int',
+    'path_cost': 'float',
+    'nodes_generated': 'int',
+    'nodes_visited': 'int',
+    'execution_time_sec': 'float',
+    'search_run_id': 'int',
+    'outcome': 'category',
+    'solution': 'int',
+    'time_sec': 'float',
+    'weight': 'float',
+    'suboptimality_bound': 'float',
+    'nodes_pruned': 'int',
+    'peak_frontier': 'int',
+    'peak_closed': 'int',
+    'stale_pops': 'int',
+    'reopenings': 'int',
+    'time_successors_sec': 'float',
+    'time_heuristic_sec': 'float',
+    'time_queue_sec': 'float',
+    'peak_memory_bytes': 'int',
+}
+
+# Valores que o CSV usa no lugar de um nulo.
+NULL_SENTINELS = frozenset({'', 'inf', 'None', 'N/A'})
+
+# Linhas acumuladas antes de gravar um lote.
+DEFAULT_BATCH_ROWS = 4096
+
+
+def columns_path(results_dir: str, part_name: str) -> str:
+    """Diretório colunar de uma parte."""
+    return os.path.join(results_dir, f"{part_name}_columns")
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value in NULL_SENTINELS) or \
+        (isinstance(value, float) and (value != value or value == float('inf')))
+
+
+def _encode_column(kind: str, values: List[Any]) -> Dict[str, np.ndarray]:
+    """Converte os valores de uma coluna em vetores NumPy (valores, máscara de nulos, categorias)."""
+    mask = np.fromiter((_is_null(v) for v in values), dtype=bool, count=len(values))
+    arrays = {}
+    if kind == 'category':
+        categories: Dict[str, int] = {}
+        codes = np.fromiter((-1 if null else categories.setdefault(str(v), len(categories))
+                             for v, null in zip(values, mask)), dtype=np.int32, count=len(values))
+        arrays[''] = codes
+        arrays['.categories'] = np.array(list(categories), dtype=str)
+        return arrays
+    if kind == 'bool':
+        data = np.fromiter((not null and (v is True or v == 'True') for v, null in zip(values, mask)),
+                           dtype=bool, count=len(values))
+    elif kind == 'int':
+        data = np.fromiter((0 if null else int(float(v)) for v, null in zip(values, mask)),
+                           dtype=np.int64, count=len(values))
+    else:
+        data = np.fromiter((np.nan if null else float(v) for v, null in zip(values, mask)),
+                           dtype=np.float64, count=len(values))
+    arrays[''] = data
+    if mask.any():
+        arrays['.mask'] = mask
+    return arrays
+
+
+class ResultStore:
+    """Escrita em lotes de um diretório colunar (uma parte do experimento)."""
+
+    def __init__(self, path: str, columns: Sequence[str], batch_rows: int = DEFAULT_BATCH_ROWS):
+        self.path = path
+        self.columns = list(columns)
+        self.types = {column: COLUMN_TYPES.get(column, 'category') for column in self.columns}
+        self.batch_rows = batch_rows
+        self._rows: List[Dict[str, Any]] = []
+        # Número do próximo lote: continua depois dos lotes já gravados no diretório.
+        self._next_batch = len(glob.glob(os.path.join(path, 'batch_*[0-9].npz')))
+
+    @classmethod
+    def create(cls, path: str, columns: Sequence[str], batch_rows: int = DEFAULT_BATCH_ROWS) -> 'ResultStore':
+        """Cria um diretório vazio, descartando o conteúdo anterior."""
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+        store = cls(path, columns, batch_rows)
+        with open(os.path.join(path, 'schema.json'), 'w', encoding='utf-8') as f:
+            json.dump({'columns': [[column, store.types[column]] for column in store.columns]}, f, indent=1)
+        return store
+
+    @classmethod
+    def rebuild_from_csv(cls, path: str, csv_path: str, columns: Sequence[str],
+                         batch_rows: int = DEFAULT_BATCH_ROWS) -> 'ResultStore':
+        """Refaz o diretório com as linhas já gravadas no CSV (usado ao retomar uma execução)."""
+        store = cls.create(path, columns, batch_rows)
+        if os.path.exists(csv_path):
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    store.append([row])
+        store.flush()
+        return store
+
+    def append(self, rows: Iterable[Dict[str, Any]]):
+        """Acrescenta linhas (dicionários coluna -> valor); grava um lote a cada `batch_rows`."""
+        self._rows.extend(rows)
+        if len(self._rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """Grava as linhas pendentes como um novo lote."""
+        if not self._rows:
+            return
+        arrays = {}
+        for column in self.columns:
+            values = [row.get(column) for row in self._rows]
+            for suffix, array in _encode_column(self.types[column], values).items():
+                arrays[column + suffix] = array
+        # Nomear pelo run_id da primeira linha sobrescreveria um lote quando uma
+        # unidade com várias linhas fica dividida entre dois lotes.
+        name = f"batch_{self._next_batch:08d}"
+        tmp_path = os.path.join(self.path, f"{name}.tmp.npz")
+        np.savez(tmp_path, **arrays)
+        # O lote só aparece com o nome final depois de gravado por completo.
+        os.replace(tmp_path, os.path.join(self.path, f"{name}.npz"))
+        self._next_batch += 1
+        self._rows = []
+
+
+def read_columns(path: str, columns: Optional[Sequence[str]] = None) -> 'pd.DataFrame':
+    """Lê as colunas pedidas (todas, se None) de um diretório colunar como um DataFrame tipado."""
+    # O pandas só é importado para ler: o runner grava os lotes sem ele.
+    import pandas as pd
+
+    with open(os.path.join(path, 'schema.json'), encoding='utf-8') as f:
+        types = dict(json.load(f)['columns'])
+    columns = list(types) if columns is None else [column for column in columns if column in types]
+
+    parts: Dict[str, List[Any]] = {column: [] for column in columns}
+    for batch_path in sorted(glob.glob(os.path.join(path, 'batch_*[0-9].npz'))):
+        with np.load(batch_path) as batch:
+            for column in columns:
+                if types[column] == 'category':
+                    parts[column].append(pd.Categorical.from_codes(
+                        batch[column], categories=batch[column + '.categories'].astype(object)))
+                else:
+                    data = batch[column]
+                    mask = batch[column + '.mask'] if column + '.mask' in batch.files else None
+                    parts[column].append((data, mask))
+
+    frame = {}
+    for column in columns:
+        kind = types[column]
+        if kind == 'category':
+            # Categorias em ordem alfabética, como no CSV lido por read_csv_typed.
+            frame[column] = (pd.api.types.union_categoricals(parts[column], sort_categories=True)
+                             if parts[column] else pd.Categorical([]))
+            continue
+        if not parts[column]:
+            data, mask = np.array([], dtype=bool if kind == 'bool' else np.float64), np.zeros(0, dtype=bool)
+        else:
+            data = np.concatenate([data for data, _ in parts[column]])
+            mask = np.concatenate([m if m is not None else np.zeros(len(d), dtype=bool)
+                                   for d, m in parts[column]])
+        if kind == 'int':
+            frame[column] = pd.arrays.IntegerArray(data.astype(np.int64), mask)
+        elif kind == 'float':
+            frame[column] = pd.arrays.FloatingArray(data.astype(np.float64), mask)
+        else:
+            frame[column] = pd.arrays.BooleanArray(data.astype(bool), mask)
+    return pd.DataFrame(frame)
+
+
+def read_csv_typed(csv_path: str, columns: Optional[Sequence[str]] = None) -> 'pd.DataFrame':
+    """Lê um CSV de resultados com os mesmos tipos e nulos de `read_columns`."""
+    import pandas as pd
+
+    wanted = None if columns is None else set(columns)
+    df = pd.read_csv(csv_path, usecols=None if wanted is None else lambda column: column in wanted,
+                     na_values=sorted(NULL_SENTINELS - {''}), dtype=str)
+    for column in df.columns:
+        kind = COLUMN_TYPES.get(column, 'category')
+        if kind == 'int':
+            df[column] = pd.to_numeric(df[column]).astype('Float64').astype('Int64')
+        elif kind == 'float':
+            df[column] = pd.to_numeric(df[column]).astype('Float64')
+        elif kind == 'bool':
+            df[column] = df[column].map({'True': True, 'False': False}).astype('boolean')
+        else:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def input_files(results_dir: str, part_name: str) -> List[str]:
+    """Arquivos que `load_results` leria para a parte (vazio se ela não tiver resultados)."""
+    path = columns_path(results_dir, part_name)
+    if os.path.exists(os.path.join(path, 'schema.json')):
+        return [os.path.join(path, 'schema.json')] + sorted(glob.glob(os.path.join(path, 'batch_*[0-9].npz')))
+    csv_path = os.path.join(results_dir, f"{part_name}_results.csv")
+    return [csv_path] if os.path.exists(csv_path) else []
+
+
+def load_results(results_dir: str, part_name: str, columns: Optional[Sequence[str]] = None) -> Optional['pd.DataFrame']:
+    """
+    Carrega os resultados de uma parte: do diretório colunar quando existe,
+    senão do CSV. Retorna None se a parte não tiver resultados.
+    """
+    path = columns_path(results_dir, part_name)
+    if os.path.exists(os.path.join(path, 'schema.json')):
+        return read_columns(path, columns)
+    csv_path = os.path.join(results_dir, f"{part_name}_results.csv")
+    if os.path.exists(csv_path):
+        return read_csv_typed(csv_path, columns)
+    return None
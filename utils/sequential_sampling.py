@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Amostragem sequencial dos experimentos: cada cenário recebe novos estados
+iniciais só enquanto o intervalo de confiança de alguma métrica ainda está
+largo demais.
+
+A amostra de um cenário tem uma observação por estado inicial (rodada):
+a média das suas execuções nesse estado, já que execuções aleatórias do
+mesmo estado não são independentes entre si. Para cada função de custo do
+cenário e cada métrica alvo, a meia largura do IC de 95% (t de Student) é
+comparada com `alvo * |média|`; o cenário para quando todas ficam dentro do
+alvo, desde que tenha ao menos `min_runs` rodadas. Buscas sem solução não
+entram nas métricas do caminho, então um cenário que só falha continua até
+o máximo de rodadas.
+
+As decisões dependem só das linhas gravadas (com o tempo já arredondado
+como no CSV), então relê-las do CSV ao retomar reproduz as mesmas decisões.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Meia largura relativa do IC de 95% aceita por métrica.
+DEFAULT_TARGETS: Dict[str, float] = {
+    'path_cost': 0.10,
+    'nodes_visited': 0.25,
+    'execution_time_sec': 0.25,
+}
+DEFAULT_MIN_RUNS = 5
+
+# Quantis 0,975 da t de Student para 1 a 30 graus de liberdade.
+_T_975 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+          2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+          2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def t_quantile(dof: int) -> float:
+    """Quantil 0,975 da t de Student (aproximado acima de 30 graus de liberdade)."""
+    if dof <= len(_T_975):
+        return _T_975[dof - 1]
+    return 1.96 + 2.5 / dof
+
+
+def confidence_interval(values: List[float]) -> Tuple[float, float, float]:
+    """(média, meia largura do IC de 95%, meia largura relativa à média) de uma amostra com 2+ valores."""
+    n = len(values)
+    mean = sum(values) / n
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    half_width = t_quantile(n - 1) * std / math.sqrt(n)
+    if half_width == 0:
+        return mean, 0.0, 0.0
+    return mean, half_width, half_width / abs(mean) if mean else math.inf
+
+
+def _cost_key(cost_function: Any) -> str:
+    """Função de custo como gravada no CSV (vazia quando o cenário não tem uma)."""
+    return '' if cost_function is None else str(cost_function)
+
+
+def _metric_value(value: Any) -> Optional[float]:
+    """Valor numérico de uma célula do CSV; None para as sentinelas de nulo."""
+    if value is None or value in ('', 'inf', 'None', 'N/A'):
+        return None
+    value = float(value)
+    return None if math.isinf(value) else value
+
+
+class SequentialSampler:
+    """
+    Acompanha as amostras de cada cenário de uma parte e decide quais ainda
+    precisam de mais rodadas.
+    """
+
+    def __init__(self, num_scenarios: int, targets: Optional[Dict[str, float]] = None,
+                 min_runs: int = DEFAULT_MIN_RUNS):
+        self.targets = dict(DEFAULT_TARGETS if targets is None else targets)
+        self.min_runs = max(min_runs, 2)
+        self.runs = [0] * num_scenarios
+        # (cenário, função de custo, métrica) -> uma média por rodada.
+        self.samples: Dict[Tuple[int, str, str], List[float]] = defaultdict(list)
+        self._round: Dict[Tuple[int, str, str], List[float]] = defaultdict(list)
+        self._round_scenarios = set()
+
+    def add(self, scenario_index: int, rows: Iterable[Dict[str, Any]]):
+        """Registra as linhas de uma unidade do cenário na rodada atual."""
+        self._round_scenarios.add(scenario_index)
+        for row in rows:
+            for metric in self.targets:
+                value = _metric_value(row[metric])
+                if value is not None:
+                    self._round[(scenario_index, _cost_key(row['cost_function']), metric)].append(value)
+
+    def end_round(self):
+        """Fecha a rodada: cada cenário que participou ganha uma observação por métrica."""
+        for key, values in self._round.items():
+            self.samples[key].append(sum(values) / len(values))
+        for scenario_index in self._round_scenarios:
+            self.runs[scenario_index] += 1
+        self._round.clear()
+        self._round_scenarios.clear()
+
+    def _keys(self, scenario_index: int, cost_functions: List[str]):
+        return [(scenario_index, _cost_key(cost_function), metric)
+                for cost_function in cost_functions for metric in self.targets]
+
+    def converged(self, scenario_index: int, cost_functions: List[str]) -> bool:
+        """Se o cenário já atingiu o mínimo de rodadas e todos os alvos."""
+        if self.runs[scenario_index] < self.min_runs:
+            return False
+        for key in self._keys(scenario_index, cost_functions):
+            values = self.samples.get(key, [])
+            if len(values) < 2 or confidence_interval(values)[2] > self.targets[key[2]]:
+                return False
+        return True
+
+    def summary(self, scenario_index: int, cost_functions: List[str]) -> List[Dict[str, Any]]:
+        """Uma linha por função de custo e métrica com o IC alcançado pelo cenário."""
+        rows = []
+        for key in self._keys(scenario_index, cost_functions):
+            values = self.samples.get(key, [])
+            mean, half_width, relative = confidence_interval(values) if len(values) >= 2 else \
+                (values[0] if values else None, None, None)
+            rows.append({'runs': self.runs[scenario_index], 'cost_function': key[1], 'metric': key[2],
+                         'samples': len(values), 'mean': mean, 'ci95_half_width': half_width,
+                         'relative_half_width': relative, 'target': self.targets[key[2]],
+                         'converged': relative is not None and relative <= self.targets[key[2]]})
+        return rows